@@ -0,0 +1,64 @@
+# backend/asgi.py
+"""
+ASGI entry point: async AI routes on Quart, everything else on the Flask app.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+Requests whose path and method match a route in routes/ai_async_routes.py are
+served by the Quart app on the event loop; all others go to create_app()
+through asgiref's WsgiToAsgi (which runs them in its own thread pool), so the
+Flask app and gunicorn deployment keep working unchanged.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from quart import Quart, request
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from app import create_app
+
+
+def create_async_app() -> Quart:
+    """Quart app factory for the async AI blueprint (the counterpart of create_app)."""
+    app = Quart(__name__)
+
+    from routes.ai_async_routes import bp as ai_async_bp
+    app.register_blueprint(ai_async_bp)
+
+    @app.after_request
+    async def cors(response):
+        # same open policy as flask_cors.CORS(app) on the Flask side
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        if request.method == "OPTIONS":
+            response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+            response.headers["Access-Control-Allow-Headers"] = request.headers.get(
+                "Access-Control-Request-Headers", "Content-Type")
+        return response
+
+    return app
+
+
+class PathDispatcher:
+    """Send HTTP requests the async app has a route for to it, the rest to the WSGI app."""
+
+    def __init__(self, async_app: Quart, wsgi_app):
+        self.async_app = async_app
+        self.wsgi_app = WsgiToAsgi(wsgi_app)
+        self._urls = async_app.url_map.bind("localhost")
+
+    def _is_async_route(self, scope) -> bool:
+        try:
+            self._urls.match(scope["path"], method=scope["method"])
+            return True
+        except (NotFound, MethodNotAllowed):
+            return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan" or (scope["type"] == "http" and self._is_async_route(scope)):
+            await self.async_app(scope, receive, send)
+        else:
+            await self.wsgi_app(scope, receive, send)
+
+
+def create_asgi_app():
+    return PathDispatcher(create_async_app(), create_app())
+
+
+app = create_asgi_app()
@@ -0,0 +1,139 @@
+# backend/bench_intent_classifier.py
+"""
+Accuracy and speed of query intent routing on a labelled query set:
+the old per-list substring scan, the compiled trigger regex, and the regex
+with the nearest-centroid fallback (services/intent_classifier.py).
+
+    python bench_intent_classifier.py
+    python bench_intent_classifier.py --no-centroids   # skip loading the embedding model
+    python bench_intent_classifier.py --show-errors
+
+Centroid timings exclude embedding the query: in the agents that embedding
+is already computed for retrieval. The labelled queries are held out from
+INTENT_EXAMPLES, which the centroids are built from.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.intent_classifier import INTENT_TRIGGERS, INTENT_EXAMPLES, INTENTS, classify_intent
+
+LABELLED_QUERIES = [
+    # technical_guidance
+    ("How to set up a CI pipeline for the Flask app?", "technical_guidance"),
+    ("Configure Docker for the backend service", "technical_guidance"),
+    ("Fix the SQL query that times out on the reports page", "technical_guidance"),
+    ("Implement pagination in the React table", "technical_guidance"),
+    ("What's a good database schema for storing transcripts?", "technical_guidance"),
+    ("Debug the API returning 500 on upload", "technical_guidance"),
+    ("Best way to structure a Python package with tests?", "technical_guidance"),
+    ("Why is the frontend bundle so large and how can we shrink it?", "technical_guidance"),
+    ("Write a script that migrates users to the new auth provider", "technical_guidance"),
+    ("Our build keeps failing on the linter step", "technical_guidance"),
+    # decision_support
+    ("Should we choose vendor A or vendor B for hosting?", "decision_support"),
+    ("What should I prioritize this sprint?", "decision_support"),
+    ("Recommend a pricing strategy for the enterprise tier", "decision_support"),
+    ("Pros and cons of hiring contractors versus full-time engineers", "decision_support"),
+    ("Is it worth delaying the launch to add SSO?", "decision_support"),
+    ("Which option gives us the better long-term value?", "decision_support"),
+    ("Help me weigh renting office space against staying remote", "decision_support"),
+    ("Would switching to annual billing be a good idea for us?", "decision_support"),
+    # meeting_specific
+    ("What did we discuss in the last meeting?", "meeting_specific"),
+    ("List the action items from Monday's standup", "meeting_specific"),
+    ("What did Priya say about the rollout?", "meeting_specific"),
+    ("Who needs to follow up with the client?", "meeting_specific"),
+    ("What was decided about the launch date?", "meeting_specific"),
+    ("Give me a rundown of Tuesday's planning session with engineering", "meeting_specific"),
+    ("Who promised to send the contract by Friday?", "meeting_specific"),
+    ("Recap yesterday's call with marketing", "meeting_specific"),
+    ("What topics were talked about in the retro?", "meeting_specific"),
+    # hypothetical_scenario
+    ("What if our main vendor raises prices by 30%?", "hypothetical_scenario"),
+    ("Suppose the lead engineer leaves next month", "hypothetical_scenario"),
+    ("Scenario: the launch slips by a quarter", "hypothetical_scenario"),
+    ("Assuming the budget is cut in half, what happens to the roadmap?", "hypothetical_scenario"),
+    ("Imagine the biggest customer cancels their contract", "hypothetical_scenario"),
+    ("How would a two-week testing delay affect the release?", "hypothetical_scenario"),
+    ("Picture a world where the competitor open-sources their product", "hypothetical_scenario"),
+    # general_knowledge
+    ("What is the largest ocean on Earth?", "general_knowledge"),
+    ("How does compound interest work?", "general_knowledge"),
+    ("Who invented the telephone?", "general_knowledge"),
+    ("What is the role of a scrum master?", "general_knowledge"),
+    ("Define burn rate", "general_knowledge"),
+    ("What is rapid prototyping?", "general_knowledge"),
+    ("How many days are in a leap year?", "general_knowledge"),
+    ("Tell me about the history of the prefix system in chemistry", "general_knowledge"),
+]
+
+
+# held out: a query the centroids were built from would score itself
+assert not {q for q, _ in LABELLED_QUERIES} & {q for examples in INTENT_EXAMPLES.values() for q in examples}
+
+
+def legacy_intent(query: str) -> str:
+    """The substring scan analyze_query_intent used before the compiled classifier."""
+    query_lower = query.lower()
+    weights = dict.fromkeys(INTENTS, 0)
+    legacy = {
+        'technical_guidance': [t for t in INTENT_TRIGGERS['technical_guidance'] if t != 'set up'],
+        'decision_support': [t for t in INTENT_TRIGGERS['decision_support'] if t != 'should we'],
+        'hypothetical_scenario': INTENT_TRIGGERS['hypothetical_scenario'],
+        'meeting_specific': ['meeting', 'discussed', 'said', 'talked about', 'action item', 'decision', 'follow up'],
+    }
+    for intent, triggers in legacy.items():
+        for trigger in triggers:
+            if trigger in query_lower:
+                weights[intent] += 1
+    if sum(weights.values()) == 0:
+        weights['general_knowledge'] = 1
+    return max(weights, key=weights.get)
+
+
+def evaluate(name, predict, rounds, show_errors):
+    correct, errors = 0, []
+    for query, label in LABELLED_QUERIES:
+        predicted = predict(query)
+        if predicted == label:
+            correct += 1
+        else:
+            errors.append((query, label, predicted))
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for query, _ in LABELLED_QUERIES:
+            predict(query)
+    per_query_us = (time.perf_counter() - t0) / (rounds * len(LABELLED_QUERIES)) * 1e6
+    print(f"{name:<22} accuracy {correct}/{len(LABELLED_QUERIES)} ({100 * correct / len(LABELLED_QUERIES):.0f}%)"
+          f"  {per_query_us:8.1f} us/query")
+    if show_errors:
+        for query, label, predicted in errors:
+            print(f"    {query[:60]:<60} expected {label}, got {predicted}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--no-centroids", action="store_true")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    evaluate("substring (legacy)", legacy_intent, args.rounds, args.show_errors)
+    evaluate("compiled regex", lambda q: classify_intent(q)['primary_intent'], args.rounds, args.show_errors)
+
+    if not args.no_centroids:
+        from services.embeddings import Embeddings
+        embedder = Embeddings()
+        # embeddings precomputed, as retrieval already has them in the agents
+        embeddings = {q: embedder.embed_text(q) for q, _ in LABELLED_QUERIES}
+        evaluate("regex + centroids",
+                 lambda q: classify_intent(q, embeddings[q], embedder.embed_texts)['primary_intent'],
+                 args.rounds, args.show_errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/bench_prompt_compression.py
+"""
+Prompt size and answer latency with and without extractive prompt
+compression (services/prompt_compressor.py), over the ingested meetings.
+
+    python bench_prompt_compression.py                         # prompt tokens only
+    python bench_prompt_compression.py --generate --top-k 8    # also time LLM answers
+    python bench_prompt_compression.py --queries "what did we decide about the vendor?" "open action items"
+
+"raw" is every retrieved chunk pasted as-is, "packed" the merged and
+budgeted context the agents use by default, "compressed" packed plus
+sentence selection (RAG_COMPRESS_TOKEN_BUDGET).
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.rag_agent_enhanced import EMBEDDER, VECTOR_STORE, plan_answer
+from services.context_packer import estimate_tokens, chunk_body
+from services.llm_client import generate
+
+DEFAULT_QUERIES = [
+    "What decisions were made about the project timeline?",
+    "What are the open action items and who owns them?",
+    "Which risks were raised about the vendor?",
+    "Summarize the discussion about the budget.",
+    "What did the team agree on for the next release?",
+]
+
+
+def run(queries, top_k, do_generate):
+    rows = []
+    for query in queries:
+        q_emb = EMBEDDER.embed_text(query).reshape(1, -1)
+        retrieved = VECTOR_STORE.search(q_emb, top_k)
+        row = {"query": query, "raw": sum(estimate_tokens(chunk_body(c)) for c in retrieved)}
+        for mode, compress in (("packed", False), ("compressed", True)):
+            t0 = time.perf_counter()
+            prompt, system_prompt, _ = plan_answer(query, retrieved, "general_knowledge", q_emb, compress=compress)
+            row[f"{mode}_build_ms"] = (time.perf_counter() - t0) * 1000
+            row[mode] = estimate_tokens(prompt)
+            if do_generate:
+                t0 = time.perf_counter()
+                # temperature above the cache ceiling so every call reaches the provider
+                generate(prompt, system_prompt=system_prompt, max_tokens=400, temperature=0.6)
+                row[f"{mode}_answer_s"] = time.perf_counter() - t0
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", nargs="*", default=DEFAULT_QUERIES)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--generate", action="store_true", help="also call the LLM and time the answers")
+    args = parser.parse_args()
+
+    if VECTOR_STORE.get_total_count() == 0:
+        print("Vector store is empty - ingest some transcripts first (ingest_test_data.py).")
+        return
+
+    rows = run(args.queries, args.top_k, args.generate)
+    print(f"\n{'query':<48} {'raw':>6} {'packed':>7} {'compr.':>7} {'build ms':>9}")
+    for r in rows:
+        print(f"{r['query'][:48]:<48} {r['raw']:>6} {r['packed']:>7} {r['compressed']:>7} "
+              f"{r['compressed_build_ms']:>9.1f}")
+
+    def mean(key):
+        return statistics.mean(r[key] for r in rows)
+
+    print(f"\nmean prompt tokens: raw context {mean('raw'):.0f}, packed prompt {mean('packed'):.0f}, "
+          f"compressed prompt {mean('compressed'):.0f} "
+          f"({100 * (1 - mean('compressed') / mean('packed')):.0f}% smaller)")
+    print(f"mean prompt build: packed {mean('packed_build_ms'):.1f} ms, compressed {mean('compressed_build_ms'):.1f} ms")
+    if args.generate:
+        print(f"mean answer latency: packed {mean('packed_answer_s'):.2f} s, "
+              f"compressed {mean('compressed_answer_s'):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
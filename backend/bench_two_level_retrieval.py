@@ -0,0 +1,78 @@
+# backend/bench_two_level_retrieval.py
+"""
+Latency and recall of two-level retrieval (meeting routing vectors, then the
+chunks of the top-M meetings) against the global flat search, as the number
+of meetings grows. Uses synthetic clustered embeddings in a temporary store:
+meetings share topics, and each query is a perturbed chunk.
+
+    python bench_two_level_retrieval.py
+    python bench_two_level_retrieval.py --meetings 200 1000 5000 --top-meetings 4 8 16
+
+Recall@k is the share of the flat search's top-k chunks that the two-level
+search also returns.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ["VECTOR_STORE_PATH"] = tempfile.mkdtemp(prefix="bench_vs_")
+
+import numpy as np
+from services import vector_store
+from services.vector_store import FaissVectorStore
+
+
+def _unit(rows):
+    return (rows / np.linalg.norm(rows, axis=-1, keepdims=True)).astype("float32")
+
+
+def build_store(rng, meetings, chunks_per_meeting, dim):
+    topics = _unit(rng.standard_normal((max(4, meetings // 5), dim)))
+    centers = _unit(topics[rng.integers(len(topics), size=meetings)] + 0.5 * _unit(rng.standard_normal((meetings, dim))))
+    vectors = _unit(np.repeat(centers, chunks_per_meeting, axis=0)
+                    + 0.6 * _unit(rng.standard_normal((meetings * chunks_per_meeting, dim))))
+    metadatas = [{"meeting_id": m, "chunk_index": c} for m in range(meetings) for c in range(chunks_per_meeting)]
+    store = FaissVectorStore(dim)
+    store.reset()
+    store.add(vectors, metadatas)
+    return store, vectors
+
+
+def timed(search, queries, top_k):
+    t0 = time.perf_counter()
+    results = [search(q, top_k) for q in queries]
+    return results, (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, nargs="*", default=[100, 500, 2000])
+    parser.add_argument("--chunks", type=int, default=20, help="chunks per meeting")
+    parser.add_argument("--top-meetings", type=int, nargs="*", default=[8])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'meetings':>8} {'chunks':>7} {'top-M':>6} {'flat ms':>8} {'2-level ms':>11} {'speedup':>8} "
+          f"{'recall@' + str(args.top_k):>9}")
+    for meetings in args.meetings:
+        store, vectors = build_store(rng, meetings, args.chunks, args.dim)
+        picks = rng.integers(len(vectors), size=args.queries)
+        queries = [_unit(vectors[i] + 0.3 * _unit(rng.standard_normal(args.dim))).reshape(1, -1) for i in picks]
+        flat, flat_ms = timed(lambda q, k: store.search(q, k, two_level=False), queries, args.top_k)
+        for top_m in args.top_meetings:
+            vector_store.ROUTE_TOP_MEETINGS = top_m
+            routed, routed_ms = timed(lambda q, k: store.search(q, k, two_level=True), queries, args.top_k)
+            recall = np.mean([len({r["id"] for r in a} & {r["id"] for r in b}) / len(a)
+                              for a, b in zip(flat, routed)])
+            print(f"{meetings:>8} {len(vectors):>7} {top_m:>6} {flat_ms:>8.2f} {routed_ms:>11.2f} "
+                  f"{flat_ms / routed_ms:>7.1f}x {recall:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
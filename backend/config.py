@@ -1,17 +1,30 @@
 import os
-<<<<<<< Updated upstream
-=======
 from datetime import timedelta
->>>>>>> Stashed changes
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
+
+def _engine_options(uri: str) -> dict:
+    """SQLAlchemy engine options tuned per backend (see also utils.db for SQLite pragmas)."""
+    if uri.startswith("sqlite"):
+        return {
+            # sqlite3's own lock wait, in seconds; PRAGMA busy_timeout mirrors it
+            "connect_args": {"timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000},
+        }
+    if uri.startswith("postgresql"):
+        statement_timeout_ms = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 30000))
+        return {
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+            "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+            "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+            "pool_pre_ping": True,
+            "connect_args": {"options": f"-c statement_timeout={statement_timeout_ms}"},
+        }
+    return {"pool_pre_ping": True}
+
+
 class Config:
-<<<<<<< Updated upstream
-    SECRET_KEY = "super-secret"  # replace later with env
-    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(BASE_DIR, "../database/automeet.db")
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-=======
     # Security
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-key-change-in-production"
 
@@ -19,6 +32,13 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or \
         "sqlite:///" + os.path.join(BASE_DIR, "../database/automeet.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # SQLite tuning, applied on every new connection by utils.db.init_db
+    SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
 
     # JWT
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or "jwt-secret-key-change-me"
@@ -29,4 +49,3 @@ class Config:
         "http://localhost:3000",   # React frontend
         "chrome-extension://*"     # Extension
     ]
->>>>>>> Stashed changes
@@ -13,7 +13,7 @@ def create_app():
         print("🚀 Starting Flask app creation...")
         
         from config import Config
-        from utils.db import db, migrate
+        from utils.db import db, init_db
         
         app = Flask(__name__)
         app.config.from_object(Config)
@@ -21,8 +21,7 @@ def create_app():
 
         # init DB + migrations
         print("📦 Initializing database...")
-        db.init_app(app)
-        migrate.init_app(app, db)
+        init_db(app)
 
         # Import models
         print("📚 Importing models...")
@@ -0,0 +1,46 @@
+# backend/export_meetings.py
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from services.export import EXPORT_KINDS, export_ndjson, parse_iso_datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream meetings/transcripts/segments as NDJSON")
+    parser.add_argument("--kinds", default=",".join(EXPORT_KINDS),
+                        help=f"comma separated subset of {','.join(EXPORT_KINDS)}")
+    parser.add_argument("--project-id", type=int, default=None)
+    parser.add_argument("--since", default=None, help="ISO 8601, inclusive (meeting created_at)")
+    parser.add_argument("--until", default=None, help="ISO 8601, exclusive (meeting created_at)")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in EXPORT_KINDS]
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(unknown)}")
+
+    app = create_app()
+    with app.app_context():
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            for chunk in export_ndjson(
+                kinds,
+                project_id=args.project_id,
+                since=parse_iso_datetime(args.since),
+                until=parse_iso_datetime(args.until),
+                gzip=args.gzip,
+            ):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
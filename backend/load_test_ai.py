@@ -0,0 +1,96 @@
+# backend/load_test_ai.py
+"""
+Concurrency load test for the AI routes.
+
+Keeps --concurrency requests in flight against an endpoint for --requests
+total and reports throughput, latency percentiles and the peak number of
+requests the server had open at once. Compare the ASGI server with the
+threaded Flask/gunicorn one:
+
+    uvicorn asgi:app --port 5000
+    gunicorn -w 2 --threads 4 -b :5001 "app:create_app()"
+    python load_test_ai.py --url http://localhost:5000/api/ai/query --concurrency 200 --requests 1000
+    python load_test_ai.py --url http://localhost:5001/api/ai/query --concurrency 200 --requests 1000
+
+With 2 x 4 gunicorn threads at most 8 requests are ever open at once; the ASGI
+app should hold close to --concurrency (bounded by LLM_ASYNC_*_CONCURRENCY).
+"""
+import time
+import json
+import asyncio
+import argparse
+import httpx
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run(url, payload, concurrency, total, timeout):
+    latencies = []
+    statuses = {}
+    in_flight = 0
+    peak = 0
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+
+        async def worker():
+            nonlocal in_flight, peak
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                in_flight += 1
+                peak = max(peak, in_flight)
+                started = time.perf_counter()
+                try:
+                    response = await client.post(url, json=payload)
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                in_flight -= 1
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:5000/api/ai/query")
+    parser.add_argument("--query", default="What were the action items from the last meeting?")
+    parser.add_argument("--payload", help="raw JSON body, overrides --query")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    payload = json.loads(args.payload) if args.payload else {"query": args.query, "hedge": False}
+    print(f"🧪 {args.requests} requests, {args.concurrency} concurrent -> {args.url}")
+    latencies, statuses, peak, elapsed = asyncio.run(
+        run(args.url, payload, args.concurrency, args.requests, args.timeout))
+
+    print(f"   throughput   {len(latencies) / elapsed:8.1f} req/s over {elapsed:.2f}s")
+    print(f"   latency      p50 {percentile(latencies, 50):.2f}s  p95 {percentile(latencies, 95):.2f}s  "
+          f"p99 {percentile(latencies, 99):.2f}s  max {max(latencies or [0]):.2f}s")
+    print(f"   peak in flight {peak}")
+    print(f"   statuses     {statuses}")
+    # with a fixed per-request service time, concurrency actually achieved ~= throughput x mean latency
+    if latencies:
+        print(f"   effective concurrency {len(latencies) / elapsed * (sum(latencies) / len(latencies)):.1f}")
+
+
+if __name__ == "__main__":
+    main()
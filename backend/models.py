@@ -1,12 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from sqlalchemy.orm import validates
-<<<<<<< Updated upstream
-
-db = SQLAlchemy()
-=======
 from utils.db import db
->>>>>>> Stashed changes
+from utils.compression import CompressedText, CODEC_ZLIB, CODEC_ZLIB_CAPTIONS
 
 # USER
 class User(db.Model):
@@ -66,11 +62,7 @@ class Integration(db.Model):
     external_account = db.Column(db.Text)
     status = db.Column(db.Text)
     last_sync = db.Column(db.DateTime)
-<<<<<<< Updated upstream
-    metadata = db.Column(db.Text)  # Changed from meta_data to match schema
-=======
     meta_info = db.Column("metadata", db.Text)  # ✅ safe: Python attr = meta_info, DB column = metadata
->>>>>>> Stashed changes
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -126,9 +118,15 @@ class Meeting(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"))
     raw_metadata = db.Column(db.Text)  # Changed from JSON to Text to match schema
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # keyset pagination on (created_at, id), overall and per project
+        db.Index('ix_meetings_created_at_id', 'created_at', 'id'),
+        db.Index('ix_meetings_project_id_created_at_id', 'project_id', 'created_at', 'id'),
+    )
+
     # Relationships
     attendees = db.relationship("MeetingAttendee", backref="meeting", cascade="all, delete-orphan")
     segments = db.relationship("MeetingSegment", backref="meeting", cascade="all, delete-orphan")
@@ -143,7 +141,7 @@ class MeetingAttendee(db.Model):
     __tablename__ = "meeting_attendees"
 
     id = db.Column(db.Integer, primary_key=True)
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     display_name = db.Column(db.Text)
     email = db.Column(db.Text)
@@ -159,7 +157,7 @@ class MeetingSegment(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False)
-    t_start_ms = db.Column(db.Integer)
+    t_start_ms = db.Column(db.Integer, nullable=False, default=0)
     t_end_ms = db.Column(db.Integer)
     speaker_label = db.Column(db.Text)
     speaker_user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
@@ -168,31 +166,29 @@ class MeetingSegment(db.Model):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # covers "segments of meeting X", time-ordered scans and keyset pages on (t_start_ms, id)
+        db.Index('ix_meeting_segments_meeting_id_t_start_ms_id', 'meeting_id', 't_start_ms', 'id'),
+    )
+
 
 class MeetingTranscript(db.Model):
     __tablename__ = "meeting_transcripts"
 
     id = db.Column(db.Integer, primary_key=True)
-<<<<<<< Updated upstream
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False)
-=======
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=True)  # ✅ allow null
->>>>>>> Stashed changes
-    full_text = db.Column(db.Text)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=True, index=True)  # ✅ allow null
+    full_text = db.deferred(db.Column(CompressedText(CODEC_ZLIB)))  # compressed, loaded on first access
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
-<<<<<<< Updated upstream
-=======
 
->>>>>>> Stashed changes
 class MeetingArtifact(db.Model):
     __tablename__ = "meeting_artifacts"
 
     id = db.Column(db.Integer, primary_key=True)
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False, index=True)
     type = db.Column(db.Text)
     title = db.Column(db.Text)
     content = db.Column(db.Text)
@@ -203,14 +199,22 @@ class MeetingArtifact(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # "latest artifact of type T (for meeting M)" lookups, e.g. the ingest-time extraction
+        db.Index('ix_meeting_artifacts_type_meeting_id_created_at', 'type', 'meeting_id', 'created_at'),
+        db.Index('ix_meeting_artifacts_type_created_at', 'type', 'created_at'),
+        # keyed artifacts of one meeting in title order, e.g. rolling window summaries ("window:000042")
+        db.Index('ix_meeting_artifacts_type_meeting_id_title', 'type', 'meeting_id', 'title'),
+    )
+
 
 # Tasks
 class Task(db.Model):
     __tablename__ = "tasks"
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"))
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"))
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), index=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), index=True)
     title = db.Column(db.Text, nullable=False)
     description = db.Column(db.Text)
     status = db.Column(db.Text)
@@ -218,7 +222,7 @@ class Task(db.Model):
     assignee_user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     assignee_email = db.Column(db.Text)
     due_at = db.Column(db.DateTime)
-    source_artifact = db.Column(db.Integer, db.ForeignKey("meeting_artifacts.id"))
+    source_artifact = db.Column(db.Integer, db.ForeignKey("meeting_artifacts.id"), index=True)
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"))
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -233,9 +237,9 @@ class Decision(db.Model):
     statement = db.Column(db.Text, nullable=False)
     decided_by = db.Column(db.Integer, db.ForeignKey("users.id"))
     effective_date = db.Column(db.DateTime)
-    source_artifact = db.Column(db.Integer, db.ForeignKey("meeting_artifacts.id"))
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"))
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"))
+    source_artifact = db.Column(db.Integer, db.ForeignKey("meeting_artifacts.id"), index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), index=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), index=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -246,8 +250,8 @@ class Conversation(db.Model):
     __tablename__ = "conversations"
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"))
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"))
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), index=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), index=True)
     title = db.Column(db.Text)
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"))
 
@@ -262,7 +266,7 @@ class ConversationMessage(db.Model):
     __tablename__ = "conversation_messages"
 
     id = db.Column(db.Integer, primary_key=True)
-    conversation_id = db.Column(db.Integer, db.ForeignKey("conversations.id"), nullable=False)
+    conversation_id = db.Column(db.Integer, db.ForeignKey("conversations.id"), nullable=False, index=True)
     sender = db.Column(db.Text)
     message = db.Column(db.Text)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -275,8 +279,8 @@ class RawMeetingTranscript(db.Model):
     __tablename__ = "raw_meeting_transcripts"
     
     id = db.Column(db.Integer, primary_key=True)
-    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False)
-    raw_data = db.Column(db.Text, nullable=False)  
+    meeting_id = db.Column(db.Integer, db.ForeignKey("meetings.id"), nullable=False, index=True)
+    raw_data = db.deferred(db.Column(CompressedText(CODEC_ZLIB_CAPTIONS), nullable=False))  # compressed caption JSON
     transcript_format = db.Column(db.Text)  
     source_platform = db.Column(db.Text)  
     
@@ -0,0 +1,177 @@
+# backend/routes/ai_async_routes.py
+"""
+Async (Quart) versions of the LLM-bound /api/ai routes, served by asgi.py.
+
+Same paths, payloads and responses as routes/ai_routes.py, but a request
+waiting on an LLM provider is a suspended coroutine rather than a blocked
+worker thread. Embedding and FAISS search run on services.executors.CPU_EXECUTOR;
+meeting summaries, which still block on the database and on sequential map-reduce
+calls, run on services.executors.BLOCKING_EXECUTOR.
+Routes not defined here (ingest, uploads, transcripts) stay on the Flask app.
+"""
+import asyncio
+import pandas as pd
+from quart import Blueprint, request, jsonify, Response
+from services.rag_agent_enhanced import (
+    retrieve_and_generate_enhanced_async as retrieve_and_generate,
+    stream_enhanced_async, EMBEDDER, VECTOR_STORE,
+)
+from utils.sse import sse_stream_async, SSE_HEADERS
+from services.async_llm_client import get_async_llm_client, agenerate
+from services.executors import run_cpu, run_blocking
+from routes.ai_routes import (
+    request_deadline, query_options, semantic_cache_status, ai_metrics,
+    verify_mode, project_ids, meeting_scope, verification_ticket, comprehensive_qa_verify_mode,
+    decision_support_query, technical_guidance_query, scenario_analysis_query,
+    comprehensive_qa_query, annotate_comprehensive_qa, workflow_assistance_query,
+    late_join_request, coalesced_late_join_summary, coalesced_meeting_summary, hypothetical_prompt,
+)
+
+bp = Blueprint("ai_async", __name__, url_prefix="/api/ai")
+
+
+async def _payload() -> dict:
+    return await request.get_json(force=True) or {}
+
+
+@bp.get("/providers")
+async def provider_status():
+    from services.llm_client import llm_client
+    client = get_async_llm_client()
+    return jsonify({
+        "providers": llm_client.provider_status(),
+        "routing": [name for name, _ in client.route_providers()],
+        "hedging": client.hedge_stats,
+        "concurrency": client.concurrency_status(),
+        "cache": llm_client.cache_status(),
+        "semantic_cache": semantic_cache_status(),
+        "model_tiers": llm_client.model_tiers(),
+    }), 200
+
+
+@bp.get("/metrics")
+async def metrics():
+    return jsonify(ai_metrics()), 200
+
+
+@bp.post("/query")
+async def query_route():
+    payload = await _payload()
+    query, top_k, hedge = query_options(payload)
+    if not query:
+        return jsonify({"error": "query required"}), 400
+    if payload.get("stream"):
+        events = stream_enhanced_async(query, top_k=top_k, deadline=request_deadline(payload),
+                                       use_cache=bool(payload.get("cache", True)), project_ids=project_ids(payload),
+                                       meeting_id=meeting_scope(payload))
+        response = Response(sse_stream_async(events), mimetype="text/event-stream", headers=SSE_HEADERS)
+        response.timeout = None  # the stream is bounded by the request deadline instead
+        return response
+    res = await retrieve_and_generate(query, top_k=top_k, hedge=hedge, deadline=request_deadline(payload),
+                                use_cache=bool(payload.get("cache", True)), verify_mode=verify_mode(payload),
+                                project_ids=project_ids(payload), meeting_id=meeting_scope(payload))
+    return jsonify(res), 200
+
+
+@bp.get("/verification/<ticket>")
+async def verification_status(ticket):
+    wait = min(float(request.args.get("wait", 0) or 0), 30.0)
+    deadline = asyncio.get_running_loop().time() + wait
+    body, status = verification_ticket(ticket)
+    # long-poll without parking a thread on the ticket's event
+    while status == 200 and body["status"] in ("pending", "running") \
+            and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.25)
+        body, status = verification_ticket(ticket)
+    return jsonify(body), status
+
+
+@bp.post("/semantic_search")
+async def semantic_search():
+    payload = await _payload()
+    query = payload.get("query")
+    top_k = int(payload.get("top_k", 10))
+    if not query:
+        return jsonify({"error": "query required"}), 400
+    qv = (await run_cpu(EMBEDDER.embed_text, query)).reshape(1, -1)
+    res = await run_cpu(VECTOR_STORE.search, qv, top_k, project_ids(payload))
+    return jsonify({"results": res}), 200
+
+
+async def _agent_route(build_query, missing_field: str, top_k: int, choose_verify_mode=verify_mode):
+    payload = await _payload()
+    enhanced_query = build_query(payload)
+    if not enhanced_query:
+        return None, payload, (jsonify({"error": f"{missing_field} required"}), 400)
+    result = await retrieve_and_generate(enhanced_query, top_k=top_k, deadline=request_deadline(payload),
+                                         verify_mode=choose_verify_mode(payload), project_ids=project_ids(payload))
+    return result, payload, None
+
+
+@bp.post("/decision_support")
+async def decision_support():
+    result, _, error = await _agent_route(decision_support_query, "query", 8)
+    return error or (jsonify(result), 200)
+
+
+@bp.post("/technical_guidance")
+async def technical_guidance():
+    result, _, error = await _agent_route(technical_guidance_query, "query", 6)
+    return error or (jsonify(result), 200)
+
+
+@bp.post("/scenario_analysis")
+async def scenario_analysis():
+    result, _, error = await _agent_route(scenario_analysis_query, "scenario", 10)
+    return error or (jsonify(result), 200)
+
+
+@bp.post("/comprehensive_qa")
+async def comprehensive_qa():
+    result, payload, error = await _agent_route(comprehensive_qa_query, "question", 8, comprehensive_qa_verify_mode)
+    return error or (jsonify(annotate_comprehensive_qa(payload, result)), 200)
+
+
+@bp.post("/workflow_assistance")
+async def workflow_assistance():
+    result, _, error = await _agent_route(workflow_assistance_query, "task", 5)
+    return error or (jsonify(result), 200)
+
+
+@bp.post("/late_join_summary")
+async def late_join_summary():
+    try:
+        meeting_id, since_iso, since = late_join_request(await _payload())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(await run_blocking(coalesced_late_join_summary, meeting_id, since_iso, since)), 200
+
+
+@bp.post("/summarize_meeting")
+async def summarize_meeting_route():
+    meeting_id = (await _payload()).get("meeting_id")
+    if not meeting_id:
+        return jsonify({"error": "meeting_id required"}), 400
+    result = await run_blocking(coalesced_meeting_summary, int(meeting_id))
+    if not result["groups"]:
+        return jsonify({"error": "no transcript for this meeting"}), 404
+    return jsonify(result), 200
+
+
+@bp.post("/hypothetical")
+async def hypothetical_route():
+    if request.content_type and "multipart/form-data" in request.content_type:
+        f = (await request.files).get("file")
+        if not f:
+            return jsonify({"error": "file missing"}), 400
+        df = await run_cpu(pd.read_csv, f)
+        prompt = (await request.form).get("prompt")
+    else:
+        payload = await _payload()
+        data = payload.get("data")
+        if not data:
+            return jsonify({"error": "data missing"}), 400
+        df = pd.DataFrame(data)
+        prompt = payload.get("prompt")
+    answer = await agenerate(await run_cpu(hypothetical_prompt, df, prompt), max_tokens=600)
+    return jsonify({"answer": answer}), 200
@@ -1,6 +1,14 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from services.ingest import ingest_transcript
-from services.rag_agent_enhanced import retrieve_and_generate_enhanced as retrieve_and_generate
+from services.rag_agent_enhanced import retrieve_and_generate_enhanced as retrieve_and_generate, stream_enhanced, VERIFY_MODES
+from services.rag_agent_enhanced import EMBEDDER, VECTOR_STORE
+from services.verification_queue import VERIFICATION_QUEUE
+from services.extraction import EXTRACTION_QUEUE
+from services.rolling_summary import ROLLING_SUMMARIES, late_join_summary as windowed_late_join_summary
+from services.summarizer import SUMMARY_CACHE, summarize_meeting
+from utils.sse import sse_stream, SSE_HEADERS
+from services.deadline import Deadline
+from services.single_flight import get_flight, flight_key, flight_metrics
 from datetime import datetime
 import pandas as pd
 import io
@@ -8,11 +16,72 @@ import os
 
 bp = Blueprint("ai", __name__, url_prefix="/api/ai")
 
+def request_deadline(payload: dict) -> Deadline:
+    """End-to-end budget for this request: payload "timeout_ms" or RAG_REQUEST_TIMEOUT_MS."""
+    timeout_ms = payload.get("timeout_ms")
+    return Deadline.from_ms(int(timeout_ms) if timeout_ms else None)
+
+def verify_mode(payload: dict):
+    """Payload "verify_mode" ("sync" | "async" | "off"); None means the RAG_VERIFY_MODE default."""
+    mode = payload.get("verify_mode")
+    return mode if mode in VERIFY_MODES else None
+
+def project_ids(payload: dict):
+    """Payload "project_ids" (list) or "project_id": the projects whose meetings to search; None = all."""
+    ids = payload.get("project_ids")
+    if ids is None and payload.get("project_id") is not None:
+        ids = [payload["project_id"]]
+    return [int(p) for p in ids] if ids is not None else None
+
+def meeting_scope(payload: dict):
+    """Payload "meeting_id": the meeting a question is asked about (e.g. from its page), None = any."""
+    meeting_id = payload.get("meeting_id")
+    return int(meeting_id) if meeting_id is not None else None
+
+def verification_ticket(ticket: str, wait: float = 0):
+    """(body, status) for a background verification ticket, after waiting up to `wait` seconds."""
+    state = VERIFICATION_QUEUE.wait(ticket, wait)
+    if state is None:
+        return {"error": "unknown or expired verification ticket"}, 404
+    return state, 200
+
 @bp.post("/transcribe")
 def transcribe():
     data = request.get_json(silent=True) or {}
     return jsonify({"transcript": "[stub transcript]", "source": data.get("audio_url")})
 
+@bp.get("/providers")
+def provider_status():
+    """Circuit-breaker state, EWMA latency and error rate per LLM provider."""
+    from services.llm_client import llm_client
+    return jsonify({
+        "providers": llm_client.provider_status(),
+        "routing": [name for name, _ in llm_client.route_providers()],
+        "hedging": llm_client.hedging_status(),
+        "cache": llm_client.cache_status(),
+        "semantic_cache": semantic_cache_status(),
+        "model_tiers": llm_client.model_tiers(),
+    }), 200
+
+def ai_metrics() -> dict:
+    from services.llm_client import llm_client
+    return {
+        "single_flight": flight_metrics(),
+        "llm_cache": llm_client.cache_status(),
+        "semantic_cache": semantic_cache_status(),
+        "hedging": llm_client.hedging_status(),
+        "verification_queue": VERIFICATION_QUEUE.snapshot(),
+        "extraction": EXTRACTION_QUEUE.snapshot(),
+        "rolling_summaries": ROLLING_SUMMARIES.snapshot(),
+        "summary_cache": SUMMARY_CACHE.snapshot(),
+        "vector_store": VECTOR_STORE.snapshot(),
+    }
+
+@bp.get("/metrics")
+def metrics():
+    """Request coalescing (single-flight) and cache counters for the AI pipeline."""
+    return jsonify(ai_metrics()), 200
+
 @bp.route("/ingest_transcript", methods=["POST"])
 def ingest_transcript_route():
     """
@@ -36,52 +105,124 @@ def ingest_transcript_route():
                             source_platform=source_platform, transcript_format=transcript_format)
     return jsonify(res), 201
 
+def semantic_cache_status() -> dict:
+    from services.semantic_cache import get_semantic_cache
+    from services.rag_agent_enhanced import VECTOR_STORE
+    cache = get_semantic_cache(VECTOR_STORE.dim)
+    return cache.snapshot() if cache is not None else {"enabled": False}
+
+def query_options(payload: dict):
+    """(query, top_k, hedge) from a /query payload; shared with the async blueprint."""
+    query = payload.get("query")
+    top_k = int(payload.get("top_k", os.environ.get("TOP_K", 5)))
+    hedge = bool(payload.get("hedge", os.environ.get("AI_QUERY_HEDGE", "1").lower() in ("1", "true", "yes")))
+    return query, top_k, hedge
+
 @bp.route("/query", methods=["POST"])
 def query_route():
     """
     Accepts JSON:
-    { "query": "what are action items?" , "top_k": 5 }
+    { "query": "what are action items?" , "top_k": 5, "hedge": true, "timeout_ms": 20000, "stream": false }
+    "hedge" (default AI_QUERY_HEDGE, on) races a second LLM provider when the first is slow.
+    "cache": false skips the semantic answer cache (near-duplicate recent questions).
+    "verify_mode": "async" (default RAG_VERIFY_MODE) returns the answer at once
+    with a verification ticket to poll at /api/ai/verification/<ticket>;
+    "sync" verifies (and corrects) before answering; "off" skips it.
+    "stream": true answers with text/event-stream instead: a "sources" event,
+    "token" events as the answer is generated, "done", then "verification".
+    "project_ids": [..] (or "project_id") searches only those projects' meetings.
+    "meeting_id" lets "what are the action items?" be answered from that
+    meeting's extracted tasks without naming it.
     """
     payload = request.get_json(force=True)
-    query = payload.get("query")
-    top_k = int(payload.get("top_k", os.environ.get("TOP_K", 5)))
+    query, top_k, hedge = query_options(payload)
     if not query:
         return jsonify({"error": "query required"}), 400
-    res = retrieve_and_generate(query, top_k=top_k)
+    if payload.get("stream"):
+        events = stream_enhanced(query, top_k=top_k, deadline=request_deadline(payload),
+                                 use_cache=bool(payload.get("cache", True)), project_ids=project_ids(payload),
+                                 meeting_id=meeting_scope(payload))
+        return Response(stream_with_context(sse_stream(events)), mimetype="text/event-stream", headers=SSE_HEADERS)
+    res = retrieve_and_generate(query, top_k=top_k, hedge=hedge, deadline=request_deadline(payload),
+                                use_cache=bool(payload.get("cache", True)), verify_mode=verify_mode(payload),
+                                project_ids=project_ids(payload), meeting_id=meeting_scope(payload))
     return jsonify(res), 200
 
+@bp.get("/verification/<ticket>")
+def verification_status(ticket):
+    """
+    Result of a background verification: status "pending" | "running" | "done" | "error";
+    when done, "result" holds the verified answer ("corrected" tells whether it changed).
+    ?wait=<seconds> (max 30) long-polls until the verification finishes.
+    """
+    wait = min(float(request.args.get("wait", 0) or 0), 30.0)
+    body, status = verification_ticket(ticket, wait)
+    return jsonify(body), status
+
+def late_join_request(payload: dict):
+    """(meeting_id, since_iso, since) from a late-join payload; ValueError with the message to return."""
+    meeting_id = payload.get("meeting_id")
+    since_iso = payload.get("since_iso")
+    if not meeting_id or not since_iso:
+        raise ValueError("meeting_id and since_iso required")
+    try:
+        since = datetime.fromisoformat(since_iso.replace("Z", "+00:00"))
+    except Exception as e:
+        raise ValueError(f"invalid since_iso: {e}")
+    return int(meeting_id), since_iso, since
+
+def coalesced_late_join_summary(meeting_id: int, since_iso: str, since: datetime) -> dict:
+    # a room full of late joiners asks at once: build the summary once
+    return get_flight("late_join_summary").do(
+        flight_key(meeting_id, since_iso), _late_join_summary, meeting_id, since)
+
 @bp.route("/late_join_summary", methods=["POST"])
 def late_join_summary():
     """
     Provide summary for new joiner from time X.
     Accepts JSON:
     { "meeting_id": 123, "since_iso": "2025-09-27T10:00:00Z" }
+    Meetings with segments are summarized from the cached window summaries
+    after since_iso; others fall back to their ingested transcript chunks.
+    """
+    try:
+        meeting_id, since_iso, since = late_join_request(request.get_json(force=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(coalesced_late_join_summary(meeting_id, since_iso, since)), 200
+
+def _late_join_summary(meeting_id, since: datetime) -> dict:
+    windowed = windowed_late_join_summary(int(meeting_id), since)
+    if windowed is not None:
+        return {**windowed, "source": "window_summaries"}
+    # no segments: the transcript carries no meeting times, so summarize all of it
+    return {**summarize_meeting(int(meeting_id)), "source": "transcript"}
+
+def coalesced_meeting_summary(meeting_id: int) -> dict:
+    return get_flight("summarize_meeting").do(flight_key(meeting_id), summarize_meeting, meeting_id)
+
+@bp.route("/summarize_meeting", methods=["POST"])
+def summarize_meeting_route():
+    """
+    Map-reduce summary of a whole meeting transcript, any length.
+    Accepts JSON: { "meeting_id": 123 }
+    Returns the summary with "groups", "levels", "llm_calls" and "cached"
+    (partial summaries reused from earlier runs).
     """
     payload = request.get_json(force=True)
     meeting_id = payload.get("meeting_id")
-    since_iso = payload.get("since_iso")
-    if not meeting_id or not since_iso:
-        return jsonify({"error": "meeting_id and since_iso required"}), 400
-    try:
-        since = datetime.fromisoformat(since_iso.replace("Z", "+00:00"))
-    except Exception as e:
-        return jsonify({"error": f"invalid since_iso: {e}"}), 400
-
-    # We retrieve transcript text, then filter chunks by metadata created_at
-    from services.vector_store import FaissVectorStore
-    from services.embeddings import Embeddings
-    EMB = Embeddings()
-    VS = FaissVectorStore(dim=EMB.model.get_sentence_embedding_dimension())
-    # gather only metadata matching meeting_id
-    matches = [m for m in VS.metadata if int(m.get("meeting_id", -1)) == int(meeting_id)]
-    # sort by chunk_index and combine
-    matches_sorted = sorted(matches, key=lambda x: x.get("chunk_index", 0))
-    combined = "\n\n".join([m.get("text_snippet","") for m in matches_sorted])
-    # create a prompt to summarize "since" - use LLM
-    from services.llm_client import generate
-    prompt = f"Provide a concise summary of the following meeting text that occurred since {since_iso}:\n\n{combined}"
-    summary = generate(prompt, max_tokens=400)
-    return jsonify({"summary": summary}), 200
+    if not meeting_id:
+        return jsonify({"error": "meeting_id required"}), 400
+    result = coalesced_meeting_summary(int(meeting_id))
+    if not result["groups"]:
+        return jsonify({"error": "no transcript for this meeting"}), 404
+    return jsonify(result), 200
+
+def hypothetical_prompt(df: pd.DataFrame, prompt: str) -> str:
+    # do data computations locally
+    # small helper to convert dataframe to csv and show to LLM for scenario analysis
+    csv_buf = df.to_csv(index=False)
+    return f"Data (CSV):\n{csv_buf}\n\nUser scenario:\n{prompt}\n\nProvide a data-backed answer and show calculations if needed."
 
 @bp.route("/hypothetical", methods=["POST"])
 def hypothetical_route():
@@ -107,33 +248,112 @@ def hypothetical_route():
         df = pd.DataFrame(data)
 
     prompt = (request.form.get("prompt") if request.form else request.json.get("prompt"))
-    # do data computations locally
-    # small helper to convert dataframe to csv and show to LLM for scenario analysis
-    csv_buf = df.to_csv(index=False)
     from services.llm_client import generate
-    full_prompt = f"Data (CSV):\n{csv_buf}\n\nUser scenario:\n{prompt}\n\nProvide a data-backed answer and show calculations if needed."
-    answer = generate(full_prompt, max_tokens=600)
+    answer = generate(hypothetical_prompt(df, prompt), max_tokens=600)
     return jsonify({"answer": answer}), 200
 
 @bp.route("/semantic_search", methods=["POST"])
 def semantic_search():
     """
     Natural language search across all meeting transcripts.
-    Payload: { "query": "search text", "top_k": 10 }
+    Payload: { "query": "search text", "top_k": 10, "project_ids": [1, 2] }
+    Without project ids every project's shard is searched (in parallel).
     """
     payload = request.get_json(force=True)
     query = payload.get("query")
     top_k = int(payload.get("top_k", 10))
     if not query:
         return jsonify({"error":"query required"}), 400
-    from services.embeddings import Embeddings
-    emb = Embeddings()
-    from services.vector_store import FaissVectorStore
-    vs = FaissVectorStore(dim=emb.model.get_sentence_embedding_dimension())
-    qv = emb.embed_text(query).reshape(1, -1)
-    res = vs.search(qv, top_k=top_k)
+    qv = EMBEDDER.embed_text(query).reshape(1, -1)
+    res = VECTOR_STORE.search(qv, top_k=top_k, project_ids=project_ids(payload))
     return jsonify({"results": res}), 200
 
+# The builders below turn a route payload into the agent query (None when the
+# required field is missing). The async blueprint reuses them.
+
+def decision_support_query(payload: dict):
+    query = payload.get("query")
+    include_historical = payload.get("include_historical_context", True)
+    analysis_depth = payload.get("analysis_depth", "detailed")
+    if not query:
+        return None
+    
+    # Enhance query for decision analysis
+    enhanced_query = f"Decision support needed: {query}"
+    if analysis_depth != "quick":
+        enhanced_query += f" Please provide {analysis_depth} analysis."
+    return enhanced_query
+
+def technical_guidance_query(payload: dict):
+    query = payload.get("query")
+    tech_stack = payload.get("tech_stack", [])
+    complexity = payload.get("complexity", "intermediate")
+    if not query:
+        return None
+    
+    # Enhance query for technical guidance
+    enhanced_query = f"Technical guidance: {query}"
+    if tech_stack:
+        enhanced_query += f" Tech stack: {', '.join(tech_stack)}."
+    enhanced_query += f" Level: {complexity}."
+    return enhanced_query
+
+def scenario_analysis_query(payload: dict):
+    scenario = payload.get("scenario")
+    timeframe = payload.get("timeframe", "short_term")
+    include_mitigation = payload.get("include_mitigation", True)
+    if not scenario:
+        return None
+    
+    # Enhance query for scenario analysis
+    enhanced_query = f"Hypothetical scenario analysis: {scenario}"
+    enhanced_query += f" Timeframe: {timeframe}."
+    if include_mitigation:
+        enhanced_query += " Include mitigation strategies."
+    return enhanced_query
+
+def comprehensive_qa_query(payload: dict):
+    question = payload.get("question")
+    include_examples = payload.get("include_examples", True)
+    depth = payload.get("depth", "detailed")
+    if not question:
+        return None
+    
+    # Enhance query based on parameters
+    enhanced_query = question
+    if depth != "quick":
+        enhanced_query += f" Provide {depth} explanation."
+    if include_examples:
+        enhanced_query += " Include practical examples."
+    return enhanced_query
+
+def comprehensive_qa_verify_mode(payload: dict):
+    # this route asks for accuracy, so it verifies before answering unless told otherwise
+    if payload.get("verify_accuracy", True):
+        return "sync"
+    return verify_mode(payload)
+
+def annotate_comprehensive_qa(payload: dict, result: dict) -> dict:
+    # Additional verification for comprehensive mode
+    verified = result.get("verification", {}).get("status") == "done"
+    if verified and payload.get("verify_accuracy", True) and payload.get("depth", "detailed") == "comprehensive":
+        verification_note = "✅ This answer has undergone additional accuracy verification."
+        result["accuracy_note"] = verification_note
+    return result
+
+def workflow_assistance_query(payload: dict):
+    task = payload.get("task")
+    steps_detail = payload.get("steps_detail", "detailed")
+    include_troubleshooting = payload.get("include_troubleshooting", True)
+    if not task:
+        return None
+    
+    enhanced_query = f"Create a step-by-step workflow for: {task}"
+    enhanced_query += f" Provide {steps_detail} steps."
+    if include_troubleshooting:
+        enhanced_query += " Include common issues and solutions."
+    return enhanced_query
+
 @bp.route("/decision_support", methods=["POST"])
 def decision_support():
     """
@@ -145,19 +365,13 @@ def decision_support():
     }
     """
     payload = request.get_json(force=True)
-    query = payload.get("query")
-    include_historical = payload.get("include_historical_context", True)
-    analysis_depth = payload.get("analysis_depth", "detailed")
-    
-    if not query:
+    enhanced_query = decision_support_query(payload)
+    if not enhanced_query:
         return jsonify({"error": "query required"}), 400
     
-    # Enhance query for decision analysis
-    enhanced_query = f"Decision support needed: {query}"
-    if analysis_depth != "quick":
-        enhanced_query += f" Please provide {analysis_depth} analysis."
-    
-    result = retrieve_and_generate(enhanced_query, top_k=8)
+    result = retrieve_and_generate(enhanced_query, top_k=8, deadline=request_deadline(payload),
+                                   verify_mode=verify_mode(payload),
+                                   project_ids=project_ids(payload))
     return jsonify(result), 200
 
 @bp.route("/technical_guidance", methods=["POST"])
@@ -171,20 +385,13 @@ def technical_guidance():
     }
     """
     payload = request.get_json(force=True)
-    query = payload.get("query")
-    tech_stack = payload.get("tech_stack", [])
-    complexity = payload.get("complexity", "intermediate")
-    
-    if not query:
+    enhanced_query = technical_guidance_query(payload)
+    if not enhanced_query:
         return jsonify({"error": "query required"}), 400
     
-    # Enhance query for technical guidance
-    enhanced_query = f"Technical guidance: {query}"
-    if tech_stack:
-        enhanced_query += f" Tech stack: {', '.join(tech_stack)}."
-    enhanced_query += f" Level: {complexity}."
-    
-    result = retrieve_and_generate(enhanced_query, top_k=6)
+    result = retrieve_and_generate(enhanced_query, top_k=6, deadline=request_deadline(payload),
+                                   verify_mode=verify_mode(payload),
+                                   project_ids=project_ids(payload))
     return jsonify(result), 200
 
 @bp.route("/scenario_analysis", methods=["POST"])
@@ -198,20 +405,13 @@ def scenario_analysis():
     }
     """
     payload = request.get_json(force=True)
-    scenario = payload.get("scenario")
-    timeframe = payload.get("timeframe", "short_term")
-    include_mitigation = payload.get("include_mitigation", True)
-    
-    if not scenario:
+    enhanced_query = scenario_analysis_query(payload)
+    if not enhanced_query:
         return jsonify({"error": "scenario required"}), 400
     
-    # Enhance query for scenario analysis
-    enhanced_query = f"Hypothetical scenario analysis: {scenario}"
-    enhanced_query += f" Timeframe: {timeframe}."
-    if include_mitigation:
-        enhanced_query += " Include mitigation strategies."
-    
-    result = retrieve_and_generate(enhanced_query, top_k=10)
+    result = retrieve_and_generate(enhanced_query, top_k=10, deadline=request_deadline(payload),
+                                   verify_mode=verify_mode(payload),
+                                   project_ids=project_ids(payload))
     return jsonify(result), 200
 
 @bp.route("/comprehensive_qa", methods=["POST"])
@@ -226,29 +426,14 @@ def comprehensive_qa():
     }
     """
     payload = request.get_json(force=True)
-    question = payload.get("question")
-    verify_accuracy = payload.get("verify_accuracy", True)
-    include_examples = payload.get("include_examples", True)
-    depth = payload.get("depth", "detailed")
-    
-    if not question:
+    enhanced_query = comprehensive_qa_query(payload)
+    if not enhanced_query:
         return jsonify({"error": "question required"}), 400
     
-    # Enhance query based on parameters
-    enhanced_query = question
-    if depth != "quick":
-        enhanced_query += f" Provide {depth} explanation."
-    if include_examples:
-        enhanced_query += " Include practical examples."
-    
-    result = retrieve_and_generate(enhanced_query, top_k=8)
-    
-    # Additional verification for comprehensive mode
-    if verify_accuracy and depth == "comprehensive":
-        verification_note = "✅ This answer has undergone additional accuracy verification."
-        result["accuracy_note"] = verification_note
-    
-    return jsonify(result), 200
+    result = retrieve_and_generate(enhanced_query, top_k=8, deadline=request_deadline(payload),
+                                   verify_mode=comprehensive_qa_verify_mode(payload),
+                                   project_ids=project_ids(payload))
+    return jsonify(annotate_comprehensive_qa(payload, result)), 200
 
 @bp.route("/workflow_assistance", methods=["POST"])
 def workflow_assistance():
@@ -261,17 +446,11 @@ def workflow_assistance():
     }
     """
     payload = request.get_json(force=True)
-    task = payload.get("task")
-    steps_detail = payload.get("steps_detail", "detailed")
-    include_troubleshooting = payload.get("include_troubleshooting", True)
-    
-    if not task:
+    enhanced_query = workflow_assistance_query(payload)
+    if not enhanced_query:
         return jsonify({"error": "task required"}), 400
     
-    enhanced_query = f"Create a step-by-step workflow for: {task}"
-    enhanced_query += f" Provide {steps_detail} steps."
-    if include_troubleshooting:
-        enhanced_query += " Include common issues and solutions."
-    
-    result = retrieve_and_generate(enhanced_query, top_k=5)
+    result = retrieve_and_generate(enhanced_query, top_k=5, deadline=request_deadline(payload),
+                                   verify_mode=verify_mode(payload),
+                                   project_ids=project_ids(payload))
     return jsonify(result), 200
\ No newline at end of file
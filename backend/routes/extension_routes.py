@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import load_only
 from models import db, RawMeetingTranscript, Meeting, MeetingTranscript
+from utils.pagination import keyset_paginate, parse_page_args
 from datetime import datetime
 import json
 
@@ -86,7 +88,7 @@ def save_processed_transcript():
             for segment_data in segments:
                 segment = MeetingSegment(
                     meeting_id=meeting_id,
-                    t_start_ms=segment_data.get('t_start_ms'),
+                    t_start_ms=segment_data.get('t_start_ms') or 0,
                     t_end_ms=segment_data.get('t_end_ms'),
                     speaker_label=segment_data.get('speaker_label'),
                     text=segment_data.get('text'),
@@ -95,6 +97,10 @@ def save_processed_transcript():
                 db.session.add(segment)
         
         db.session.commit()
+        if segments:
+            # summarize the meeting's newly closed time windows in the background
+            from services.rolling_summary import ROLLING_SUMMARIES
+            ROLLING_SUMMARIES.notify(meeting_id)
         
         return jsonify({
             "message": "Processed transcript saved successfully",
@@ -113,8 +119,15 @@ def get_user_meetings():
     """
     try:
         # In a real implementation, you'd get user_id from authentication
-        # For now, we'll return all meetings
-        meetings = Meeting.query.order_by(Meeting.created_at.desc()).limit(10).all()
+        # For now, we'll return all meetings, newest first, 10 per page by default
+        limit, cursor = parse_page_args(request.args, default_limit=10)
+        query = Meeting.query.options(load_only(
+            Meeting.id, Meeting.title, Meeting.platform,
+            Meeting.started_at, Meeting.ended_at, Meeting.created_at
+        ))
+        meetings, next_cursor = keyset_paginate(
+            query, [Meeting.created_at, Meeting.id], limit, cursor, descending=True
+        )
         
         result = []
         for meeting in meetings:
@@ -126,7 +139,9 @@ def get_user_meetings():
                 "ended_at": meeting.ended_at.isoformat() if meeting.ended_at else None
             })
         
-        return jsonify({"meetings": result}), 200
-        
+        return jsonify({"meetings": result, "next_cursor": next_cursor}), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to fetch meetings: {str(e)}"}), 500
\ No newline at end of file
@@ -1,10 +1,123 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from sqlalchemy.orm import load_only
+from models import Meeting, MeetingTranscript, MeetingSegment
+from utils.pagination import keyset_paginate, parse_page_args
+from services.export import EXPORT_KINDS, export_ndjson, parse_iso_datetime
 
 bp = Blueprint("meetings", __name__, url_prefix="/api/meetings")
 
+
+def _iso(dt):
+    return dt.isoformat() if dt else None
+
+
 @bp.get("/")
 def list_meetings():
-    return jsonify({"items": []})
+    """
+    Newest first, keyset paginated.
+    Query params: limit, cursor (from the previous page's next_cursor), project_id
+    """
+    try:
+        limit, cursor = parse_page_args(request.args)
+        query = Meeting.query.options(load_only(
+            Meeting.id, Meeting.project_id, Meeting.title, Meeting.platform,
+            Meeting.started_at, Meeting.ended_at, Meeting.created_at
+        ))
+        project_id = request.args.get("project_id", type=int)
+        if project_id is not None:
+            query = query.filter(Meeting.project_id == project_id)
+        meetings, next_cursor = keyset_paginate(
+            query, [Meeting.created_at, Meeting.id], limit, cursor, descending=True
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = [{
+        "id": m.id,
+        "project_id": m.project_id,
+        "title": m.title,
+        "platform": m.platform,
+        "started_at": _iso(m.started_at),
+        "ended_at": _iso(m.ended_at),
+        "created_at": _iso(m.created_at),
+    } for m in meetings]
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@bp.get("/<int:meeting_id>/transcripts")
+def list_meeting_transcripts(meeting_id):
+    """Transcript headers for a meeting, oldest first. full_text is never loaded here."""
+    try:
+        limit, cursor = parse_page_args(request.args)
+        query = MeetingTranscript.query.options(load_only(
+            MeetingTranscript.id, MeetingTranscript.meeting_id,
+            MeetingTranscript.created_at, MeetingTranscript.updated_at
+        )).filter(MeetingTranscript.meeting_id == meeting_id)
+        transcripts, next_cursor = keyset_paginate(query, [MeetingTranscript.id], limit, cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = [{
+        "id": t.id,
+        "meeting_id": t.meeting_id,
+        "created_at": _iso(t.created_at),
+        "updated_at": _iso(t.updated_at),
+    } for t in transcripts]
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@bp.get("/<int:meeting_id>/segments")
+def list_meeting_segments(meeting_id):
+    """Segments of a meeting in time order (meeting_segments(meeting_id, t_start_ms, id) index)."""
+    try:
+        limit, cursor = parse_page_args(request.args)
+        query = MeetingSegment.query.filter(MeetingSegment.meeting_id == meeting_id)
+        segments, next_cursor = keyset_paginate(
+            query, [MeetingSegment.t_start_ms, MeetingSegment.id], limit, cursor
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items = [{
+        "id": s.id,
+        "t_start_ms": s.t_start_ms,
+        "t_end_ms": s.t_end_ms,
+        "speaker_label": s.speaker_label,
+        "text": s.text,
+        "confidence": s.confidence,
+    } for s in segments]
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@bp.get("/export")
+def export_meetings():
+    """
+    Stream meetings, transcripts and segments as NDJSON straight from a DB cursor.
+    Query params:
+      kinds=meetings,transcripts,segments (default: all)
+      project_id, since, until (ISO 8601, applied to meeting created_at)
+      gzip=1 to receive application/gzip
+    """
+    kinds = [k.strip() for k in request.args.get("kinds", ",".join(EXPORT_KINDS)).split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in EXPORT_KINDS]
+    if unknown or not kinds:
+        return jsonify({"error": f"kinds must be a subset of {', '.join(EXPORT_KINDS)}"}), 400
+    try:
+        since = parse_iso_datetime(request.args.get("since"))
+        until = parse_iso_datetime(request.args.get("until"))
+    except ValueError as e:
+        return jsonify({"error": f"invalid date: {e}"}), 400
+    project_id = request.args.get("project_id", type=int)
+    gzip = request.args.get("gzip", "").lower() in ("1", "true", "yes")
+
+    body = export_ndjson(kinds, project_id=project_id, since=since, until=until, gzip=gzip)
+    filename = "meetings_export.ndjson" + (".gz" if gzip else "")
+    return Response(
+        stream_with_context(body),
+        mimetype="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
 
 @bp.post("/")
 def create_meeting():
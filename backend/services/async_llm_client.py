@@ -0,0 +1,424 @@
+# backend/services/async_llm_client.py
+import os
+import time
+import asyncio
+import weakref
+from typing import Dict
+import httpx
+from services.provider_health import ProviderHealth
+from services.single_flight import get_flight
+from services.llm_client import (
+    llm_client, configured_providers, dummy_response,
+    build_gemini_request, parse_gemini_response,
+    build_openai_request, openai_status_error, parse_chat_response,
+    build_ollama_request, parse_ollama_response,
+    build_groq_request,
+    STREAMING_PROVIDERS, streaming_request, parse_chat_stream_line, parse_ollama_stream_line, chunk_text,
+    LLM_POOL_SIZE, LLM_MAX_RETRIES, RETRY_STATUSES, retry_delay,
+    LLM_HEDGE_PERCENTILE, LLM_HEDGE_DELAY_MS, LLM_HEDGE_MAX, FALLBACK_ANSWER, is_shareable_answer,
+)
+
+# in-flight LLM calls per process / per provider
+LLM_ASYNC_MAX_CONCURRENCY = int(os.environ.get("LLM_ASYNC_MAX_CONCURRENCY", 256))
+LLM_ASYNC_PROVIDER_CONCURRENCY = int(os.environ.get("LLM_ASYNC_PROVIDER_CONCURRENCY", 64))
+
+
+class AsyncLLMClient:
+    """
+    asyncio counterpart of LLMClient: same providers, request payloads,
+    health-ordered fallback, hedging and deadline handling, but a waiting
+    call costs a coroutine instead of a worker thread.
+
+    Concurrency is bounded twice: a global semaphore caps total in-flight
+    calls and a per-provider semaphore keeps one provider from taking the
+    whole budget (and from tripping its rate limits). Circuit-breaker state
+    is shared with the sync client, so both route on the same health data.
+
+    httpx clients and semaphores belong to the event loop they were created
+    on; use get_async_llm_client() to get the instance for the running loop.
+    """
+
+    def __init__(self, max_concurrency: int = None, provider_concurrency: int = None,
+                 pool_size: int = None, max_retries: int = None, health: dict = None):
+        self.max_concurrency = max_concurrency or LLM_ASYNC_MAX_CONCURRENCY
+        self.provider_concurrency = provider_concurrency or LLM_ASYNC_PROVIDER_CONCURRENCY
+        self.pool_size = pool_size or LLM_POOL_SIZE
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.health = llm_client.health if health is None else health
+        self._clients = {}
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+        self._provider_limits = {}
+        self.hedge_stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        """Keep-alive connection pool per provider, sized to its concurrency limit."""
+        client = self._clients.get(provider)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=max(self.pool_size, self.provider_concurrency),
+                max_keepalive_connections=self.pool_size,
+            )
+            client = httpx.AsyncClient(limits=limits)
+            self._clients[provider] = client
+        return client
+
+    def _health(self, name: str) -> ProviderHealth:
+        health = self.health.get(name)
+        if health is None:
+            health = self.health.setdefault(name, ProviderHealth(name))
+        return health
+
+    def _provider_limit(self, provider: str) -> asyncio.Semaphore:
+        limit = self._provider_limits.get(provider)
+        if limit is None:
+            limit = self._provider_limits.setdefault(provider, asyncio.Semaphore(self.provider_concurrency))
+        return limit
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    async def _post(self, provider: str, req: dict, kwargs: dict) -> httpx.Response:
+        """
+        POST with the same retry policy as LLMClient._post(): retry transport
+        errors and RETRY_STATUSES with retry_delay() between attempts, and
+        stop retrying once the wait would not fit in the deadline.
+        """
+        client = self._client(provider)
+        deadline = kwargs.get("deadline")
+        attempt = 0
+        while True:
+            try:
+                response = await client.post(req["url"], headers=req["headers"], json=req["payload"],
+                                             timeout=llm_client._timeout(kwargs, req["timeout"]))
+            except httpx.TransportError:
+                delay = retry_delay(attempt, None, deadline) if attempt < self.max_retries else None
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = retry_delay(attempt, response.headers.get("Retry-After"), deadline)
+                if delay is None:
+                    return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, name: str, deadline) -> bool:
+        """
+        Take a global and a per-provider slot, waiting no longer than the
+        deadline allows. False, holding neither, when the budget ran out first.
+        """
+        held = []
+        try:
+            for limit in (self._limit, self._provider_limit(name)):
+                await asyncio.wait_for(limit.acquire(), deadline.remaining() if deadline is not None else None)
+                held.append(limit)
+            return True
+        except asyncio.TimeoutError:
+            for limit in held:
+                limit.release()
+            return False
+        except BaseException:
+            for limit in held:
+                limit.release()
+            raise
+
+    def _release(self, name: str):
+        self._provider_limit(name).release()
+        self._limit.release()
+
+    async def call_gemini(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        req = build_gemini_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
+        try:
+            response = await self._post("gemini", req, kwargs)
+            response.raise_for_status()
+            return parse_gemini_response(response.json())
+        except httpx.HTTPError as e:
+            return {"error": f"Gemini API error: {str(e)}", "text": ""}
+
+    async def call_openai_compatible(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        req = build_openai_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
+        try:
+            response = await self._post("openai", req, kwargs)
+            status_error = openai_status_error(response.status_code, response.text, req["payload"]["model"])
+            if status_error:
+                return status_error
+            return parse_chat_response(response.json(), "openai")
+        except httpx.TimeoutException:
+            return {"error": "API timeout", "text": ""}
+        except Exception as e:
+            return {"error": f"API error: {str(e)}", "text": ""}
+
+    async def call_ollama(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        req = build_ollama_request(prompt, system_prompt, **kwargs)
+        try:
+            response = await self._post("ollama", req, kwargs)
+            response.raise_for_status()
+            return parse_ollama_response(response.json())
+        except httpx.HTTPError:
+            return {"error": "Ollama not available", "text": ""}
+
+    async def call_groq(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        req = build_groq_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
+        try:
+            response = await self._post("groq", req, kwargs)
+            response.raise_for_status()
+            return parse_chat_response(response.json(), "groq")
+        except httpx.HTTPError as e:
+            return {"error": f"Groq API error: {str(e)}", "text": ""}
+
+    async def call_dummy(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        return dummy_response(prompt)
+
+    def route_providers(self) -> list:
+        """Same order as LLMClient.route_providers(), with coroutine callables."""
+        calls = {
+            "gemini": self.call_gemini,
+            "openai": self.call_openai_compatible,
+            "ollama": self.call_ollama,
+            "groq": self.call_groq,
+        }
+        names = sorted(configured_providers(), key=lambda n: self._health(n).routing_key())
+        return [(name, calls[name]) for name in names] + [("dummy", self.call_dummy)]
+
+    async def _call_tracked(self, name: str, provider_func, prompt: str, system_prompt: str, **kwargs) -> Dict:
+        """Call one provider under the concurrency limits, feeding its circuit breaker."""
+        if name == "dummy":
+            return await provider_func(prompt, system_prompt, **kwargs)
+        deadline = kwargs.get("deadline")
+        if deadline is not None and deadline.expired():
+            return {"error": f"{name} skipped, deadline exceeded", "text": "", "skipped": True}
+        health = self._health(name)
+        if not health.allow_request():
+            return {"error": f"{name} circuit open", "text": "", "skipped": True}
+        if not await self._acquire(name, deadline):
+            health.release_probe()
+            return {"error": f"{name} skipped, deadline exceeded waiting for a slot", "text": "", "skipped": True}
+        try:
+            # time spent queueing on the semaphores is ours, not the provider's
+            started = time.monotonic()
+            result = await provider_func(prompt, system_prompt, **kwargs)
+        except asyncio.CancelledError:
+            # lost a hedge race: no verdict on the provider
+            health.release_probe()
+            raise
+        finally:
+            self._release(name)
+        if result.get("text") and not result.get("error"):
+            health.record_success(time.monotonic() - started)
+            llm_client.cache_store(name, prompt, system_prompt, kwargs, result["text"])
+        elif deadline is not None and deadline.expired():
+            health.release_probe()
+        else:
+            health.record_failure()
+        return result
+
+    async def generate(self, prompt: str, system_prompt: str = "", hedge: bool = False, **kwargs) -> str:
+        """
+        Async LLMClient.generate(): providers in health order, dummy last.
+        Shares LLMClient's cache; identical in-flight calls are coalesced
+        (fallback answers are not shared, see LLMClient.generate).
+        """
+        cached = llm_client.cached_response(prompt, system_prompt, **kwargs)
+        if cached is not None:
+            return cached
+        key = llm_client._flight_key(prompt, system_prompt, hedge, kwargs)
+        if key is None:
+            return await self._generate(prompt, system_prompt, hedge, **kwargs)
+        deadline = kwargs.get("deadline")
+        return await get_flight("llm_generate").ado(
+            key, self._generate, prompt, system_prompt, hedge,
+            wait_timeout=deadline.remaining() if deadline is not None else None,
+            shareable=is_shareable_answer, **kwargs)
+
+    async def _generate(self, prompt: str, system_prompt: str = "", hedge: bool = False, **kwargs) -> str:
+        if hedge:
+            return await self._generate_hedged(prompt, system_prompt, **kwargs)
+
+        for name, provider_func in self.route_providers():
+            result = await self._call_tracked(name, provider_func, prompt, system_prompt, **kwargs)
+            if result.get("text") and not result.get("error"):
+                print(f"✅ LLM response from {result.get('provider', 'unknown')}")
+                return result["text"]
+            elif not result.get("skipped"):
+                print(f"⚠️ {name} failed: {result.get('error', 'Unknown error')}")
+
+        return FALLBACK_ANSWER
+
+    async def _generate_hedged(self, prompt: str, system_prompt: str = "", **kwargs) -> str:
+        """Async LLMClient._generate_hedged(): losing requests are cancelled outright."""
+        candidates = [p for p in self.route_providers() if p[0] != "dummy"]
+        self.hedge_stats["calls"] += 1
+        running = {}
+        hedges = 0
+        next_idx = 0
+
+        def launch():
+            nonlocal next_idx
+            name, func = candidates[next_idx]
+            next_idx += 1
+            task = asyncio.ensure_future(self._call_tracked(name, func, prompt, system_prompt, **kwargs))
+            running[task] = name
+
+        def hedge_delay(name):
+            observed = self._health(name).latency_percentile(LLM_HEDGE_PERCENTILE)
+            return observed if observed is not None else LLM_HEDGE_DELAY_MS / 1000
+
+        if candidates:
+            launch()
+        deadline = kwargs.get("deadline")
+        try:
+            while running:
+                can_hedge = next_idx < len(candidates) and hedges < LLM_HEDGE_MAX
+                timeout = hedge_delay(next(iter(running.values()))) if can_hedge else None
+                if deadline is not None:
+                    timeout = deadline.remaining() if timeout is None else deadline.timeout(timeout)
+                done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done and deadline is not None and deadline.expired():
+                    print("⏰ Deadline exceeded while waiting for LLM providers")
+                    break
+                if not done and not can_hedge:
+                    continue
+                if not done:
+                    hedges += 1
+                    self.hedge_stats["hedged"] += 1
+                    print(f"⏱️ {next(iter(running.values()))} slow, hedging with {candidates[next_idx][0]}")
+                    launch()
+                    continue
+
+                for task in done:
+                    name = running.pop(task)
+                    result = task.result()
+                    if result.get("text") and not result.get("error"):
+                        if hedges and name != candidates[0][0]:
+                            self.hedge_stats["hedge_wins"] += 1
+                        print(f"✅ LLM response from {result.get('provider', 'unknown')}")
+                        return result["text"]
+                    if not result.get("skipped"):
+                        print(f"⚠️ {name} failed: {result.get('error', 'Unknown error')}")
+                if not running and next_idx < len(candidates):
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        return dummy_response(prompt)["text"]
+
+    async def _stream_provider(self, name: str, prompt: str, system_prompt: str, **kwargs):
+        builders = {
+            "openai": (build_openai_request, parse_chat_stream_line),
+            "groq": (build_groq_request, parse_chat_stream_line),
+            "ollama": (build_ollama_request, parse_ollama_stream_line),
+        }
+        build, parse_line = builders[name]
+        req = build(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            raise RuntimeError(req["error"])
+        req = streaming_request(req)
+        timeout = llm_client._timeout(kwargs, req["timeout"])
+        async with self._client(name).stream("POST", req["url"], headers=req["headers"], json=req["payload"],
+                                             timeout=timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                delta, finished = parse_line(line)
+                if delta:
+                    yield delta
+                if finished:
+                    return
+
+    async def stream_generate(self, prompt: str, system_prompt: str = "", **kwargs):
+        """Async LLMClient.stream_generate(): yields text chunks as they arrive."""
+        cached = llm_client.cached_response(prompt, system_prompt, **kwargs)
+        if cached is not None:
+            for chunk in chunk_text(cached):
+                yield chunk
+            return
+        deadline = kwargs.get("deadline")
+        for name, provider_func in self.route_providers():
+            if name not in STREAMING_PROVIDERS:
+                result = await self._call_tracked(name, provider_func, prompt, system_prompt, **kwargs)
+                if result.get("text") and not result.get("error"):
+                    for chunk in chunk_text(result["text"]):
+                        yield chunk
+                    return
+                if not result.get("skipped"):
+                    print(f"⚠️ {name} failed: {result.get('error', 'Unknown error')}")
+                continue
+
+            if deadline is not None and deadline.expired():
+                continue
+            health = self._health(name)
+            if not health.allow_request():
+                continue
+            if not await self._acquire(name, deadline):
+                health.release_probe()
+                continue
+            sent = False
+            parts = []
+            try:
+                started = time.monotonic()
+                async for delta in self._stream_provider(name, prompt, system_prompt, **kwargs):
+                    sent = True
+                    parts.append(delta)
+                    yield delta
+            except (GeneratorExit, asyncio.CancelledError):
+                health.release_probe()
+                raise
+            except Exception as e:
+                if deadline is not None and deadline.expired():
+                    health.release_probe()
+                else:
+                    health.record_failure()
+                print(f"⚠️ {name} stream failed: {e}")
+                if sent:
+                    return
+                continue
+            finally:
+                self._release(name)
+            if sent:
+                health.record_success(time.monotonic() - started)
+                llm_client.cache_store(name, prompt, system_prompt, kwargs, "".join(parts))
+                print(f"✅ LLM stream from {name}")
+                return
+            health.record_failure()
+
+        yield FALLBACK_ANSWER
+
+    def concurrency_status(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "provider_concurrency": self.provider_concurrency,
+            "available": self._limit._value,
+            "providers": {name: limit._value for name, limit in self._provider_limits.items()},
+        }
+
+
+# one client per event loop (httpx pools and semaphores are loop-bound)
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_llm_client() -> AsyncLLMClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncLLMClient()
+    return client
+
+
+async def agenerate(prompt: str, system_prompt: str = "", **kwargs) -> str:
+    return await get_async_llm_client().generate(prompt, system_prompt, **kwargs)
+
+
+async def astream_generate(prompt: str, system_prompt: str = "", **kwargs):
+    async for chunk in get_async_llm_client().stream_generate(prompt, system_prompt, **kwargs):
+        yield chunk
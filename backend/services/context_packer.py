@@ -0,0 +1,133 @@
+# backend/services/context_packer.py
+import os
+import re
+
+# prompt context budget (estimated tokens) shared by all retrieved chunks
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("RAG_CONTEXT_TOKEN_BUDGET", 1500))
+# a span that does not fit is cut to the remaining budget only if at least this much is left
+MIN_PARTIAL_TOKENS = int(os.environ.get("RAG_CONTEXT_MIN_PARTIAL_TOKENS", 80))
+# shortest suffix/prefix match accepted as chunk overlap (ingest overlaps by RAG_CHUNK_OVERLAP)
+MIN_OVERLAP_CHARS = 20
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English BPE vocabularies)."""
+    return (len(text) + 3) // 4
+
+
+def chunk_body(chunk: dict) -> str:
+    """Full chunk text ("text", stored at ingest) or the older 400-char "text_snippet"."""
+    meta = chunk.get("metadata", {})
+    return meta.get("text") or meta.get("text_snippet", "")
+
+
+def _merge_overlap(a: str, b: str) -> str:
+    """a + b without the text b repeats from the end of a; None if they do not overlap."""
+    probe = b[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return None
+    pos = a.find(probe)
+    while pos != -1:
+        if b.startswith(a[pos:]):
+            return a + b[len(a) - pos:]
+        pos = a.find(probe, pos + 1)
+    return None
+
+
+def _spans(chunks: list) -> list:
+    """
+    Group retrieved chunks into spans: consecutive chunks of one meeting whose
+    texts overlap are joined into one. Each span keeps the best (lowest L2)
+    score of its members and the rank of its best-ranked member.
+    """
+    by_meeting = {}
+    for rank, chunk in enumerate(chunks):
+        meta = chunk.get("metadata", {})
+        by_meeting.setdefault(meta.get("meeting_id"), []).append((rank, chunk))
+
+    spans = []
+    for meeting_id, members in by_meeting.items():
+        members.sort(key=lambda m: (m[1].get("metadata", {}).get("chunk_index") is None,
+                                    m[1].get("metadata", {}).get("chunk_index") or 0))
+        current = None
+        for rank, chunk in members:
+            meta = chunk.get("metadata", {})
+            text = chunk_body(chunk)
+            index = meta.get("chunk_index")
+            if current is not None and index is not None and current["last_index"] is not None \
+                    and index <= current["last_index"] and text in current["text"]:
+                # the same chunk again (e.g. a re-ingested transcript)
+                current["rank"] = min(current["rank"], rank)
+                current["score"] = min(current["score"], chunk.get("score", 0.0))
+                continue
+            if current is not None and index is not None and current["last_index"] is not None \
+                    and index == current["last_index"] + 1:
+                merged = _merge_overlap(current["text"], text)
+                if merged is not None:
+                    current["text"] = merged
+                    current["last_index"] = index
+                    current["rank"] = min(current["rank"], rank)
+                    current["score"] = min(current["score"], chunk.get("score", 0.0))
+                    continue
+            current = {"meeting_id": meeting_id, "first_index": index, "last_index": index, "text": text,
+                       "rank": rank, "score": chunk.get("score", 0.0), "metadata": meta, "id": chunk.get("id")}
+            spans.append(current)
+    spans.sort(key=lambda s: s["rank"])
+    return spans
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """text cut to about max_tokens, at the last sentence end when there is one."""
+    cut = text[:max_tokens * 4]
+    ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+    if ends and ends[-1] > len(cut) // 2:
+        cut = cut[:ends[-1]]
+    return cut.rstrip() + " …"
+
+
+def pack_context(retrieved_chunks: list, token_budget: int = None) -> list:
+    """
+    Prompt-ready context from vector store results: overlapping neighbours of
+    the same meeting merged, duplicate spans dropped, and spans added in
+    relevance order until token_budget (RAG_CONTEXT_TOKEN_BUDGET) is used.
+
+    Returns chunk-shaped dicts ({"score", "metadata", "id"}) so prompt
+    builders can use them in place of the raw results; metadata["text_snippet"]
+    holds the packed text and metadata["chunk_range"] the merged chunk indices.
+    """
+    if not retrieved_chunks:
+        return []
+    budget = CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+
+    packed, seen, used = [], [], 0
+    for span in _spans(retrieved_chunks):
+        text = span["text"].strip()
+        normalized = " ".join(text.lower().split())
+        # the same text (re-ingested transcript) or text already inside a kept span
+        if not normalized or any(normalized in s for s in seen):
+            continue
+        tokens = estimate_tokens(text)
+        if used + tokens > budget:
+            remaining = budget - used
+            if remaining < MIN_PARTIAL_TOKENS:
+                break
+            text = _truncate(text, remaining)
+            tokens = estimate_tokens(text)
+        seen.append(normalized)
+        used += tokens
+
+        first, last = span["first_index"], span["last_index"]
+        chunk_range = f"{first}-{last}" if first != last else first
+        packed.append({
+            "score": span["score"],
+            "id": span["id"],
+            "metadata": {**span["metadata"], "text_snippet": text, "text": text,
+                         "chunk_index": first, "chunk_range": chunk_range, "tokens": tokens},
+        })
+        if used >= budget:
+            break
+
+    print(f"📦 Packed {len(retrieved_chunks)} chunks into {len(packed)} spans (~{used} tokens)")
+    return packed
@@ -0,0 +1,35 @@
+# backend/services/deadline.py
+import os
+import time
+
+# default end-to-end budget for one AI request
+REQUEST_TIMEOUT_MS = int(os.environ.get("RAG_REQUEST_TIMEOUT_MS", 30000))
+
+
+class Deadline:
+    """
+    Absolute point in time a request must finish by. Passed from the route
+    through the RAG agent into LLMClient so every stage only gets the budget
+    that is actually left.
+    """
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_ms(cls, ms=None):
+        return cls((ms if ms is not None else REQUEST_TIMEOUT_MS) / 1000)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Per-call timeout: the stage's own cap, shortened to what is left."""
+        return min(cap, self.remaining())
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.2f}s of {self.budget:.2f}s)"
@@ -0,0 +1,31 @@
+# backend/services/executors.py
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Embedding and FAISS search are CPU-bound (numpy/torch release the GIL), so
+# async views hand them to a small dedicated pool instead of the event loop or
+# asyncio's shared default executor. Sized to cores, not to request concurrency.
+RAG_CPU_WORKERS = int(os.environ.get("RAG_CPU_WORKERS", min(8, os.cpu_count() or 1)))
+
+CPU_EXECUTOR = ThreadPoolExecutor(max_workers=RAG_CPU_WORKERS, thread_name_prefix="rag-cpu")
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Run a blocking CPU-bound call on CPU_EXECUTOR and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(CPU_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+# Meeting summaries block on the database and on sequential provider calls for
+# seconds at a time; they get their own pool so a burst of them cannot starve
+# embedding and search on CPU_EXECUTOR.
+RAG_BLOCKING_WORKERS = int(os.environ.get("RAG_BLOCKING_WORKERS", 8))
+
+BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=RAG_BLOCKING_WORKERS, thread_name_prefix="rag-blocking")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking DB/LLM call on BLOCKING_EXECUTOR and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(BLOCKING_EXECUTOR, functools.partial(func, *args, **kwargs))
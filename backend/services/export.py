@@ -0,0 +1,128 @@
+# backend/services/export.py
+import os
+import json
+import zlib
+from datetime import datetime, timezone
+from sqlalchemy import select
+from models import db, Meeting, MeetingTranscript, MeetingSegment
+
+EXPORT_KINDS = ("meetings", "transcripts", "segments")
+# rows fetched per round trip; memory stays bounded by this, not by table size
+YIELD_PER = int(os.environ.get("EXPORT_YIELD_PER", 1000))
+# lines are sent in blocks of about this size instead of one write per row
+CHUNK_BYTES = 64 * 1024
+
+
+def parse_iso_datetime(value: str):
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # timestamps are stored as naive UTC
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _meeting_filters(project_id=None, since=None, until=None):
+    filters = []
+    if project_id is not None:
+        filters.append(Meeting.project_id == project_id)
+    if since is not None:
+        filters.append(Meeting.created_at >= since)
+    if until is not None:
+        filters.append(Meeting.created_at < until)
+    return filters
+
+
+def _for_meetings(stmt, meeting_id_column, filters):
+    """
+    Restrict a child-row select to the filtered meetings. Unfiltered, no join:
+    an inner join would drop rows without a meeting (transcripts allow NULL).
+    """
+    if not filters:
+        return stmt
+    return stmt.join(Meeting, Meeting.id == meeting_id_column).where(*filters)
+
+
+def _stream(stmt):
+    """Execute a column select with a server-side cursor and yield row mappings."""
+    result = db.session.execute(stmt.execution_options(yield_per=YIELD_PER))
+    for row in result.mappings():
+        yield row
+
+
+def iter_export_records(kinds=EXPORT_KINDS, project_id=None, since=None, until=None):
+    """
+    Yield one dict per exported row, tagged with "type". Selects plain columns
+    (not ORM entities) so nothing accumulates in the session identity map.
+    Filters apply to the parent meeting: project_id and created_at in [since, until).
+    """
+    filters = _meeting_filters(project_id, since, until)
+
+    if "meetings" in kinds:
+        stmt = select(
+            Meeting.id, Meeting.project_id, Meeting.title, Meeting.platform,
+            Meeting.meeting_link, Meeting.started_at, Meeting.ended_at,
+            Meeting.created_by, Meeting.created_at
+        ).where(*filters).order_by(Meeting.id)
+        for row in _stream(stmt):
+            yield {"type": "meeting", **row}
+
+    if "transcripts" in kinds:
+        stmt = select(
+            MeetingTranscript.id, MeetingTranscript.meeting_id,
+            MeetingTranscript.full_text, MeetingTranscript.created_at
+        )
+        stmt = _for_meetings(stmt, MeetingTranscript.meeting_id, filters).order_by(MeetingTranscript.id)
+        for row in _stream(stmt):
+            yield {"type": "transcript", **row}
+
+    if "segments" in kinds:
+        stmt = select(
+            MeetingSegment.id, MeetingSegment.meeting_id, MeetingSegment.t_start_ms,
+            MeetingSegment.t_end_ms, MeetingSegment.speaker_label,
+            MeetingSegment.speaker_user_id, MeetingSegment.text, MeetingSegment.confidence
+        )
+        stmt = _for_meetings(stmt, MeetingSegment.meeting_id, filters).order_by(
+            MeetingSegment.meeting_id, MeetingSegment.t_start_ms, MeetingSegment.id
+        )
+        for row in _stream(stmt):
+            yield {"type": "segment", **row}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunks(records):
+    """Serialize records as NDJSON, yielding ~CHUNK_BYTES blocks of whole lines."""
+    buf = []
+    size = 0
+    for record in records:
+        line = (json.dumps(record, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+        buf.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+def gzip_chunks(chunks):
+    """Incrementally gzip a byte stream without buffering the whole payload."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        # sync-flush per block so the client can decode everything received so far
+        out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_ndjson(kinds=EXPORT_KINDS, project_id=None, since=None, until=None, gzip=False):
+    """Bytes generator of the NDJSON export, optionally gzip-compressed."""
+    stream = ndjson_chunks(iter_export_records(kinds, project_id, since, until))
+    return gzip_chunks(stream) if gzip else stream
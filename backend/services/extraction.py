@@ -0,0 +1,270 @@
+# backend/services/extraction.py
+"""
+Action-item / decision extraction at ingest time.
+
+ingest_transcript() queues each meeting here; a background worker collects
+queued meetings for a short window and extracts several per LLM call, then
+stores one MeetingArtifact (type "extraction") per meeting with the Task and
+Decision rows it produced. Structured questions ("action items from meeting
+12?") are then answered from SQL by services/structured_answers.py.
+"""
+import os
+import re
+import json
+import time
+import queue
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from services.llm_client import generate
+
+EXTRACT_AT_INGEST = os.environ.get("RAG_EXTRACT_AT_INGEST", "1").lower() in ("1", "true", "yes")
+# meetings per LLM call, and the transcript characters one call may carry
+EXTRACT_BATCH_MEETINGS = int(os.environ.get("RAG_EXTRACT_BATCH_MEETINGS", 4))
+EXTRACT_BATCH_CHARS = int(os.environ.get("RAG_EXTRACT_BATCH_CHARS", 24000))
+# how long the worker waits for more meetings before extracting a partial batch
+EXTRACT_BATCH_WINDOW_S = float(os.environ.get("RAG_EXTRACT_BATCH_WINDOW_S", 2.0))
+# longer transcripts are cut (head and tail kept) to fit one call
+EXTRACT_MAX_TRANSCRIPT_CHARS = int(os.environ.get("RAG_EXTRACT_MAX_TRANSCRIPT_CHARS", 16000))
+EXTRACTION_ARTIFACT = "extraction"
+_MAX_ITEMS = 25
+
+EXTRACTION_SYSTEM_PROMPT = (
+    "You extract structured records from meeting transcripts. "
+    "Reply with JSON only, no commentary. Never invent items that are not in the transcript."
+)
+
+
+def _clip(text: str) -> str:
+    text = (text or "").strip()
+    if len(text) <= EXTRACT_MAX_TRANSCRIPT_CHARS:
+        return text
+    half = EXTRACT_MAX_TRANSCRIPT_CHARS // 2
+    return text[:half] + "\n[...]\n" + text[-half:]
+
+
+def build_extraction_prompt(meetings: list) -> str:
+    """meetings: [(meeting_id, transcript)] -> one prompt covering all of them."""
+    blocks = "\n\n".join(f"=== MEETING {meeting_id} ===\n{_clip(text)}" for meeting_id, text in meetings)
+    return f"""
+For each meeting transcript below, extract its action items and decisions.
+
+{blocks}
+
+Reply with exactly this JSON shape, one entry per meeting:
+{{"meetings": [{{"meeting_id": <id>,
+  "summary": "<one sentence>",
+  "action_items": [{{"title": "<what>", "owner": "<name or email or null>", "due": "<YYYY-MM-DD or null>", "priority": "<high|medium|low or null>"}}],
+  "decisions": [{{"statement": "<what was decided>", "decided_by": "<name or null>"}}]}}]}}
+Use empty lists when a meeting has none.
+"""
+
+
+def parse_extraction(text: str, meeting_ids: list):
+    """LLM reply -> {meeting_id: extracted}, None if it is not the expected JSON."""
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    results = {}
+    for entry in data.get("meetings", []) if isinstance(data, dict) else []:
+        try:
+            meeting_id = int(entry.get("meeting_id"))
+        except (TypeError, ValueError):
+            continue
+        if meeting_id not in meeting_ids:
+            continue
+        results[meeting_id] = {
+            "summary": str(entry.get("summary") or "").strip(),
+            "action_items": [i for i in entry.get("action_items") or [] if isinstance(i, dict) and i.get("title")][:_MAX_ITEMS],
+            "decisions": [d for d in entry.get("decisions") or [] if isinstance(d, dict) and d.get("statement")][:_MAX_ITEMS],
+            "method": "llm",
+        }
+    return results or None
+
+
+_SPEAKER_LINE = re.compile(r"^\s*([A-Z][\w .'-]{0,40}?)(?:\s*\([^)]*\))?\s*:\s*(.+)$")
+_ACTION = re.compile(r"\b(action items?|to-?do|follow[- ]up|i'll|i will|we'll|we will|will (?:send|prepare|review|update|set up|create|schedule|draft|share|fix)|needs? to|assigned)\b", re.IGNORECASE)
+_DECISION = re.compile(r"\b(decided|decision|agreed|we'll go with|going with|approved|settled on)\b", re.IGNORECASE)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+# "Emily needs to ..." names its owner, whoever is speaking
+_NAMED_OWNER = re.compile(r"^([A-Z][a-z]+) (?:will|needs? to|should|is going to)\b")
+
+
+def heuristic_extraction(text: str) -> dict:
+    """Keyword fallback when the LLM is unavailable or its reply is unusable."""
+    action_items, decisions, seen = [], [], set()
+    for line in (text or "").splitlines():
+        speaker_match = _SPEAKER_LINE.match(line)
+        speaker, body = (speaker_match.group(1).strip(), speaker_match.group(2)) if speaker_match else (None, line)
+        for sentence in _SENTENCE.split(body.strip()):
+            sentence = sentence.strip()
+            if len(sentence) < 12 or sentence.lower() in seen:
+                continue
+            if _DECISION.search(sentence) and len(decisions) < _MAX_ITEMS:
+                decisions.append({"statement": sentence, "decided_by": speaker})
+                seen.add(sentence.lower())
+            elif _ACTION.search(sentence) and len(action_items) < _MAX_ITEMS:
+                named = _NAMED_OWNER.match(sentence)
+                owner = named.group(1) if named else speaker
+                action_items.append({"title": sentence, "owner": owner, "due": None, "priority": None})
+                seen.add(sentence.lower())
+    return {"summary": "", "action_items": action_items, "decisions": decisions, "method": "heuristic"}
+
+
+def _batches(meetings: list):
+    batch, size = [], 0
+    for meeting_id, text in meetings:
+        length = min(len(text or ""), EXTRACT_MAX_TRANSCRIPT_CHARS)
+        if batch and (len(batch) >= EXTRACT_BATCH_MEETINGS or size + length > EXTRACT_BATCH_CHARS):
+            yield batch
+            batch, size = [], 0
+        batch.append((meeting_id, text))
+        size += length
+    if batch:
+        yield batch
+
+
+def extract_meetings(meetings: list) -> dict:
+    """
+    [(meeting_id, transcript)] -> {meeting_id: extracted}, several meetings
+    per LLM call; meetings the reply misses fall back to keyword extraction.
+    """
+    results = {}
+    for batch in _batches(meetings):
+        ids = [int(meeting_id) for meeting_id, _ in batch]
+        reply = generate(build_extraction_prompt(batch), system_prompt=EXTRACTION_SYSTEM_PROMPT,
+                         max_tokens=400 + 500 * len(batch), temperature=0.1)
+        parsed = parse_extraction(reply, ids) or {}
+        print(f"🧾 Extracted {len(parsed)}/{len(batch)} meetings in one LLM call")
+        for meeting_id, text in batch:
+            results[int(meeting_id)] = parsed.get(int(meeting_id)) or heuristic_extraction(text)
+    return results
+
+
+def _parse_date(value):
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def store_extraction(meeting_id: int, extracted: dict) -> dict:
+    """Replace the meeting's extraction artifact and its Task/Decision rows (needs an app context)."""
+    from models import db, Meeting, MeetingArtifact, Task, Decision
+
+    meeting = db.session.get(Meeting, meeting_id)
+    project_id = meeting.project_id if meeting is not None else None
+
+    old_ids = [a.id for a in MeetingArtifact.query.filter_by(meeting_id=meeting_id, type=EXTRACTION_ARTIFACT)]
+    if old_ids:
+        Task.query.filter(Task.source_artifact.in_(old_ids)).delete(synchronize_session=False)
+        Decision.query.filter(Decision.source_artifact.in_(old_ids)).delete(synchronize_session=False)
+        MeetingArtifact.query.filter(MeetingArtifact.id.in_(old_ids)).delete(synchronize_session=False)
+
+    artifact = MeetingArtifact(
+        meeting_id=meeting_id, type=EXTRACTION_ARTIFACT, title="Action items and decisions",
+        content=json.dumps(extracted, ensure_ascii=False),
+        model_information=json.dumps({"method": extracted.get("method")}),
+    )
+    db.session.add(artifact)
+    db.session.flush()
+
+    for item in extracted.get("action_items", []):
+        owner = (item.get("owner") or "").strip() or None
+        db.session.add(Task(
+            meeting_id=meeting_id, project_id=project_id, title=str(item["title"])[:500],
+            description=f"Owner: {owner}" if owner else None, status="open",
+            priority=item.get("priority"), assignee_email=owner if owner and "@" in owner else None,
+            due_at=_parse_date(item.get("due")), source_artifact=artifact.id,
+        ))
+    for decision in extracted.get("decisions", []):
+        decided_by = (decision.get("decided_by") or "").strip()
+        statement = str(decision["statement"])
+        db.session.add(Decision(
+            meeting_id=meeting_id, project_id=project_id,
+            statement=f"{statement} ({decided_by})" if decided_by and decided_by not in statement else statement,
+            source_artifact=artifact.id,
+        ))
+    db.session.commit()
+    return {"tasks": len(extracted.get("action_items", [])), "decisions": len(extracted.get("decisions", []))}
+
+
+_app = None
+
+
+def app_context():
+    """The current Flask app context, or one on a shared app for worker threads."""
+    global _app
+    from flask import has_app_context
+    if has_app_context():
+        return nullcontext()
+    if _app is None:
+        from app import create_app
+        _app = create_app()
+    return _app.app_context()
+
+
+class ExtractionQueue:
+    """
+    Background extraction: enqueue() returns at once; a worker thread waits
+    up to EXTRACT_BATCH_WINDOW_S for more meetings so a burst of ingests
+    shares LLM calls, then extracts and stores the batch.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "extracted": 0, "llm_calls": 0, "errors": 0}
+
+    def enqueue(self, meeting_id: int, text: str):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="rag-extract", daemon=True)
+                self._thread.start()
+            self.stats["queued"] += 1
+        self._queue.put((int(meeting_id), text))
+
+    def _worker(self):
+        while True:
+            pending = {}
+            meeting_id, text = self._queue.get()
+            pending[meeting_id] = text
+            window_ends = time.monotonic() + EXTRACT_BATCH_WINDOW_S
+            while len(pending) < EXTRACT_BATCH_MEETINGS:
+                remaining = window_ends - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    meeting_id, text = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending[meeting_id] = text   # a re-ingested meeting keeps its latest transcript
+            self._process(list(pending.items()))
+
+    def _process(self, meetings: list):
+        try:
+            results = extract_meetings(meetings)
+            with app_context():
+                for meeting_id, extracted in results.items():
+                    store_extraction(meeting_id, extracted)
+            with self._lock:
+                self.stats["extracted"] += len(results)
+                self.stats["llm_calls"] += len(list(_batches(meetings)))
+        except Exception as e:
+            print(f"❌ Extraction failed for meetings {[m for m, _ in meetings]}: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, "backlog": self._queue.qsize()}
+
+
+EXTRACTION_QUEUE = ExtractionQueue()
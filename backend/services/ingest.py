@@ -3,7 +3,9 @@ import math
 import re
 from datetime import datetime
 from services.embeddings import Embeddings
-from services.vector_store import FaissVectorStore
+from services.vector_store import get_vector_store
+from services.semantic_cache import get_semantic_cache
+from services.extraction import EXTRACTION_QUEUE, EXTRACT_AT_INGEST
 import numpy as np
 import os
 
@@ -36,8 +38,8 @@ def chunk_text(text: str, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
 
 # initialize singletons
 EMBEDDER = Embeddings()
-# initialize vector store lazily with known dim from embedder
-VECTOR_STORE = FaissVectorStore(dim=EMBEDDER.model.get_sentence_embedding_dimension())
+# shared, project-sharded vector store, with the dim from the embedder
+VECTOR_STORE = get_vector_store(dim=EMBEDDER.model.get_sentence_embedding_dimension())
 
 def ingest_transcript(meeting_id: int, raw_text: str, source_platform: str = None, transcript_format: str = None):
     """
@@ -45,7 +47,7 @@ def ingest_transcript(meeting_id: int, raw_text: str, source_platform: str = Non
     - Chunk raw_text, embed chunks, upsert to FAISS with metadata
     """
     from app import create_app
-    from models import db, RawMeetingTranscript, MeetingTranscript
+    from models import db, Meeting, RawMeetingTranscript, MeetingTranscript
     
     app = create_app()
     
@@ -73,6 +75,10 @@ def ingest_transcript(meeting_id: int, raw_text: str, source_platform: str = Non
         db.session.add(mt)
         db.session.commit()
 
+        # the meeting's project picks the vector store shard
+        meeting = db.session.get(Meeting, meeting_id)
+        project_id = meeting.project_id if meeting is not None else None
+
         # chunk
         chunks = chunk_text(raw_text)
         vectors = EMBEDDER.embed_texts(chunks)  # (n, d)
@@ -80,12 +86,25 @@ def ingest_transcript(meeting_id: int, raw_text: str, source_platform: str = Non
         for i, c in enumerate(chunks):
             meta = {
                 "meeting_id": int(meeting_id),
+                "project_id": project_id,
                 "chunk_index": i,
                 "text_snippet": c[:400],  # store first 400 chars for reference
+                "text": c,                # full chunk, for prompt context packing
                 "created_at": now.isoformat(),
             }
             metadatas.append(meta)
         # add to vector store
         VECTOR_STORE.add(vectors, metadatas)
+        # cached answers these chunks could change are no longer valid
+        semantic_cache = get_semantic_cache(VECTOR_STORE.dim)
+        if semantic_cache is not None:
+            dropped = semantic_cache.invalidate_for_chunks(meeting_id, vectors)
+            if dropped:
+                print(f"💾 Invalidated {dropped} semantic cache entries for meeting {meeting_id}")
+
+        # action items / decisions -> Task/Decision rows, in the background (batched across meetings)
+        if EXTRACT_AT_INGEST:
+            EXTRACTION_QUEUE.enqueue(meeting_id, raw_text)
 
-        return {"ingested_chunks": len(chunks), "vector_total": VECTOR_STORE.get_total_count()}
\ No newline at end of file
+        return {"ingested_chunks": len(chunks), "vector_total": VECTOR_STORE.get_total_count(),
+                "extraction": "queued" if EXTRACT_AT_INGEST else "disabled"}
\ No newline at end of file
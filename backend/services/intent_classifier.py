@@ -0,0 +1,183 @@
+# backend/services/intent_classifier.py
+import os
+import re
+import threading
+import numpy as np
+
+INTENTS = ('technical_guidance', 'decision_support', 'meeting_specific', 'general_knowledge', 'hypothetical_scenario')
+
+# trigger phrases per intent, matched as whole words/phrases
+INTENT_TRIGGERS = {
+    'technical_guidance': [
+        'how to', 'build', 'create', 'setup', 'set up', 'configure', 'implement',
+        'code', 'api', 'database', 'framework', 'architecture',
+        'workflow', 'deploy', 'debug', 'fix', 'tech stack',
+        'flask', 'react', 'python', 'javascript', 'sql', 'docker',
+    ],
+    'decision_support': [
+        'should i', 'should we', 'what should', 'recommend', 'advice on',
+        'decision', 'choose between', 'better option',
+        'pros and cons', 'risks', 'opportunities',
+        'strategy', 'planning', 'approach',
+    ],
+    'hypothetical_scenario': [
+        'what if', 'suppose', 'scenario', 'hypothetical',
+        'if we', 'assuming', 'consider if',
+    ],
+    'meeting_specific': [
+        'meeting', 'meetings', 'discussed', 'said', 'talked about',
+        'action item', 'action items', 'decision', 'decided', 'follow up',
+    ],
+}
+
+# example queries per intent; their mean embeddings are the fallback centroids
+INTENT_EXAMPLES = {
+    'technical_guidance': [
+        "How do I add authentication to the backend service?",
+        "Steps to containerize the application and run it in production",
+        "Why does the frontend fail to load data from the server?",
+        "Write a migration that adds an index to the users table",
+    ],
+    'decision_support': [
+        "Which vendor offers the better long-term value for us?",
+        "Is it worth moving the release to next quarter?",
+        "Help me weigh hiring a contractor against training the team",
+        "Would switching cloud providers save us money?",
+    ],
+    'meeting_specific': [
+        "What did Sarah promise to deliver by Friday?",
+        "Who is responsible for the onboarding tasks from yesterday's call?",
+        "Summarize the sync with the design team",
+        "What was agreed about the launch date in the standup?",
+    ],
+    'hypothetical_scenario': [
+        "Imagine the main customer cancels their contract next month",
+        "How would a two-week delay in testing affect the launch?",
+        "If the budget were cut in half, what happens to the roadmap?",
+        "Picture our lead engineer leaving mid-project",
+    ],
+    'general_knowledge': [
+        "What is the capital of Australia?",
+        "Explain the difference between revenue and profit",
+        "Who wrote the book on agile estimation?",
+        "What does a product manager do?",
+    ],
+}
+
+INTENT_CENTROIDS = os.environ.get("RAG_INTENT_CENTROIDS", "1").lower() in ("1", "true", "yes")
+# cosine similarity a centroid needs before it overrides the general_knowledge default
+CENTROID_MIN_SIMILARITY = float(os.environ.get("RAG_INTENT_CENTROID_MIN_SIM", 0.35))
+
+
+def _trie_pattern(phrases) -> str:
+    """
+    Prefix-factored alternation ("a(?:pi|pproach)"...): the regex engine walks
+    the phrases like a trie instead of retrying every alternative per position.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        # a phrase ends here: the longer continuation is optional (and tried first)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_triggers(triggers: dict):
+    """One regex over every trigger phrase, plus phrase -> intents."""
+    phrase_intents = {}
+    for intent, phrases in triggers.items():
+        for phrase in phrases:
+            phrase_intents.setdefault(phrase, []).append(intent)
+    # tried only at word starts; the lookahead lets matches overlap ("what if we" -> "what if", "if we")
+    # phrases are lower case and queries are lowered before matching, so no IGNORECASE (slower)
+    return re.compile(rf"\b(?=\w)(?=({_trie_pattern(phrase_intents)})\b)"), phrase_intents
+
+
+_TRIGGER_RE, _PHRASE_INTENTS = _compile_triggers(INTENT_TRIGGERS)
+
+
+def keyword_weights(query: str) -> dict:
+    """Number of distinct trigger phrases per intent, from one regex pass."""
+    weights = dict.fromkeys(INTENTS, 0)
+    # findall returns the phrases themselves: no match objects to build per hit
+    for phrase in set(_TRIGGER_RE.findall(query.lower())):
+        for intent in _PHRASE_INTENTS[phrase]:
+            weights[intent] += 1
+    return weights
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    rows = np.asarray(rows, dtype="float32")
+    return rows / np.maximum(np.linalg.norm(rows, axis=-1, keepdims=True), 1e-12)
+
+
+class CentroidClassifier:
+    """Nearest intent centroid (cosine) of labelled example query embeddings."""
+
+    def __init__(self, embed_texts, examples: dict = None):
+        examples = examples or INTENT_EXAMPLES
+        self.intents = list(examples)
+        self.centroids = _unit(np.stack([embed_texts(examples[i]).mean(axis=0) for i in self.intents]))
+
+    def classify(self, query_embedding: np.ndarray):
+        """(intent, similarity) of the nearest centroid."""
+        sims = self.centroids @ _unit(query_embedding).reshape(-1)
+        best = int(np.argmax(sims))
+        return self.intents[best], float(sims[best])
+
+
+_centroids = None
+_centroids_lock = threading.Lock()
+
+
+def get_centroid_classifier(embed_texts):
+    """Shared classifier; the example embeddings are computed once, on first use."""
+    global _centroids
+    if _centroids is None:
+        with _centroids_lock:
+            if _centroids is None:
+                _centroids = CentroidClassifier(embed_texts)
+    return _centroids
+
+
+def classify_intent(query: str, query_embedding: np.ndarray = None, embed_texts=None) -> dict:
+    """
+    Trigger phrases decide when any match; otherwise, given the retrieval
+    query embedding, the nearest example centroid does (RAG_INTENT_CENTROIDS),
+    else general_knowledge.
+    """
+    intent_weights = keyword_weights(query)
+    method = 'keywords'
+
+    if sum(intent_weights.values()) == 0:
+        intent_weights['general_knowledge'] = 1
+        method = 'default'
+        if INTENT_CENTROIDS and query_embedding is not None and embed_texts is not None:
+            intent, similarity = get_centroid_classifier(embed_texts).classify(query_embedding)
+            if similarity >= CENTROID_MIN_SIMILARITY:
+                return {
+                    'primary_intent': intent,
+                    'confidence': round(similarity, 3),
+                    'all_weights': {**dict.fromkeys(INTENTS, 0), intent: 1},
+                    'method': 'centroid',
+                }
+
+    primary_intent = max(intent_weights, key=intent_weights.get)
+    confidence = intent_weights[primary_intent] / max(1, sum(intent_weights.values()))
+
+    return {
+        'primary_intent': primary_intent,
+        'confidence': confidence,
+        'all_weights': intent_weights,
+        'method': method,
+    }
@@ -0,0 +1,156 @@
+# backend/services/llm_cache.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 1024))           # in-memory LRU
+LLM_CACHE_TTL_S = float(os.environ.get("LLM_CACHE_TTL_S", 24 * 3600))
+# sampling above this is meant to vary between calls, so it is never cached
+LLM_CACHE_MAX_TEMPERATURE = float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", 0.5))
+# optional second tier shared across processes/restarts; empty = memory only
+LLM_CACHE_DB_PATH = os.environ.get("LLM_CACHE_DB_PATH", "")
+LLM_CACHE_DB_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_DB_MAX_ENTRIES", 20000))
+
+
+def cache_key(provider: str, model: str, system_prompt: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """Stable hash of everything that determines a (near-)deterministic completion."""
+    raw = json.dumps([provider, model, system_prompt, prompt, int(max_tokens), round(float(temperature), 3)],
+                     ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier completion cache: an in-memory LRU in front of an optional
+    SQLite table. Entries expire after ttl seconds in both tiers; the SQLite
+    tier is trimmed to max_db_entries by least recent use.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: float = None, db_path: str = None,
+                 max_db_entries: int = None, max_temperature: float = None):
+        self.max_entries = max_entries or LLM_CACHE_MAX_ENTRIES
+        self.ttl = LLM_CACHE_TTL_S if ttl is None else ttl
+        self.max_db_entries = max_db_entries or LLM_CACHE_DB_MAX_ENTRIES
+        self.max_temperature = LLM_CACHE_MAX_TEMPERATURE if max_temperature is None else max_temperature
+        self._memory = OrderedDict()   # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+        db_path = LLM_CACHE_DB_PATH if db_path is None else db_path
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used)")
+        self._db.commit()
+
+    def cacheable(self, temperature: float) -> bool:
+        return temperature <= self.max_temperature
+
+    def bypass(self):
+        with self._lock:
+            self.stats["bypassed"] += 1
+
+    def get(self, key: str):
+        return self.get_any([key])
+
+    def get_any(self, keys):
+        """
+        First live entry among keys, else None. Counted as a single hit or
+        miss however many keys are tried, so hit_rate stays per lookup.
+        """
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                text, from_disk = self._lookup(key, now)
+                if text is not None:
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += from_disk
+                    return text
+            self.stats["misses"] += 1
+            return None
+
+    def _lookup(self, key, now):
+        """(text, from_disk) for key, (None, False) if absent or expired. Caller holds the lock."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                return entry[1], False
+            del self._memory[key]
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                self._db.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self._remember(key, row[1], row[0])
+                return row[0], True
+            if row is not None:
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+        return None, False
+
+    def put(self, key: str, text: str):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, text)
+            self.stats["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, text, expires_at, now),
+                )
+                self._writes += 1
+                # trimming is a scan, so only every 100 writes
+                if self._writes % 100 == 0:
+                    self._trim_db(now)
+                self._db.commit()
+
+    def _remember(self, key, expires_at, text):
+        self._memory[key] = (expires_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _trim_db(self, now):
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_db_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                "memory_entries": len(self._memory),
+                "disk": self._db is not None,
+            }
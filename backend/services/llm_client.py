@@ -1,119 +1,426 @@
 import os
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 import requests
-import json
+from requests.adapters import HTTPAdapter
 from typing import Dict
+from services.provider_health import ProviderHealth
+from services.llm_cache import LLMResponseCache, cache_key, LLM_CACHE_ENABLED, LLM_CACHE_MAX_TEMPERATURE
+from services.single_flight import get_flight, flight_key
 
 
 load_dotenv()
 
-class LLMClient:
-    def __init__(self):
-        self.providers = ["gemini", "openai", "ollama", "groq", "dummy"]
-        self.current_provider = os.environ.get("LLM_PROVIDER", "gemini")
-        
-    def call_gemini(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
-        """Try Gemini API with fallback"""
-        api_key = os.environ.get("GEMINI_API_KEY")
-        endpoint = os.environ.get(
-            "GEMINI_ENDPOINT",
-            "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
-        )
-        
-        if not api_key:
-            return {"error": "GEMINI_API_KEY not configured", "text": ""}
-            
-        url = f"{endpoint}?key={api_key}"
-        headers = {"Content-Type": "application/json"}
-        
-        contents = [{"parts": [{"text": system_prompt + "\n\n" + prompt}]}]
-        payload = {
+# HTTP connection pooling (per provider)
+LLM_POOL_SIZE = int(os.environ.get("LLM_POOL_SIZE", 10))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 2))
+LLM_RETRY_BACKOFF = float(os.environ.get("LLM_RETRY_BACKOFF", 0.5))
+# a provider asking to be retried later than this is given up on (next provider instead)
+LLM_RETRY_MAX_DELAY_S = float(os.environ.get("LLM_RETRY_MAX_DELAY_S", 10))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Hedged requests: if the first provider has not answered after its recent
+# p<LLM_HEDGE_PERCENTILE> latency, race the next provider against it.
+LLM_HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", 95))
+LLM_HEDGE_DELAY_MS = int(os.environ.get("LLM_HEDGE_DELAY_MS", 3000))  # until enough samples exist
+LLM_HEDGE_MAX = int(os.environ.get("LLM_HEDGE_MAX", 1))               # extra requests per call
+LLM_HEDGE_WORKERS = int(os.environ.get("LLM_HEDGE_WORKERS", 16))
+
+
+# Model tiers: tier="fast" | "standard" | "deep" in generate() kwargs picks the
+# model <PROVIDER>_MODEL_<TIER> (e.g. GROQ_MODEL_FAST, OPENAI_MODEL_DEEP,
+# GEMINI_MODEL_FAST); unset tiers, and "standard", use the provider's usual model.
+MODEL_TIERS = ("fast", "standard", "deep")
+
+
+def tier_model(provider: str, standard_model: str, tier: str = None) -> str:
+    if not tier or tier == "standard":
+        return standard_model
+    return os.environ.get(f"{provider.upper()}_MODEL_{tier.upper()}") or standard_model
+
+
+# Provider request builders / response parsers, shared by LLMClient and
+# AsyncLLMClient so both speak exactly the same wire format. Builders return
+# {"url", "headers", "payload", "timeout"} or an {"error", "text"} result when
+# the provider is not configured; parsers turn the JSON body into a result.
+
+def retry_delay(attempt: int, retry_after: str = None, deadline=None):
+    """
+    Seconds to wait before retrying after failed attempt number `attempt`
+    (0-based): the provider's Retry-After if it sent one, else exponential
+    backoff. None means give up instead: the wait is over LLM_RETRY_MAX_DELAY_S
+    or would use up what is left of the deadline.
+    """
+    if retry_after and retry_after.strip().isdigit():
+        delay = float(retry_after)
+    else:
+        delay = LLM_RETRY_BACKOFF * (2 ** attempt)
+    if delay > LLM_RETRY_MAX_DELAY_S:
+        return None
+    if deadline is not None and deadline.remaining() <= delay:
+        return None
+    return delay
+
+
+def _chat_messages(prompt: str, system_prompt: str) -> list:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def build_gemini_request(prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+    api_key = os.environ.get("GEMINI_API_KEY")
+    endpoint = os.environ.get(
+        "GEMINI_ENDPOINT",
+        "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+    )
+    if not api_key:
+        return {"error": "GEMINI_API_KEY not configured", "text": ""}
+    # the model is part of the endpoint path
+    model = tier_model("gemini", None, kwargs.get("tier"))
+    if model:
+        endpoint = re.sub(r"/models/[^/:]+:", f"/models/{model}:", endpoint)
+
+    contents = [{"parts": [{"text": system_prompt + "\n\n" + prompt}]}]
+    return {
+        "url": f"{endpoint}?key={api_key}",
+        "headers": {"Content-Type": "application/json"},
+        "payload": {
             "contents": contents,
             "generationConfig": {
                 "maxOutputTokens": kwargs.get("max_tokens", 512),
                 "temperature": kwargs.get("temperature", 0.2)
             }
+        },
+        "timeout": 30,
+    }
+
+
+def parse_gemini_response(data: dict) -> Dict:
+    if "candidates" in data and data["candidates"]:
+        candidate = data["candidates"][0]
+        if "content" in candidate and "parts" in candidate["content"]:
+            text = candidate["content"]["parts"][0].get("text", "")
+            return {"text": text, "provider": "gemini"}
+    return {"error": "Unexpected response format", "text": ""}
+
+
+def build_openai_request(prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+    api_key = os.environ.get("OPENAI_API_KEY")
+    base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    if not api_key:
+        return {"error": "OPENAI_API_KEY not configured", "text": ""}
+
+    # OpenRouter configuration
+    if "openrouter" in base_url:
+        url = "https://openrouter.ai/api/v1/chat/completions"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": os.environ.get("SITE_URL", "https://localhost:5000"),
+            "X-Title": os.environ.get("APP_NAME", "AutoMeet")
         }
+        # Use the model from environment or fallback to a working free model
+        model = os.environ.get("OPENAI_MODEL", "meta-llama/llama-3.1-8b-instruct:free")
+        model = tier_model("openai", model, kwargs.get("tier"))
+    else:
+        # Standard OpenAI
+        url = f"{base_url}/chat/completions"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+        model = os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo")
+        model = tier_model("openai", model, kwargs.get("tier"))
+
+    return {
+        "url": url,
+        "headers": headers,
+        "payload": {
+            "model": model,
+            "messages": _chat_messages(prompt, system_prompt),
+            "max_tokens": kwargs.get("max_tokens", 512),
+            "temperature": kwargs.get("temperature", 0.2)
+        },
+        "timeout": 45,
+    }
+
+
+def openai_status_error(status_code: int, body: str, model: str):
+    """Readable error result for a non-200 OpenAI/OpenRouter reply, None if OK."""
+    if status_code == 404:
+        # Model not found - suggest working models
+        suggested_models = [
+            "meta-llama/llama-3.1-8b-instruct:free",
+            "anthropic/claude-3.5-sonnet:free",
+            "microsoft/wizardlm-2-8x22b:free"
+        ]
+        return {"error": f"Model '{model}' not found. Try: {', '.join(suggested_models)}", "text": ""}
+    if status_code == 401:
+        return {"error": "Invalid API key", "text": ""}
+    if status_code != 200:
+        return {"error": f"HTTP {status_code}: {body[:100]}", "text": ""}
+    return None
+
+
+def parse_chat_response(data: dict, provider: str) -> Dict:
+    """OpenAI-style chat completion body (OpenAI, OpenRouter, Groq)."""
+    return {"text": data["choices"][0]["message"]["content"], "provider": provider}
+
+
+def build_ollama_request(prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+    base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+    return {
+        "url": f"{base_url}/api/generate",
+        "headers": {},
+        "payload": {
+            "model": tier_model("ollama", os.environ.get("OLLAMA_MODEL", "llama2"), kwargs.get("tier")),
+            "prompt": system_prompt + "\n\n" + prompt,
+            "stream": False,
+            "options": {
+                "temperature": kwargs.get("temperature", 0.2),
+                "num_predict": kwargs.get("max_tokens", 512)
+            }
+        },
+        "timeout": 60,
+    }
+
+
+def parse_ollama_response(data: dict) -> Dict:
+    return {"text": data.get("response", ""), "provider": "ollama"}
+
+
+def build_groq_request(prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+    api_key = os.environ.get("GROQ_API_KEY")
+    base_url = os.environ.get("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+    if not api_key:
+        return {"error": "GROQ_API_KEY not configured", "text": ""}
+    return {
+        "url": f"{base_url}/chat/completions",
+        "headers": {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        },
+        "payload": {
+            "model": tier_model("groq", os.environ.get("GROQ_MODEL", "llama3-8b-8192"), kwargs.get("tier")),  # Groq default model
+            "messages": _chat_messages(prompt, system_prompt),
+            "max_tokens": kwargs.get("max_tokens", 512),
+            "temperature": kwargs.get("temperature", 0.2)
+        },
+        "timeout": 30,
+    }
+
+
+# Streaming: providers that can stream tokens natively get "stream": true and
+# their line format parsed incrementally; others answer in one piece and are
+# re-chunked (STREAM_FALLBACK_CHARS per chunk) so callers see one interface.
+STREAMING_PROVIDERS = ("openai", "groq", "ollama")
+STREAM_FALLBACK_CHARS = int(os.environ.get("LLM_STREAM_FALLBACK_CHARS", 24))
+
+
+def streaming_request(req: dict) -> dict:
+    """Copy of a built request with streaming switched on."""
+    return {**req, "payload": {**req["payload"], "stream": True}}
+
+
+def parse_chat_stream_line(line: str):
+    """
+    One SSE line of an OpenAI-style stream -> (text delta, finished).
+    Lines other than "data: ..." (comments, keep-alives) yield ("", False).
+    """
+    if not line.startswith("data:"):
+        return "", False
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return "", True
+    choice = json.loads(data)["choices"][0]
+    return choice.get("delta", {}).get("content") or "", choice.get("finish_reason") is not None
+
+
+def parse_ollama_stream_line(line: str):
+    """One NDJSON line of an Ollama stream -> (text delta, finished)."""
+    if not line.strip():
+        return "", False
+    data = json.loads(line)
+    return data.get("response", ""), bool(data.get("done"))
+
+
+def chunk_text(text: str, size: int = None):
+    """Split a finished answer into word-aligned chunks for pseudo-streaming."""
+    size = size or STREAM_FALLBACK_CHARS
+    chunk = ""
+    for word in re.split(r"(?<=\s)", text):
+        chunk += word
+        if len(chunk) >= size:
+            yield chunk
+            chunk = ""
+    if chunk:
+        yield chunk
+
+
+def dummy_response(prompt: str) -> Dict:
+    return {
+        "text": f"[LLM Simulation] Response to: {prompt[:100]}...\n\nI understand you need assistance. This is a simulated response since the LLM service is currently unavailable. In a production environment, this would be a real AI response.",
+        "provider": "dummy"
+    }
+
+
+FALLBACK_ANSWER = "Sorry, I couldn't generate a response at this time."
+# text generate() returns when no provider answered: the fallback or a simulated response
+_UNAVAILABLE_PREFIXES = ("[LLM Simulation]", "Sorry, I couldn't generate")
+
+
+def is_fallback_answer(text: str) -> bool:
+    """True for generate()'s no-provider fallback or simulated text, which must never be cached or stored."""
+    return bool(text) and text.lstrip().startswith(_UNAVAILABLE_PREFIXES)
+
+
+def is_shareable_answer(text: str) -> bool:
+    """Whether coalesced generate() callers may take a leader's answer instead of retrying."""
+    return not is_fallback_answer(text)
+
+
+REQUEST_BUILDERS = {
+    "gemini": build_gemini_request,
+    "openai": build_openai_request,
+    "ollama": build_ollama_request,
+    "groq": build_groq_request,
+}
+
+
+def provider_model(name: str, tier: str = None):
+    """Model a provider is configured to use for `tier` (Gemini: its endpoint URL, key stripped)."""
+    req = REQUEST_BUILDERS[name]("", "", tier=tier)
+    if "error" in req:
+        return None
+    return req["payload"].get("model") or req["url"].split("?")[0]
+
+
+def configured_providers() -> list:
+    """Names of providers with configuration present, in preference order."""
+    providers = []
+    if os.environ.get("GEMINI_API_KEY"):
+        providers.append("gemini")
+    if os.environ.get("OPENAI_API_KEY"):
+        providers.append("openai")
+    if os.environ.get("OLLAMA_BASE_URL"):
+        providers.append("ollama")
+    if os.environ.get("GROQ_API_KEY"):
+        providers.append("groq")
+    return providers
+
+
+class LLMClient:
+    def __init__(self, pool_size: int = None, max_retries: int = None):
+        self.providers = ["gemini", "openai", "ollama", "groq", "dummy"]
+        self.current_provider = os.environ.get("LLM_PROVIDER", "gemini")
+        self.pool_size = pool_size or LLM_POOL_SIZE
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        # one keep-alive session per provider, created on first use
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        # per-provider circuit breaker / latency tracking
+        self.health = {}
+        self._hedge_pool = None
+        self._stats_lock = threading.Lock()
+        self.hedge_stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+        # deterministic-ish completions (low temperature) keyed on provider/model/prompt/params
+        self.cache = LLMResponseCache() if LLM_CACHE_ENABLED else None
+
+    def _session(self, provider: str) -> requests.Session:
+        """Pooled keep-alive session for a provider, so repeat calls skip the TCP/TLS handshake."""
+        session = self._sessions.get(provider)
+        if session is not None:
+            return session
+        with self._sessions_lock:
+            session = self._sessions.get(provider)
+            if session is None:
+                # no adapter retries: _post() retries itself, within the caller's deadline
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[provider] = session
+        return session
+
+    def _post(self, provider: str, req: dict, kwargs: dict, stream: bool = False) -> requests.Response:
+        """
+        POST on the provider's pooled session, retrying connection errors,
+        timeouts and RETRY_STATUSES (generation calls are safe to repeat) up
+        to max_retries times with retry_delay() between attempts. With a
+        deadline in kwargs each attempt's timeout and each wait come out of
+        the remaining budget; once a wait no longer fits, the last response
+        is returned (or the last error raised) instead of retrying.
+        """
+        deadline = kwargs.get("deadline")
+        session = self._session(provider)
+        attempt = 0
+        while True:
+            try:
+                response = session.post(req["url"], headers=req["headers"], json=req["payload"],
+                                        timeout=self._timeout(kwargs, req["timeout"]), stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = retry_delay(attempt, None, deadline) if attempt < self.max_retries else None
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = retry_delay(attempt, response.headers.get("Retry-After"), deadline)
+                if delay is None:
+                    return response
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+            self._hedge_pool = None
         
+    @staticmethod
+    def _timeout(kwargs: dict, cap: float) -> float:
+        """Provider's own timeout, shortened to the caller's remaining deadline budget."""
+        deadline = kwargs.get("deadline")
+        if deadline is None:
+            return cap
+        return max(0.05, deadline.timeout(cap))  # urllib3 rejects non-positive timeouts
+
+    def call_gemini(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
+        """Try Gemini API with fallback"""
+        req = build_gemini_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self._post("gemini", req, kwargs)
             response.raise_for_status()
-            data = response.json()
-            
-            if "candidates" in data and data["candidates"]:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    text = candidate["content"]["parts"][0].get("text", "")
-                    return {"text": text, "provider": "gemini"}
-                    
-            return {"error": "Unexpected response format", "text": ""}
-            
+            return parse_gemini_response(response.json())
         except requests.exceptions.RequestException as e:
             return {"error": f"Gemini API error: {str(e)}", "text": ""}
 
     def call_openai_compatible(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
         """Fallback to OpenAI-compatible API - Optimized for OpenRouter"""
-        api_key = os.environ.get("OPENAI_API_KEY")
-        base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
-        
-        if not api_key:
-            return {"error": "OPENAI_API_KEY not configured", "text": ""}
-        
-        # OpenRouter configuration
-        if "openrouter" in base_url:
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-                "HTTP-Referer": os.environ.get("SITE_URL", "https://localhost:5000"),
-                "X-Title": os.environ.get("APP_NAME", "AutoMeet")
-            }
-            # Use the model from environment or fallback to a working free model
-            model = os.environ.get("OPENAI_MODEL", "meta-llama/llama-3.1-8b-instruct:free")
-        else:
-            # Standard OpenAI
-            url = f"{base_url}/chat/completions"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-            model = os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo")
-            
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        payload = {
-            "model": model,
-            "messages": messages,
-            "max_tokens": kwargs.get("max_tokens", 512),
-            "temperature": kwargs.get("temperature", 0.2)
-        }
-        
+        req = build_openai_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
         try:
-            print(f"🔧 Using model: {model}")
-            response = requests.post(url, headers=headers, json=payload, timeout=45)
-            
-            if response.status_code == 404:
-                # Model not found - suggest working models
-                suggested_models = [
-                    "meta-llama/llama-3.1-8b-instruct:free",
-                    "anthropic/claude-3.5-sonnet:free", 
-                    "microsoft/wizardlm-2-8x22b:free"
-                ]
-                return {"error": f"Model '{model}' not found. Try: {', '.join(suggested_models)}", "text": ""}
-            elif response.status_code == 401:
-                return {"error": "Invalid API key", "text": ""}
-            elif response.status_code != 200:
-                return {"error": f"HTTP {response.status_code}: {response.text[:100]}", "text": ""}
-                
-            response.raise_for_status()
-            data = response.json()
-            
-            text = data["choices"][0]["message"]["content"]
-            return {"text": text, "provider": "openai"}
-            
+            print(f"🔧 Using model: {req['payload']['model']}")
+            response = self._post("openai", req, kwargs)
+            status_error = openai_status_error(response.status_code, response.text, req["payload"]["model"])
+            if status_error:
+                return status_error
+            return parse_chat_response(response.json(), "openai")
         except requests.exceptions.Timeout:
             return {"error": "API timeout", "text": ""}
         except Exception as e:
@@ -121,102 +428,333 @@ class LLMClient:
 
     def call_ollama(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
         """Local fallback using Ollama"""
-        base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
-        model = os.environ.get("OLLAMA_MODEL", "llama2")
-        
-        url = f"{base_url}/api/generate"
-        payload = {
-            "model": model,
-            "prompt": system_prompt + "\n\n" + prompt,
-            "stream": False,
-            "options": {
-                "temperature": kwargs.get("temperature", 0.2),
-                "num_predict": kwargs.get("max_tokens", 512)
-            }
-        }
-        
+        req = build_ollama_request(prompt, system_prompt, **kwargs)
         try:
-            response = requests.post(url, json=payload, timeout=60)
+            response = self._post("ollama", req, kwargs)
             response.raise_for_status()
-            data = response.json()
-            
-            return {"text": data.get("response", ""), "provider": "ollama"}
-            
+            return parse_ollama_response(response.json())
         except requests.exceptions.RequestException:
             return {"error": "Ollama not available", "text": ""}
 
     def call_groq(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
         """Call Groq's OpenAI-compatible API"""
-        api_key = os.environ.get("GROQ_API_KEY")
-        base_url = os.environ.get("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
-        
-        if not api_key:
-            return {"error": "GROQ_API_KEY not configured", "text": ""}
-        
-        url = f"{base_url}/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
-
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload = {
-            "model": os.environ.get("GROQ_MODEL", "llama3-8b-8192"),  # Groq default model
-            "messages": messages,
-            "max_tokens": kwargs.get("max_tokens", 512),
-            "temperature": kwargs.get("temperature", 0.2)
-        }
-
+        req = build_groq_request(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            return req
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self._post("groq", req, kwargs)
             response.raise_for_status()
-            data = response.json()
-            
-            text = data["choices"][0]["message"]["content"]
-            return {"text": text, "provider": "groq"}
-            
+            return parse_chat_response(response.json(), "groq")
         except requests.exceptions.RequestException as e:
             return {"error": f"Groq API error: {str(e)}", "text": ""}
 
     def call_dummy(self, prompt: str, system_prompt: str = "", **kwargs) -> Dict:
         """Local dummy response for testing"""
-        return {
-            "text": f"[LLM Simulation] Response to: {prompt[:100]}...\n\nI understand you need assistance. This is a simulated response since the LLM service is currently unavailable. In a production environment, this would be a real AI response.",
-            "provider": "dummy"
+        return dummy_response(prompt)
+
+    def _cache_key(self, name: str, prompt: str, system_prompt: str, kwargs: dict):
+        """Cache key for this call on provider `name`, None if the call must not be cached."""
+        if self.cache is None or not kwargs.get("cache", True):
+            return None
+        temperature = kwargs.get("temperature", 0.2)
+        if not self.cache.cacheable(temperature):
+            return None
+        return cache_key(name, provider_model(name, kwargs.get("tier")), system_prompt, prompt,
+                         kwargs.get("max_tokens", 512), temperature)
+
+    def cached_response(self, prompt: str, system_prompt: str = "", **kwargs):
+        """
+        Cached answer from any configured provider, else None. A response
+        cached under a provider still counts when routing has since moved on
+        to another one; keys keep provider and model apart.
+        """
+        if self.cache is None or not kwargs.get("cache", True):
+            return None
+        if not self.cache.cacheable(kwargs.get("temperature", 0.2)):
+            self.cache.bypass()
+            return None
+        text = self.cache.get_any(self._cache_key(name, prompt, system_prompt, kwargs)
+                                  for name in configured_providers())
+        if text is not None:
+            print("💾 LLM cache hit")
+        return text
+
+    def cache_store(self, name: str, prompt: str, system_prompt: str, kwargs: dict, text: str):
+        key = self._cache_key(name, prompt, system_prompt, kwargs)
+        if key is not None and text:
+            self.cache.put(key, text)
+
+    def _configured_providers(self) -> list:
+        """(name, call) pairs for providers with configuration present, in preference order."""
+        calls = {
+            "gemini": self.call_gemini,
+            "openai": self.call_openai_compatible,
+            "ollama": self.call_ollama,
+            "groq": self.call_groq,
         }
+        return [(name, calls[name]) for name in configured_providers()]
 
-    def generate(self, prompt: str, system_prompt: str = "", **kwargs) -> str:
-        """Try multiple providers in order"""
-        providers_to_try = []
-        
-        # Determine which providers to try based on configuration
-        if os.environ.get("GEMINI_API_KEY"):
-            providers_to_try.append(self.call_gemini)
-        if os.environ.get("OPENAI_API_KEY"):
-            providers_to_try.append(self.call_openai_compatible)
-        if os.environ.get("OLLAMA_BASE_URL"):
-            providers_to_try.append(self.call_ollama)
-        if os.environ.get("GROQ_API_KEY"):
-            providers_to_try.append(self.call_groq)
-            
-        # Always include dummy as last resort
-        providers_to_try.append(self.call_dummy)
-        
-        # Try providers in order
-        for provider_func in providers_to_try:
-            result = provider_func(prompt, system_prompt, **kwargs)
+    def _health(self, name: str) -> ProviderHealth:
+        health = self.health.get(name)
+        if health is None:
+            health = self.health.setdefault(name, ProviderHealth(name))
+        return health
+
+    def route_providers(self) -> list:
+        """
+        Providers in the order to try them: recovery probes first, then the
+        fastest healthy provider by EWMA latency (unmeasured ones keep their
+        configured order), skipping providers whose circuit is open.
+        Dummy is always appended as last resort.
+        """
+        configured = self._configured_providers()
+        ordered = sorted(configured, key=lambda p: self._health(p[0]).routing_key())
+        return ordered + [("dummy", self.call_dummy)]
+
+    def _call_tracked(self, name: str, provider_func, prompt: str, system_prompt: str, **kwargs) -> Dict:
+        """Call one provider, feeding its outcome and latency into the circuit breaker."""
+        if name == "dummy":
+            return provider_func(prompt, system_prompt, **kwargs)
+        deadline = kwargs.get("deadline")
+        if deadline is not None and deadline.expired():
+            # out of budget is the caller's problem, not the provider's: don't count it
+            return {"error": f"{name} skipped, deadline exceeded", "text": "", "skipped": True}
+        health = self._health(name)
+        if not health.allow_request():
+            return {"error": f"{name} circuit open", "text": "", "skipped": True}
+        started = time.monotonic()
+        result = provider_func(prompt, system_prompt, **kwargs)
+        if result.get("text") and not result.get("error"):
+            health.record_success(time.monotonic() - started)
+            self.cache_store(name, prompt, system_prompt, kwargs, result["text"])
+        elif deadline is not None and deadline.expired():
+            # cut short by our own budget; says nothing about the provider
+            health.release_probe()
+        else:
+            health.record_failure()
+        return result
+
+    def generate(self, prompt: str, system_prompt: str = "", hedge: bool = False, **kwargs) -> str:
+        """
+        Try providers in health/latency order until one answers.
+        hedge=True races a second provider when the first one is slow (see _generate_hedged).
+        deadline=Deadline(...) in kwargs bounds every provider timeout by the budget left.
+        tier="fast" | "standard" | "deep" in kwargs picks the model tier (see MODEL_TIERS).
+        Low-temperature calls are answered from the response cache when possible;
+        cache=False in kwargs skips it. Identical low-temperature calls already
+        in flight are coalesced: followers wait for the leader's answer, but
+        retry themselves when the leader only got FALLBACK_ANSWER (its deadline
+        may have been much shorter than theirs).
+        """
+        cached = self.cached_response(prompt, system_prompt, **kwargs)
+        if cached is not None:
+            return cached
+        key = self._flight_key(prompt, system_prompt, hedge, kwargs)
+        if key is None:
+            return self._generate(prompt, system_prompt, hedge, **kwargs)
+        deadline = kwargs.get("deadline")
+        return get_flight("llm_generate").do(
+            key, self._generate, prompt, system_prompt, hedge,
+            wait_timeout=deadline.remaining() if deadline is not None else None,
+            shareable=is_shareable_answer, **kwargs)
+
+    @staticmethod
+    def _flight_key(prompt: str, system_prompt: str, hedge: bool, kwargs: dict):
+        """Coalescing key, None when calls are meant to differ (sampling temperature)."""
+        temperature = kwargs.get("temperature", 0.2)
+        if temperature > LLM_CACHE_MAX_TEMPERATURE:
+            return None
+        return flight_key(prompt, system_prompt, kwargs.get("max_tokens", 512), temperature, hedge, kwargs.get("tier"))
+
+    def _generate(self, prompt: str, system_prompt: str = "", hedge: bool = False, **kwargs) -> str:
+        if hedge:
+            return self._generate_hedged(prompt, system_prompt, **kwargs)
+
+        for name, provider_func in self.route_providers():
+            result = self._call_tracked(name, provider_func, prompt, system_prompt, **kwargs)
             if result.get("text") and not result.get("error"):
                 print(f"✅ LLM response from {result.get('provider', 'unknown')}")
                 return result["text"]
-            else:
+            elif not result.get("skipped"):
                 print(f"⚠️ {provider_func.__name__} failed: {result.get('error', 'Unknown error')}")
+
+        return FALLBACK_ANSWER
+
+    def _hedge_delay(self, name: str) -> float:
+        observed = self._health(name).latency_percentile(LLM_HEDGE_PERCENTILE)
+        return observed if observed is not None else LLM_HEDGE_DELAY_MS / 1000
+
+    def _generate_hedged(self, prompt: str, system_prompt: str = "", **kwargs) -> str:
+        """
+        Start the preferred provider; if it has not answered within its recent
+        tail latency, start the next one too and take whichever succeeds first.
+        Failures fall through to the next provider immediately, as in generate().
+        Losing requests are abandoned: queued ones are cancelled, in-flight ones
+        finish in the background (still feeding health stats) and are ignored.
+        """
+        if self._hedge_pool is None:
+            with self._sessions_lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=LLM_HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+
+        candidates = [p for p in self.route_providers() if p[0] != "dummy"]
+        with self._stats_lock:
+            self.hedge_stats["calls"] += 1
+        running = {}
+        hedges = 0
+        next_idx = 0
+
+        def launch():
+            nonlocal next_idx
+            name, func = candidates[next_idx]
+            next_idx += 1
+            future = self._hedge_pool.submit(self._call_tracked, name, func, prompt, system_prompt, **kwargs)
+            running[future] = name
+
+        if candidates:
+            launch()
+        deadline = kwargs.get("deadline")
+        while running:
+            can_hedge = next_idx < len(candidates) and hedges < LLM_HEDGE_MAX
+            # the hedge timer follows the oldest request still running
+            timeout = self._hedge_delay(next(iter(running.values()))) if can_hedge else None
+            if deadline is not None:
+                timeout = deadline.remaining() if timeout is None else deadline.timeout(timeout)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done and deadline is not None and deadline.expired():
+                print("⏰ Deadline exceeded while waiting for LLM providers")
+                for other in running:
+                    other.cancel()
+                break
+            if not done and not can_hedge:
+                continue
+            if not done:
+                hedges += 1
+                with self._stats_lock:
+                    self.hedge_stats["hedged"] += 1
+                print(f"⏱️ {next(iter(running.values()))} slow, hedging with {candidates[next_idx][0]}")
+                launch()
                 continue
-                
-        return "Sorry, I couldn't generate a response at this time."
+
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                if result.get("text") and not result.get("error"):
+                    for other in running:
+                        other.cancel()
+                    if hedges and name != candidates[0][0]:
+                        with self._stats_lock:
+                            self.hedge_stats["hedge_wins"] += 1
+                    print(f"✅ LLM response from {result.get('provider', 'unknown')}")
+                    return result["text"]
+                if not result.get("skipped"):
+                    print(f"⚠️ {name} failed: {result.get('error', 'Unknown error')}")
+            # nothing succeeded yet: keep the race going with the next provider
+            if not running and next_idx < len(candidates):
+                launch()
+
+        return self.call_dummy(prompt, system_prompt, **kwargs)["text"]
+
+    def _stream_builders(self) -> dict:
+        return {
+            "openai": (build_openai_request, parse_chat_stream_line),
+            "groq": (build_groq_request, parse_chat_stream_line),
+            "ollama": (build_ollama_request, parse_ollama_stream_line),
+        }
+
+    def _stream_provider(self, name: str, prompt: str, system_prompt: str, **kwargs):
+        """Yield text deltas from a natively streaming provider; raises on transport errors."""
+        build, parse_line = self._stream_builders()[name]
+        req = build(prompt, system_prompt, **kwargs)
+        if "error" in req:
+            raise RuntimeError(req["error"])
+        req = streaming_request(req)
+        with self._post(name, req, kwargs, stream=True) as response:
+            response.raise_for_status()
+            # chunk_size=None: hand over each chunk as it arrives instead of filling 512-byte blocks
+            for line in response.iter_lines(chunk_size=None):
+                delta, finished = parse_line(line.decode("utf-8"))
+                if delta:
+                    yield delta
+                if finished:
+                    return
+
+    def stream_generate(self, prompt: str, system_prompt: str = "", **kwargs):
+        """
+        Like generate(), but yields the answer as text chunks as they arrive.
+        Providers are tried in route order; a provider that fails before its
+        first token falls through to the next one. Once tokens have been sent
+        there is no taking them back, so a mid-stream failure ends the stream.
+        Non-streaming providers (Gemini, dummy) are answered whole and chunked,
+        as are cache hits.
+        """
+        cached = self.cached_response(prompt, system_prompt, **kwargs)
+        if cached is not None:
+            yield from chunk_text(cached)
+            return
+        deadline = kwargs.get("deadline")
+        for name, provider_func in self.route_providers():
+            if name not in STREAMING_PROVIDERS:
+                result = self._call_tracked(name, provider_func, prompt, system_prompt, **kwargs)
+                if result.get("text") and not result.get("error"):
+                    print(f"✅ LLM response from {result.get('provider', 'unknown')} (chunked)")
+                    yield from chunk_text(result["text"])
+                    return
+                if not result.get("skipped"):
+                    print(f"⚠️ {name} failed: {result.get('error', 'Unknown error')}")
+                continue
+
+            if deadline is not None and deadline.expired():
+                continue
+            health = self._health(name)
+            if not health.allow_request():
+                continue
+            started = time.monotonic()
+            sent = False
+            parts = []
+            try:
+                for delta in self._stream_provider(name, prompt, system_prompt, **kwargs):
+                    sent = True
+                    parts.append(delta)
+                    yield delta
+            except GeneratorExit:
+                # client went away mid-stream: no verdict on the provider
+                health.release_probe()
+                raise
+            except Exception as e:
+                if deadline is not None and deadline.expired():
+                    health.release_probe()
+                else:
+                    health.record_failure()
+                print(f"⚠️ {name} stream failed: {e}")
+                if sent:
+                    return
+                continue
+            if sent:
+                health.record_success(time.monotonic() - started)
+                self.cache_store(name, prompt, system_prompt, kwargs, "".join(parts))
+                print(f"✅ LLM stream from {name}")
+                return
+            # connected but produced nothing: treat like an empty answer
+            health.record_failure()
+
+        yield FALLBACK_ANSWER
+
+    def provider_status(self) -> dict:
+        return {name: health.snapshot() for name, health in list(self.health.items())}
+
+    def hedging_status(self) -> dict:
+        with self._stats_lock:
+            return dict(self.hedge_stats)
+
+    def cache_status(self) -> dict:
+        return self.cache.snapshot() if self.cache is not None else {"enabled": False}
+
+    def model_tiers(self) -> dict:
+        """Model each configured provider uses per tier."""
+        return {name: {tier: provider_model(name, tier) for tier in MODEL_TIERS}
+                for name in configured_providers() if name in REQUEST_BUILDERS}
 
 # Singleton instance
 llm_client = LLMClient()
@@ -224,3 +762,5 @@ llm_client = LLMClient()
 def generate(prompt: str, system_prompt: str = "", **kwargs) -> str:
     return llm_client.generate(prompt, system_prompt, **kwargs)
 
+def stream_generate(prompt: str, system_prompt: str = "", **kwargs):
+    return llm_client.stream_generate(prompt, system_prompt, **kwargs)
@@ -0,0 +1,97 @@
+# backend/services/prompt_compressor.py
+import os
+import re
+import numpy as np
+from services.context_packer import estimate_tokens, pack_context
+
+PROMPT_COMPRESSION = os.environ.get("RAG_PROMPT_COMPRESSION", "0").lower() in ("1", "true", "yes")
+# estimated tokens of context kept after compression
+COMPRESS_TOKEN_BUDGET = int(os.environ.get("RAG_COMPRESS_TOKEN_BUDGET", 600))
+# sentences kept on each side of a selected one, so it still reads in context
+COMPRESS_NEIGHBORS = int(os.environ.get("RAG_COMPRESS_NEIGHBORS", 1))
+# shorter fragments ("ok.", "yeah.") are never scored on their own
+_MIN_SENTENCE_CHARS = 12
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z0-9])")
+
+
+def split_sentences(text: str) -> list:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s.strip()]
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    rows = np.asarray(rows, dtype="float32")
+    norms = np.linalg.norm(rows, axis=-1, keepdims=True)
+    return rows / np.maximum(norms, 1e-12)
+
+
+def compress_context(chunks: list, query_embedding: np.ndarray, embed_texts, token_budget: int = None,
+                     neighbors: int = None) -> list:
+    """
+    Extractive compression of (packed) context chunks: every sentence is
+    scored by cosine similarity to the query embedding (one batched encode,
+    one matrix product), then the best sentences and their neighbours are
+    kept, in relevance order, until token_budget estimated tokens. Each chunk
+    keeps its selected sentences in original order, with " … " marking gaps;
+    chunks left with nothing are dropped.
+
+    embed_texts: list[str] -> (n, dim) array, e.g. Embeddings.embed_texts.
+    """
+    budget = COMPRESS_TOKEN_BUDGET if token_budget is None else token_budget
+    neighbors = COMPRESS_NEIGHBORS if neighbors is None else neighbors
+
+    sentences = []   # (chunk_no, position, text)
+    for chunk_no, chunk in enumerate(chunks):
+        text = chunk.get("metadata", {}).get("text_snippet", "")
+        for position, sentence in enumerate(split_sentences(text)):
+            sentences.append((chunk_no, position, sentence))
+    if not sentences:
+        return chunks
+    total = sum(estimate_tokens(s[2]) for s in sentences)
+    if total <= budget:
+        return chunks
+
+    scores = _unit(embed_texts([s[2] for s in sentences])) @ _unit(query_embedding).reshape(-1)
+    scores[[i for i, s in enumerate(sentences) if len(s[2]) < _MIN_SENTENCE_CHARS]] = -np.inf
+
+    keep, kept_texts, used = set(), set(), 0
+    for best in np.argsort(-scores):
+        if not np.isfinite(scores[best]) or used >= budget:
+            break
+        chunk_no = sentences[best][0]
+        for i in range(best - neighbors, best + neighbors + 1):
+            if 0 <= i < len(sentences) and i not in keep and sentences[i][0] == chunk_no:
+                # a sentence repeated verbatim elsewhere is kept once
+                if sentences[i][2] in kept_texts:
+                    continue
+                cost = estimate_tokens(sentences[i][2])
+                if used + cost > budget:
+                    continue
+                keep.add(i)
+                kept_texts.add(sentences[i][2])
+                used += cost
+
+    compressed = []
+    for chunk_no, chunk in enumerate(chunks):
+        kept = [i for i, s in enumerate(sentences) if s[0] == chunk_no and i in keep]
+        if not kept:
+            continue
+        parts = [sentences[kept[0]][2]]
+        for prev, i in zip(kept, kept[1:]):
+            parts.append(("" if i == prev + 1 else "… ") + sentences[i][2])
+        text = " ".join(parts)
+        compressed.append({**chunk, "metadata": {**chunk["metadata"], "text_snippet": text, "text": text,
+                                                 "tokens": estimate_tokens(text), "compressed": True}})
+
+    print(f"✂️ Compressed context ~{total} -> ~{used} tokens ({len(keep)}/{len(sentences)} sentences)")
+    return compressed
+
+
+def prompt_context(retrieved_chunks: list, query_embedding: np.ndarray = None, embed_texts=None,
+                   compress: bool = None) -> list:
+    """Retrieved chunks -> prompt context: packed, then compressed when enabled (RAG_PROMPT_COMPRESSION)."""
+    context = pack_context(retrieved_chunks)
+    compress = PROMPT_COMPRESSION if compress is None else compress
+    if compress and context and query_embedding is not None and embed_texts is not None:
+        context = compress_context(context, query_embedding, embed_texts)
+    return context
@@ -0,0 +1,123 @@
+# backend/services/provider_health.py
+import os
+import time
+import threading
+from collections import deque
+
+BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", 3))            # consecutive failures to open
+BREAKER_ERROR_RATE = float(os.environ.get("LLM_BREAKER_ERROR_RATE", 0.5))    # EWMA error rate to open
+BREAKER_MIN_CALLS = int(os.environ.get("LLM_BREAKER_MIN_CALLS", 5))          # before error rate counts
+BREAKER_COOLDOWN_S = float(os.environ.get("LLM_BREAKER_COOLDOWN_S", 30))     # open -> half-open
+EWMA_ALPHA = float(os.environ.get("LLM_EWMA_ALPHA", 0.3))
+LATENCY_WINDOW = int(os.environ.get("LLM_LATENCY_WINDOW", 200))                # samples kept for percentiles
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderHealth:
+    """
+    Circuit breaker plus latency/error tracking for one LLM provider.
+
+    closed    -> requests flow; EWMA latency and error rate are updated
+    open      -> requests are skipped until the cooldown expires
+    half_open -> a single probe request is let through; success closes the
+                 breaker, failure re-opens it for another cooldown
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.ewma_latency = None      # seconds, successful calls only
+        self.error_rate = 0.0         # EWMA of 0/1 outcomes
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= BREAKER_COOLDOWN_S:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self.consecutive_failures = 0
+            self._latencies.append(latency)
+            self.error_rate = (1 - EWMA_ALPHA) * self.error_rate
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+            if self.state != CLOSED:
+                print(f"🟢 {self.name} recovered, closing circuit")
+            self.state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * self.error_rate
+            should_open = (
+                self.state == HALF_OPEN
+                or self.consecutive_failures >= BREAKER_FAILURES
+                or (self.calls >= BREAKER_MIN_CALLS and self.error_rate >= BREAKER_ERROR_RATE)
+            )
+            # a late failure from a call started before the breaker opened
+            # must not push the cooldown further out
+            if should_open and self.state != OPEN:
+                print(f"🔴 {self.name} circuit opened for {BREAKER_COOLDOWN_S:.0f}s")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Forget an attempt that ended without a verdict (e.g. caller's deadline ran out)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def latency_percentile(self, pct: float, min_samples: int = 10):
+        """pct-th percentile (0-100) of recent successful latencies, None if too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < min_samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(pct / 100 * (len(samples) - 1)))))
+        return samples[rank]
+
+    def routing_key(self):
+        """Lower sorts first: half-open probes, then by measured latency; unmeasured last."""
+        with self._lock:
+            probe_due = self.state == OPEN and time.monotonic() - self.opened_at >= BREAKER_COOLDOWN_S
+            if self.state == HALF_OPEN or probe_due:
+                return (0, 0.0)
+            if self.ewma_latency is None:
+                return (2, 0.0)
+            # penalize flaky providers: expected time including retries elsewhere
+            return (1, self.ewma_latency * (1 + self.error_rate))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+                "samples": len(self._latencies),
+                "error_rate": round(self.error_rate, 3),
+                "consecutive_failures": self.consecutive_failures,
+                "calls": self.calls,
+                "failures": self.failures,
+            }
@@ -1,13 +1,16 @@
 # backend/services/rag_agent.py
 from services.embeddings import Embeddings
-from services.vector_store import FaissVectorStore
+from services.vector_store import get_vector_store
 from services.llm_client import generate
+from services.async_llm_client import agenerate
+from services.executors import run_cpu
+from services.prompt_compressor import prompt_context
 import os
 import textwrap
 import json
 
 EMBEDDER = Embeddings()
-VECTOR_STORE = FaissVectorStore(dim=EMBEDDER.model.get_sentence_embedding_dimension())
+VECTOR_STORE = get_vector_store(dim=EMBEDDER.model.get_sentence_embedding_dimension())
 TOP_K = int(os.environ.get("TOP_K", 5))
 
 SYSTEM_PROMPT_RAG = """
@@ -23,18 +26,18 @@ If the question seems related to meetings, projects, or business contexts, provi
 Be concise and actionable in your responses.
 """
 
-def build_prompt(user_query: str, retrieved_chunks: list):
+def build_prompt(user_query: str, retrieved_chunks: list, query_embedding=None, compress: bool = None):
     if not retrieved_chunks:
         # No context found - use general knowledge
         return user_query
     
     # retrieved_chunks: list of dicts with metadata & maybe full snippet
     context_texts = []
-    for r in retrieved_chunks:
+    for r in prompt_context(retrieved_chunks, query_embedding, EMBEDDER.embed_texts, compress):
         meta = r.get("metadata", {})
         snippet = meta.get("text_snippet", "")
         m_id = meta.get("meeting_id")
-        cidx = meta.get("chunk_index")
+        cidx = meta.get("chunk_range", meta.get("chunk_index"))
         header = f"[meeting:{m_id} chunk:{cidx}]"
         context_texts.append(f"{header}\n{snippet}")
 
@@ -51,18 +54,32 @@ def build_prompt(user_query: str, retrieved_chunks: list):
     """)
     return prompt
 
-def retrieve_and_generate(query: str, top_k: int = TOP_K):
+def retrieve_and_generate(query: str, top_k: int = TOP_K, deadline=None):
     q_emb = EMBEDDER.embed_text(query).reshape(1, -1)
     retrieved = VECTOR_STORE.search(q_emb, top_k=top_k)
     
     if not retrieved:
         # No relevant context found - use general knowledge
         print("🔍 No relevant context found, using general knowledge...")
-        answer = generate(query, system_prompt=SYSTEM_PROMPT_GENERAL, max_tokens=600, temperature=0.2)
+        answer = generate(query, system_prompt=SYSTEM_PROMPT_GENERAL, max_tokens=600, temperature=0.2, deadline=deadline)
         return {"answer": answer, "sources": [], "context_used": False}
     else:
         # Context found - use RAG
         print(f"🔍 Found {len(retrieved)} relevant context chunks")
-        prompt = build_prompt(query, retrieved)
-        answer = generate(prompt, system_prompt=SYSTEM_PROMPT_RAG, max_tokens=600, temperature=0.2)
-        return {"answer": answer, "sources": retrieved, "context_used": True}
\ No newline at end of file
+        prompt = build_prompt(query, retrieved, q_emb)
+        answer = generate(prompt, system_prompt=SYSTEM_PROMPT_RAG, max_tokens=600, temperature=0.2, deadline=deadline)
+        return {"answer": answer, "sources": retrieved, "context_used": True}
+
+async def retrieve_and_generate_async(query: str, top_k: int = TOP_K, deadline=None):
+    """retrieve_and_generate() with the LLM call awaited and embedding/search off the event loop."""
+    q_emb = (await run_cpu(EMBEDDER.embed_text, query)).reshape(1, -1)
+    retrieved = await run_cpu(VECTOR_STORE.search, q_emb, top_k)
+
+    if not retrieved:
+        print("🔍 No relevant context found, using general knowledge...")
+        answer = await agenerate(query, system_prompt=SYSTEM_PROMPT_GENERAL, max_tokens=600, temperature=0.2, deadline=deadline)
+        return {"answer": answer, "sources": [], "context_used": False}
+    print(f"🔍 Found {len(retrieved)} relevant context chunks")
+    prompt = await run_cpu(build_prompt, query, retrieved, q_emb)
+    answer = await agenerate(prompt, system_prompt=SYSTEM_PROMPT_RAG, max_tokens=600, temperature=0.2, deadline=deadline)
+    return {"answer": answer, "sources": retrieved, "context_used": True}
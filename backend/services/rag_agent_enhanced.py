@@ -1,14 +1,49 @@
 # backend/services/rag_agent_enhanced.py
 from services.embeddings import Embeddings
-from services.vector_store import FaissVectorStore
-from services.llm_client import generate
+from services.vector_store import get_vector_store
+from services.llm_client import generate, stream_generate, chunk_text
+from services.async_llm_client import agenerate, astream_generate
+from services.executors import run_cpu
+from services.deadline import Deadline
+from services.semantic_cache import get_semantic_cache
+from services.single_flight import get_flight, flight_key
+from services.verification_queue import VERIFICATION_QUEUE
+from services.prompt_compressor import prompt_context
+from services.intent_classifier import classify_intent
+from services.context_packer import estimate_tokens
+from services.structured_answers import answer_structured
 import os
 import textwrap
 import re
 
 EMBEDDER = Embeddings()
-VECTOR_STORE = FaissVectorStore(dim=EMBEDDER.model.get_sentence_embedding_dimension())
+VECTOR_STORE = get_vector_store(dim=EMBEDDER.model.get_sentence_embedding_dimension())
 TOP_K = int(os.environ.get("TOP_K", 5))
+# optional stages only run if at least this much of the request budget is left
+VERIFY_MIN_BUDGET_S = int(os.environ.get("RAG_VERIFY_MIN_BUDGET_MS", 8000)) / 1000
+CORRECTION_MIN_BUDGET_S = int(os.environ.get("RAG_CORRECTION_MIN_BUDGET_MS", 10000)) / 1000
+# "sync": verify (and correct) before answering; "async": answer at once and
+# verify in the background behind a ticket; "off": no verification
+VERIFY_MODES = ("sync", "async", "off")
+VERIFY_MODE = os.environ.get("RAG_VERIFY_MODE", "async")
+# budget for a background verification + correction run
+VERIFY_BACKGROUND_TIMEOUT_MS = int(os.environ.get("RAG_VERIFY_BACKGROUND_TIMEOUT_MS", 60000))
+# model tier and answer length by intent (see answer_budget); off = standard tier, 1000 tokens
+TIER_ROUTING = os.environ.get("RAG_TIER_ROUTING", "1").lower() in ("1", "true", "yes")
+INTENT_TIERS = {
+    'meeting_specific': 'fast',
+    'general_knowledge': 'fast',
+    'technical_guidance': 'standard',
+    'decision_support': 'deep',
+    'hypothetical_scenario': 'deep',
+}
+TIER_MAX_TOKENS = {
+    'fast': int(os.environ.get("RAG_FAST_MAX_TOKENS", 400)),
+    'standard': int(os.environ.get("RAG_STANDARD_MAX_TOKENS", 1000)),
+    'deep': int(os.environ.get("RAG_DEEP_MAX_TOKENS", 1500)),
+}
+# prompts longer than this (estimated tokens) are too much for the fast tier
+FAST_MAX_PROMPT_TOKENS = int(os.environ.get("RAG_FAST_MAX_PROMPT_TOKENS", 1200))
 
 # Enhanced system prompts
 SYSTEM_PROMPT_CONTEXT_AWARE = """
@@ -61,83 +96,15 @@ You are a strategic decision analysis assistant. Your role is to:
 - Implementation considerations
 """
 
-def analyze_query_intent(query: str) -> dict:
+def analyze_query_intent(query: str, query_embedding=None) -> dict:
     """
     Advanced query intent analysis with confidence scoring
+    (one compiled trigger-phrase pass; nearest-centroid fallback on the query embedding)
     """
-    query_lower = query.lower()
-    intent_weights = {
-        'technical_guidance': 0,
-        'decision_support': 0,
-        'meeting_specific': 0,
-        'general_knowledge': 0,
-        'hypothetical_scenario': 0
-    }
-    
-    # Technical guidance triggers
-    tech_triggers = [
-        'how to', 'build', 'create', 'setup', 'configure', 'implement',
-        'code', 'api', 'database', 'framework', 'architecture',
-        'workflow', 'deploy', 'debug', 'fix', 'tech stack',
-        'flask', 'react', 'python', 'javascript', 'sql', 'docker'
-    ]
-    
-    # Decision support triggers
-    decision_triggers = [
-        'should i', 'what should', 'recommend', 'advice on',
-        'decision', 'choose between', 'better option',
-        'pros and cons', 'risks', 'opportunities',
-        'strategy', 'planning', 'approach'
-    ]
-    
-    # Hypothetical scenario triggers
-    hypothetical_triggers = [
-        'what if', 'suppose', 'scenario', 'hypothetical',
-        'if we', 'assuming', 'consider if'
-    ]
-    
-    # Meeting context triggers
-    meeting_triggers = [
-        'meeting', 'discussed', 'said', 'talked about',
-        'action item', 'decision', 'follow up'
-    ]
-    
-    # Score intents
-    for trigger in tech_triggers:
-        if trigger in query_lower:
-            intent_weights['technical_guidance'] += 1
-    
-    for trigger in decision_triggers:
-        if trigger in query_lower:
-            intent_weights['decision_support'] += 1
-            
-    for trigger in hypothetical_triggers:
-        if trigger in query_lower:
-            intent_weights['hypothetical_scenario'] += 1
-            
-    for trigger in meeting_triggers:
-        if trigger in query_lower:
-            intent_weights['meeting_specific'] += 1
-    
-    # Default to general knowledge if no strong signals
-    if sum(intent_weights.values()) == 0:
-        intent_weights['general_knowledge'] = 1
-    
-    # FIXED: Use intent_weights.get as the key function
-    primary_intent = max(intent_weights, key=intent_weights.get)
-    confidence = intent_weights[primary_intent] / max(1, sum(intent_weights.values()))
-    
-    return {
-        'primary_intent': primary_intent,
-        'confidence': confidence,
-        'all_weights': intent_weights
-    }
+    return classify_intent(query, query_embedding, EMBEDDER.embed_texts)
 
-def verify_answer_against_context(answer: str, retrieved_chunks: list, query: str) -> dict:
-    """
-    Enhanced verification system to ensure accuracy
-    """
-    verification_prompt = f"""
+def build_verification_prompt(answer: str, retrieved_chunks: list, query: str) -> str:
+    return f"""
     QUERY: {query}
     
     PROPOSED ANSWER: {answer}
@@ -158,19 +125,50 @@ def verify_answer_against_context(answer: str, retrieved_chunks: list, query: st
     - UNCERTAIN: Significant unsupported claims
     - INACCURATE: Contradicts context or facts
     """
-    
-    verification_result = generate(
-        verification_prompt, 
-        system_prompt="You are a strict fact-checker. Be brutally honest about accuracy.",
-        max_tokens=300,
-        temperature=0.1
-    )
-    
+
+VERIFY_SYSTEM_PROMPT = "You are a strict fact-checker. Be brutally honest about accuracy."
+CORRECTION_SYSTEM_PROMPT = "Provide a more accurate and carefully qualified version of the previous answer."
+
+def _verification_outcome(verification_result: str) -> dict:
     return {
         'verification_result': verification_result,
         'needs_correction': 'INACCURATE' in verification_result or 'UNCERTAIN' in verification_result
     }
 
+def verify_answer_against_context(answer: str, retrieved_chunks: list, query: str, deadline: Deadline = None) -> dict:
+    """
+    Enhanced verification system to ensure accuracy
+    """
+    verification_result = generate(
+        build_verification_prompt(answer, retrieved_chunks, query),
+        system_prompt=VERIFY_SYSTEM_PROMPT,
+        max_tokens=300,
+        temperature=0.1,
+        deadline=deadline
+    )
+    return _verification_outcome(verification_result)
+
+async def verify_answer_against_context_async(answer: str, retrieved_chunks: list, query: str, deadline: Deadline = None) -> dict:
+    verification_result = await agenerate(
+        build_verification_prompt(answer, retrieved_chunks, query),
+        system_prompt=VERIFY_SYSTEM_PROMPT,
+        max_tokens=300,
+        temperature=0.1,
+        deadline=deadline
+    )
+    return _verification_outcome(verification_result)
+
+def build_correction_prompt(query: str, initial_answer: str, verification: dict) -> str:
+    return f"""
+                ORIGINAL QUERY: {query}
+                
+                INITIAL ANSWER: {initial_answer}
+                
+                ACCURACY FEEDBACK: {verification['verification_result']}
+                
+                Please provide a corrected answer that addresses the accuracy concerns while still being helpful.
+                """
+
 def build_technical_guidance_prompt(query: str, context_chunks: list = None):
     """Build prompt for technical guidance with accuracy checks"""
     
@@ -269,115 +267,481 @@ def build_hypothetical_analysis_prompt(query: str, context_chunks: list = None):
     
     return prompt
 
-def retrieve_and_generate_enhanced(query: str, top_k: int = TOP_K):
-    """Enhanced RAG with multi-capability support and accuracy verification"""
+def plan_answer(query: str, retrieved_chunks: list, primary_intent: str, query_embedding=None, compress: bool = None):
+    """
+    Route by intent: (prompt, system_prompt, assistance_type) for the initial answer.
+    With query_embedding, the context can also be sentence-compressed (RAG_PROMPT_COMPRESSION).
+    """
+    # merged, de-duplicated and token-budgeted; the response still cites the raw chunks
+    retrieved_chunks = prompt_context(retrieved_chunks, query_embedding, EMBEDDER.embed_texts, compress)
+    if primary_intent == 'technical_guidance':
+        print("🔧 Providing technical guidance...")
+        return build_technical_guidance_prompt(query, retrieved_chunks), SYSTEM_PROMPT_TECHNICAL, "technical_guidance"
+
+    if primary_intent == 'decision_support':
+        print("🤔 Providing decision analysis...")
+        return build_decision_analysis_prompt(query, retrieved_chunks), SYSTEM_PROMPT_DECISION_ANALYSIS, "decision_support"
+
+    if primary_intent == 'hypothetical_scenario':
+        print("🔮 Analyzing hypothetical scenario...")
+        return build_hypothetical_analysis_prompt(query, retrieved_chunks), SYSTEM_PROMPT_CONTEXT_AWARE, "hypothetical_analysis"
+
+    # Context-aware general response
+    print("🔍 Using context-aware response...")
+    context_texts = []
+    for chunk in retrieved_chunks:
+        meta = chunk.get("metadata", {})
+        snippet = meta.get("text_snippet", "")
+        m_id = meta.get("meeting_id")
+        cidx = meta.get("chunk_range", meta.get("chunk_index"))
+        header = f"[meeting:{m_id} chunk:{cidx}]" if m_id else "[general]"
+        context_texts.append(f"{header}\n{snippet}")
+    
+    context_block = "\n\n---\n\n".join(context_texts) if context_texts else "No specific context available."
+    
+    prompt = textwrap.dedent(f"""
+    QUERY: {query}
+    
+    AVAILABLE CONTEXT:
+    {context_block}
     
+    RESPONSE REQUIREMENTS:
+    - Address the query directly and accurately
+    - Use context when relevant, cite sources
+    - Acknowledge limitations and uncertainties
+    - Be helpful and informative
+    - Maintain professional tone
+    """)
+    return prompt, SYSTEM_PROMPT_CONTEXT_AWARE, "context_aware"
+
+def answer_budget(primary_intent: str, prompt: str) -> dict:
+    """Model tier and max_tokens for the initial answer, from intent and prompt size."""
+    if not TIER_ROUTING:
+        return {"tier": "standard", "max_tokens": 1000}
+    tier = INTENT_TIERS.get(primary_intent, 'standard')
+    if tier == 'fast' and estimate_tokens(prompt) > FAST_MAX_PROMPT_TOKENS:
+        tier = 'standard'
+    return {"tier": tier, "max_tokens": TIER_MAX_TOKENS[tier]}
+
+def _project_scope(project_ids):
+    """Sorted tuple of the project ids to search (their vector store shards), None for all."""
+    if project_ids is None:
+        return None
+    return tuple(sorted({int(p) for p in project_ids}))
+
+def _structured_fast_path(query: str, scope: tuple = None, meeting_id: int = None):
+    """SQL answer for "action items / decisions of meeting N" questions, None to run the RAG pipeline."""
+    try:
+        return answer_structured(query, project_ids=scope, meeting_id=meeting_id)
+    except Exception as e:
+        print(f"⚠️ Structured fast path unavailable: {e}")
+        return None
+
+def _verification_stage(primary_intent: str, deadline: Deadline, skipped_stages: list, verify_mode: str = "sync"):
+    """
+    How to verify: 'waived' (hypothetical), 'off', 'background' (async mode),
+    'skipped' (sync mode without enough budget) or 'run'.
+    """
+    if primary_intent == 'hypothetical_scenario':
+        return 'waived'
+    if verify_mode == 'off':
+        return 'off'
+    if verify_mode == 'async':
+        return 'background'
+    if deadline.remaining() < VERIFY_MIN_BUDGET_S:
+        print(f"⏰ Skipping verification, {deadline.remaining():.1f}s left")
+        skipped_stages.extend(["verification", "correction"])
+        return 'skipped'
+    return 'run'
+
+def _should_correct(verification: dict, deadline: Deadline, skipped_stages: list) -> bool:
+    if not verification['needs_correction']:
+        return False
+    if deadline.remaining() < CORRECTION_MIN_BUDGET_S:
+        print(f"⏰ Skipping correction, {deadline.remaining():.1f}s left")
+        skipped_stages.append("correction")
+        return False
+    print("⚠️ Accuracy verification triggered correction")
+    return True
+
+WAIVED_VERIFICATION = {'verification_result': 'Hypothetical scenario - accuracy check waived'}
+SKIPPED_VERIFICATION = {'verification_result': 'Skipped - request deadline too close'}
+OFF_VERIFICATION = {'verification_result': 'Not verified - verification disabled for this request'}
+PENDING_VERIFICATION = {'verification_result': 'Pending - verification running in background'}
+
+def _verify_and_correct(query: str, initial_answer: str, retrieved_chunks: list, deadline: Deadline, skipped_stages: list):
+    """Verification plus (budget permitting) correction -> (final_answer, verification)."""
+    verification = verify_answer_against_context(initial_answer, retrieved_chunks, query, deadline=deadline)
+    final_answer = initial_answer
+    if _should_correct(verification, deadline, skipped_stages):
+        # Generate corrected answer with verification feedback
+        final_answer = generate(build_correction_prompt(query, initial_answer, verification),
+                              system_prompt=CORRECTION_SYSTEM_PROMPT,
+                              max_tokens=800, temperature=0.2, deadline=deadline)
+    return final_answer, verification
+
+def _background_verification(query, initial_answer, retrieved_chunks, assistance_type, intent_analysis,
+                             cache, q_emb, top_k, scope=None) -> dict:
+    """Verification ticket job: verify, correct if needed, cache the verified response."""
+    skipped_stages = []
+    final_answer, verification = _verify_and_correct(
+        query, initial_answer, retrieved_chunks, Deadline.from_ms(VERIFY_BACKGROUND_TIMEOUT_MS), skipped_stages)
+    response = _enhanced_response(final_answer, retrieved_chunks, assistance_type, intent_analysis,
+                                  verification, skipped_stages, {"mode": "async", "status": "done"})
+    _cache_answer(cache, query, q_emb, top_k, response, scope)
+    return {
+        "answer": final_answer,
+        "corrected": final_answer != initial_answer,
+        "needs_correction": verification['needs_correction'],
+        "accuracy_verification": response["accuracy_verification"],
+        "skipped_stages": skipped_stages,
+    }
+
+def _verification_info(stage: str, verify_mode: str, ticket: str = None) -> dict:
+    status = {'run': 'done', 'background': 'pending'}.get(stage, stage)
+    info = {"mode": verify_mode, "status": status}
+    if ticket:
+        info["ticket"] = ticket
+        info["poll"] = f"/api/ai/verification/{ticket}"
+    return info
+
+def _enhanced_response(final_answer, retrieved_chunks, assistance_type, intent_analysis, verification, skipped_stages,
+                       verification_info: dict = None) -> dict:
+    return {
+        "answer": final_answer,
+        "sources": retrieved_chunks,
+        "context_used": bool(retrieved_chunks),
+        "assistance_type": assistance_type,
+        "intent_analysis": intent_analysis,
+        "accuracy_verification": verification['verification_result'][:200] + "..." if len(verification['verification_result']) > 200 else verification['verification_result'],
+        "verification": verification_info or {"mode": "sync", "status": "done"},
+        "skipped_stages": skipped_stages
+    }
+
+def _error_response(e: Exception, skipped_stages: list) -> dict:
+    return {
+        "answer": f"I encountered an error while processing your request: {str(e)}. Please try again.",
+        "sources": [],
+        "context_used": False,
+        "assistance_type": "error",
+        "intent_analysis": {},
+        "accuracy_verification": "Error occurred during processing",
+        "skipped_stages": skipped_stages
+    }
+
+def _semantic_cache(use_cache: bool):
+    return get_semantic_cache(VECTOR_STORE.dim) if use_cache else None
+
+def _cache_answer(cache, query, q_emb, top_k, response: dict, scope: tuple = None):
+    # only verified (or verification-exempt) answers are worth repeating
+    verified = response.get("verification", {}).get("status") in ("done", "waived")
+    if cache is not None and verified and not response.get("skipped_stages"):
+        cache.store(query, q_emb, top_k, response, scope)
+
+def retrieve_and_generate_enhanced(query: str, top_k: int = TOP_K, hedge: bool = False, deadline: Deadline = None,
+                                   use_cache: bool = True, verify_mode: str = None, project_ids=None,
+                                   meeting_id: int = None):
+    """
+    Enhanced RAG with multi-capability support and accuracy verification.
+    hedge=True races a second LLM provider for the user-facing answer when the
+    first is slow (latency-sensitive callers such as the live-meeting chat).
+    deadline bounds the whole pipeline: each LLM call gets only the remaining
+    budget and verification/correction are skipped when too little is left.
+    use_cache=True answers near-duplicates of recent queries from the semantic cache.
+    Identical queries already in flight share one pipeline run (single-flight).
+    verify_mode (default RAG_VERIFY_MODE): "sync" verifies before returning,
+    "async" returns the initial answer with a verification ticket to poll,
+    "off" skips verification.
+    Plain "what are the action items / decisions" questions about one meeting
+    ("meeting N" in the query, else meeting_id) are answered from the rows
+    extracted at ingest, without retrieval or LLM calls.
+    project_ids limits retrieval (and cached answers) to those projects'
+    vector store shards; None searches every shard.
+    """
+    scope = _project_scope(project_ids)
+    structured = _structured_fast_path(query, scope, meeting_id)
+    if structured is not None:
+        return structured
+    deadline = deadline or Deadline.from_ms()
+    verify_mode = verify_mode or VERIFY_MODE
+    result = get_flight("rag_query").do(
+        flight_key(query, top_k, hedge, use_cache, verify_mode, scope), _retrieve_and_generate_enhanced,
+        query, top_k, hedge, deadline, use_cache, verify_mode, scope, wait_timeout=deadline.remaining())
+    # callers (e.g. comprehensive_qa) annotate the dict; don't share one object
+    return dict(result)
+
+def _retrieve_and_generate_enhanced(query: str, top_k: int, hedge: bool, deadline: Deadline, use_cache: bool,
+                                    verify_mode: str, scope: tuple = None):
+    skipped_stages = []
+
     try:
-        # Step 1: Analyze query intent
-        intent_analysis = analyze_query_intent(query)
+        # Step 1: Embed the query and analyze its intent (the embedding doubles as the intent fallback)
+        q_emb = EMBEDDER.embed_text(query).reshape(1, -1)
+        intent_analysis = analyze_query_intent(query, q_emb)
         print(f"🎯 Detected intent: {intent_analysis['primary_intent']} (confidence: {intent_analysis['confidence']:.2f})")
         
-        # Step 2: Retrieve relevant context
-        q_emb = EMBEDDER.embed_text(query).reshape(1, -1)
-        retrieved_chunks = VECTOR_STORE.search(q_emb, top_k=top_k)
+        # Step 2: Retrieve relevant context (unless an equivalent query was answered recently)
+        cache = _semantic_cache(use_cache)
+        cached = cache.lookup(query, q_emb, top_k, scope) if cache is not None else None
+        if cached is not None:
+            print(f"💾 Semantic cache hit ({cached['cache']['similarity']:.3f})")
+            return cached
+        retrieved_chunks = VECTOR_STORE.search(q_emb, top_k=top_k, project_ids=scope)
         
         # Step 3: Route to appropriate handler
         primary_intent = intent_analysis['primary_intent']
-        
-        if primary_intent == 'technical_guidance':
-            print("🔧 Providing technical guidance...")
-            prompt = build_technical_guidance_prompt(query, retrieved_chunks)
-            system_prompt = SYSTEM_PROMPT_TECHNICAL
-            assistance_type = "technical_guidance"
-            
-        elif primary_intent == 'decision_support':
-            print("🤔 Providing decision analysis...")
-            prompt = build_decision_analysis_prompt(query, retrieved_chunks)
-            system_prompt = SYSTEM_PROMPT_DECISION_ANALYSIS
-            assistance_type = "decision_support"
-            
-        elif primary_intent == 'hypothetical_scenario':
-            print("🔮 Analyzing hypothetical scenario...")
-            prompt = build_hypothetical_analysis_prompt(query, retrieved_chunks)
-            system_prompt = SYSTEM_PROMPT_CONTEXT_AWARE
-            assistance_type = "hypothetical_analysis"
-            
-        else:
-            # Context-aware general response
-            print("🔍 Using context-aware response...")
-            context_texts = []
-            for chunk in retrieved_chunks:
-                meta = chunk.get("metadata", {})
-                snippet = meta.get("text_snippet", "")
-                m_id = meta.get("meeting_id")
-                cidx = meta.get("chunk_index")
-                header = f"[meeting:{m_id} chunk:{cidx}]" if m_id else "[general]"
-                context_texts.append(f"{header}\n{snippet}")
-            
-            context_block = "\n\n---\n\n".join(context_texts) if context_texts else "No specific context available."
-            
-            prompt = textwrap.dedent(f"""
-            QUERY: {query}
-            
-            AVAILABLE CONTEXT:
-            {context_block}
-            
-            RESPONSE REQUIREMENTS:
-            - Address the query directly and accurately
-            - Use context when relevant, cite sources
-            - Acknowledge limitations and uncertainties
-            - Be helpful and informative
-            - Maintain professional tone
-            """)
-            system_prompt = SYSTEM_PROMPT_CONTEXT_AWARE
-            assistance_type = "context_aware"
+        prompt, system_prompt, assistance_type = plan_answer(query, retrieved_chunks, primary_intent, q_emb)
+        # model tier and answer length for this intent and context size
+        budget = intent_analysis['generation'] = answer_budget(primary_intent, prompt)
         
         # Step 4: Generate initial answer
         initial_answer = generate(prompt, system_prompt=system_prompt, 
-                                max_tokens=1000, temperature=0.3)
+                                temperature=0.3, hedge=hedge, deadline=deadline, **budget)
         
-        # Step 5: Verify accuracy (for non-hypothetical queries)
-        if primary_intent != 'hypothetical_scenario':
-            verification = verify_answer_against_context(initial_answer, retrieved_chunks, query)
-            
-            if verification['needs_correction']:
-                print("⚠️ Accuracy verification triggered correction")
-                # Generate corrected answer with verification feedback
-                correction_prompt = f"""
-                ORIGINAL QUERY: {query}
-                
-                INITIAL ANSWER: {initial_answer}
-                
-                ACCURACY FEEDBACK: {verification['verification_result']}
-                
-                Please provide a corrected answer that addresses the accuracy concerns while still being helpful.
-                """
-                
-                final_answer = generate(correction_prompt, 
-                                      system_prompt="Provide a more accurate and carefully qualified version of the previous answer.",
-                                      max_tokens=800, temperature=0.2)
-            else:
-                final_answer = initial_answer
+        # Step 5: Verify accuracy (non-hypothetical queries; inline, in the background or not at all)
+        final_answer = initial_answer
+        ticket = None
+        stage = _verification_stage(primary_intent, deadline, skipped_stages, verify_mode)
+        if stage == 'waived':
+            verification = WAIVED_VERIFICATION
+        elif stage == 'skipped':
+            verification = SKIPPED_VERIFICATION
+        elif stage == 'off':
+            verification = OFF_VERIFICATION
+        elif stage == 'background':
+            verification = PENDING_VERIFICATION
+            ticket = VERIFICATION_QUEUE.submit(_background_verification, query, initial_answer, retrieved_chunks,
+                                               assistance_type, intent_analysis, cache, q_emb, top_k, scope)
         else:
-            final_answer = initial_answer
-            verification = {'verification_result': 'Hypothetical scenario - accuracy check waived'}
+            final_answer, verification = _verify_and_correct(query, initial_answer, retrieved_chunks, deadline, skipped_stages)
         
-        return {
-            "answer": final_answer,
-            "sources": retrieved_chunks,
-            "context_used": bool(retrieved_chunks),
-            "assistance_type": assistance_type,
-            "intent_analysis": intent_analysis,
-            "accuracy_verification": verification['verification_result'][:200] + "..." if len(verification['verification_result']) > 200 else verification['verification_result']
-        }
+        response = _enhanced_response(final_answer, retrieved_chunks, assistance_type, intent_analysis, verification,
+                                      skipped_stages, _verification_info(stage, verify_mode, ticket))
+        _cache_answer(cache, query, q_emb, top_k, response, scope)
+        return response
     
     except Exception as e:
         print(f"❌ Error in retrieve_and_generate_enhanced: {str(e)}")
-        return {
-            "answer": f"I encountered an error while processing your request: {str(e)}. Please try again.",
-            "sources": [],
-            "context_used": False,
-            "assistance_type": "error",
-            "intent_analysis": {},
-            "accuracy_verification": "Error occurred during processing"
-        }
\ No newline at end of file
+        return _error_response(e, skipped_stages)
+
+async def retrieve_and_generate_enhanced_async(query: str, top_k: int = TOP_K, hedge: bool = False, deadline: Deadline = None,
+                                               use_cache: bool = True, verify_mode: str = None, project_ids=None,
+                                               meeting_id: int = None):
+    """
+    retrieve_and_generate_enhanced() on AsyncLLMClient. Embedding and the
+    FAISS search are CPU-bound and run off the event loop; LLM calls are
+    awaited, so a waiting request holds no thread.
+    """
+    scope = _project_scope(project_ids)
+    structured = await run_cpu(_structured_fast_path, query, scope, meeting_id)
+    if structured is not None:
+        return structured
+    deadline = deadline or Deadline.from_ms()
+    verify_mode = verify_mode or VERIFY_MODE
+    result = await get_flight("rag_query").ado(
+        flight_key(query, top_k, hedge, use_cache, verify_mode, scope), _retrieve_and_generate_enhanced_async,
+        query, top_k, hedge, deadline, use_cache, verify_mode, scope, wait_timeout=deadline.remaining())
+    return dict(result)
+
+async def _retrieve_and_generate_enhanced_async(query: str, top_k: int, hedge: bool, deadline: Deadline, use_cache: bool,
+                                                verify_mode: str, scope: tuple = None):
+    skipped_stages = []
+
+    try:
+        q_emb = (await run_cpu(EMBEDDER.embed_text, query)).reshape(1, -1)
+        intent_analysis = await run_cpu(analyze_query_intent, query, q_emb)
+        print(f"🎯 Detected intent: {intent_analysis['primary_intent']} (confidence: {intent_analysis['confidence']:.2f})")
+
+        cache = _semantic_cache(use_cache)
+        cached = cache.lookup(query, q_emb, top_k, scope) if cache is not None else None
+        if cached is not None:
+            print(f"💾 Semantic cache hit ({cached['cache']['similarity']:.3f})")
+            return cached
+        retrieved_chunks = await run_cpu(VECTOR_STORE.search, q_emb, top_k, scope)
+
+        primary_intent = intent_analysis['primary_intent']
+        prompt, system_prompt, assistance_type = await run_cpu(plan_answer, query, retrieved_chunks, primary_intent, q_emb)
+        # model tier and answer length for this intent and context size
+        budget = intent_analysis['generation'] = answer_budget(primary_intent, prompt)
+
+        initial_answer = await agenerate(prompt, system_prompt=system_prompt,
+                                         temperature=0.3, hedge=hedge, deadline=deadline, **budget)
+
+        final_answer = initial_answer
+        ticket = None
+        stage = _verification_stage(primary_intent, deadline, skipped_stages, verify_mode)
+        if stage == 'waived':
+            verification = WAIVED_VERIFICATION
+        elif stage == 'skipped':
+            verification = SKIPPED_VERIFICATION
+        elif stage == 'off':
+            verification = OFF_VERIFICATION
+        elif stage == 'background':
+            # the background job runs on the verification pool (sync client), not this loop
+            verification = PENDING_VERIFICATION
+            ticket = VERIFICATION_QUEUE.submit(_background_verification, query, initial_answer, retrieved_chunks,
+                                               assistance_type, intent_analysis, cache, q_emb, top_k, scope)
+        else:
+            verification = await verify_answer_against_context_async(initial_answer, retrieved_chunks, query, deadline=deadline)
+            if _should_correct(verification, deadline, skipped_stages):
+                final_answer = await agenerate(build_correction_prompt(query, initial_answer, verification),
+                                               system_prompt=CORRECTION_SYSTEM_PROMPT,
+                                               max_tokens=800, temperature=0.2, deadline=deadline)
+
+        response = _enhanced_response(final_answer, retrieved_chunks, assistance_type, intent_analysis, verification,
+                                      skipped_stages, _verification_info(stage, verify_mode, ticket))
+        _cache_answer(cache, query, q_emb, top_k, response, scope)
+        return response
+
+    except Exception as e:
+        print(f"❌ Error in retrieve_and_generate_enhanced_async: {str(e)}")
+        return _error_response(e, skipped_stages)
+
+def _stream_done(answer: str, retrieved_chunks: list, assistance_type: str, intent_analysis: dict) -> dict:
+    return {
+        "answer": answer,
+        "context_used": bool(retrieved_chunks),
+        "assistance_type": assistance_type,
+        "intent_analysis": intent_analysis,
+    }
+
+def _stream_verification(verification: dict, corrected_answer, skipped_stages: list) -> dict:
+    result = verification['verification_result']
+    return {
+        "accuracy_verification": result[:200] + "..." if len(result) > 200 else result,
+        "needs_correction": bool(verification.get('needs_correction')),
+        "corrected_answer": corrected_answer,
+        "skipped_stages": skipped_stages,
+    }
+
+def _replay_cached(cached: dict):
+    """Stream events for a finished answer (semantic-cache hit, SQL fast path), same shape as a live answer."""
+    yield "sources", {"sources": cached["sources"], "cache": cached.get("cache")}
+    for chunk in chunk_text(cached["answer"]):
+        yield "token", {"text": chunk}
+    yield "done", _stream_done(cached["answer"], cached["sources"], cached["assistance_type"], cached["intent_analysis"])
+    yield "verification", {"accuracy_verification": cached["accuracy_verification"], "needs_correction": False,
+                           "corrected_answer": None, "skipped_stages": []}
+
+def _stream_cache_answer(cache, query, q_emb, top_k, initial_answer, corrected_answer, retrieved_chunks,
+                         assistance_type, intent_analysis, verification, skipped_stages, scope=None):
+    final_answer = corrected_answer or initial_answer
+    _cache_answer(cache, query, q_emb, top_k, _enhanced_response(
+        final_answer, retrieved_chunks, assistance_type, intent_analysis, verification, skipped_stages), scope)
+
+def stream_enhanced(query: str, top_k: int = TOP_K, deadline: Deadline = None, use_cache: bool = True,
+                    project_ids=None, meeting_id: int = None):
+    """
+    Streaming retrieve_and_generate_enhanced(): yields (event, data) pairs.
+
+      sources       retrieved chunks, as soon as retrieval finishes
+      token         answer text chunks as the provider produces them
+      done          the full answer plus intent/assistance metadata
+      verification  accuracy check (and corrected_answer, if one was needed)
+                    after the answer, so it never delays the first token
+      error         something failed; the stream ends
+    """
+    deadline = deadline or Deadline.from_ms()
+    scope = _project_scope(project_ids)
+    skipped_stages = []
+    try:
+        structured = _structured_fast_path(query, scope, meeting_id)
+        if structured is not None:
+            yield from _replay_cached(structured)
+            return
+        q_emb = EMBEDDER.embed_text(query).reshape(1, -1)
+        intent_analysis = analyze_query_intent(query, q_emb)
+        cache = _semantic_cache(use_cache)
+        cached = cache.lookup(query, q_emb, top_k, scope) if cache is not None else None
+        if cached is not None:
+            yield from _replay_cached(cached)
+            return
+        retrieved_chunks = VECTOR_STORE.search(q_emb, top_k=top_k, project_ids=scope)
+        yield "sources", {"sources": retrieved_chunks}
+
+        primary_intent = intent_analysis['primary_intent']
+        prompt, system_prompt, assistance_type = plan_answer(query, retrieved_chunks, primary_intent, q_emb)
+        # model tier and answer length for this intent and context size
+        budget = intent_analysis['generation'] = answer_budget(primary_intent, prompt)
+        parts = []
+        for delta in stream_generate(prompt, system_prompt=system_prompt,
+                                     temperature=0.3, deadline=deadline, **budget):
+            parts.append(delta)
+            yield "token", {"text": delta}
+        initial_answer = "".join(parts)
+        yield "done", _stream_done(initial_answer, retrieved_chunks, assistance_type, intent_analysis)
+
+        corrected_answer = None
+        stage = _verification_stage(primary_intent, deadline, skipped_stages)
+        if stage == 'waived':
+            verification = WAIVED_VERIFICATION
+        elif stage == 'skipped':
+            verification = SKIPPED_VERIFICATION
+        else:
+            verification = verify_answer_against_context(initial_answer, retrieved_chunks, query, deadline=deadline)
+            if _should_correct(verification, deadline, skipped_stages):
+                corrected_answer = generate(build_correction_prompt(query, initial_answer, verification),
+                                            system_prompt=CORRECTION_SYSTEM_PROMPT,
+                                            max_tokens=800, temperature=0.2, deadline=deadline)
+        yield "verification", _stream_verification(verification, corrected_answer, skipped_stages)
+        _stream_cache_answer(cache, query, q_emb, top_k, initial_answer, corrected_answer, retrieved_chunks,
+                             assistance_type, intent_analysis, verification, skipped_stages, scope)
+
+    except Exception as e:
+        print(f"❌ Error in stream_enhanced: {str(e)}")
+        yield "error", {"error": str(e), "skipped_stages": skipped_stages}
+
+async def stream_enhanced_async(query: str, top_k: int = TOP_K, deadline: Deadline = None, use_cache: bool = True,
+                                project_ids=None, meeting_id: int = None):
+    """Async stream_enhanced() for the ASGI routes; same events."""
+    deadline = deadline or Deadline.from_ms()
+    scope = _project_scope(project_ids)
+    skipped_stages = []
+    try:
+        structured = await run_cpu(_structured_fast_path, query, scope, meeting_id)
+        if structured is not None:
+            for event in _replay_cached(structured):
+                yield event
+            return
+        q_emb = (await run_cpu(EMBEDDER.embed_text, query)).reshape(1, -1)
+        intent_analysis = await run_cpu(analyze_query_intent, query, q_emb)
+        cache = _semantic_cache(use_cache)
+        cached = cache.lookup(query, q_emb, top_k, scope) if cache is not None else None
+        if cached is not None:
+            for event in _replay_cached(cached):
+                yield event
+            return
+        retrieved_chunks = await run_cpu(VECTOR_STORE.search, q_emb, top_k, scope)
+        yield "sources", {"sources": retrieved_chunks}
+
+        primary_intent = intent_analysis['primary_intent']
+        prompt, system_prompt, assistance_type = await run_cpu(plan_answer, query, retrieved_chunks, primary_intent, q_emb)
+        # model tier and answer length for this intent and context size
+        budget = intent_analysis['generation'] = answer_budget(primary_intent, prompt)
+        parts = []
+        async for delta in astream_generate(prompt, system_prompt=system_prompt,
+                                            temperature=0.3, deadline=deadline, **budget):
+            parts.append(delta)
+            yield "token", {"text": delta}
+        initial_answer = "".join(parts)
+        yield "done", _stream_done(initial_answer, retrieved_chunks, assistance_type, intent_analysis)
+
+        corrected_answer = None
+        stage = _verification_stage(primary_intent, deadline, skipped_stages)
+        if stage == 'waived':
+            verification = WAIVED_VERIFICATION
+        elif stage == 'skipped':
+            verification = SKIPPED_VERIFICATION
+        else:
+            verification = await verify_answer_against_context_async(initial_answer, retrieved_chunks, query, deadline=deadline)
+            if _should_correct(verification, deadline, skipped_stages):
+                corrected_answer = await agenerate(build_correction_prompt(query, initial_answer, verification),
+                                                   system_prompt=CORRECTION_SYSTEM_PROMPT,
+                                                   max_tokens=800, temperature=0.2, deadline=deadline)
+        yield "verification", _stream_verification(verification, corrected_answer, skipped_stages)
+        _stream_cache_answer(cache, query, q_emb, top_k, initial_answer, corrected_answer, retrieved_chunks,
+                             assistance_type, intent_analysis, verification, skipped_stages, scope)
+
+    except Exception as e:
+        print(f"❌ Error in stream_enhanced_async: {str(e)}")
+        yield "error", {"error": str(e), "skipped_stages": skipped_stages}
@@ -0,0 +1,246 @@
+# backend/services/rolling_summary.py
+"""
+Rolling per-meeting summaries over fixed time windows of MeetingSegment rows.
+
+Each window (RAG_SUMMARY_WINDOW_S of meeting time, by segment t_start_ms)
+is summarized once and cached as a MeetingArtifact of type "window_summary"
+titled "window:<n>" (zero-padded, so the (type, meeting_id, title) index
+returns windows in order); its model_information records which segments it
+covered, so a window is re-summarized only when its segments change.
+ROLLING_SUMMARIES keeps closed windows up to date in the background as
+segments arrive, reading only the segments from the last summarized window
+on; a late-join summary reads only the windows from the requested time
+onwards (via the meeting_segments(meeting_id, t_start_ms, id) index) and
+merges them.
+"""
+import os
+import json
+import queue
+import threading
+from datetime import datetime, timezone
+from services.llm_client import generate, is_fallback_answer
+from services.single_flight import get_flight, flight_key
+from services.extraction import app_context
+from services.summarizer import SUMMARY_SYSTEM_PROMPT
+
+SUMMARY_WINDOW_MS = int(float(os.environ.get("RAG_SUMMARY_WINDOW_S", 120)) * 1000)
+# window summaries are short; the fast tier is enough for them
+SUMMARY_TIER = os.environ.get("RAG_SUMMARY_TIER", "fast")
+WINDOW_SUMMARY_MAX_TOKENS = int(os.environ.get("RAG_WINDOW_SUMMARY_MAX_TOKENS", 200))
+LATE_JOIN_MAX_TOKENS = int(os.environ.get("RAG_LATE_JOIN_MAX_TOKENS", 400))
+WINDOW_SUMMARY_ARTIFACT = "window_summary"
+
+
+def _clock(ms: int) -> str:
+    seconds = int(ms or 0) // 1000
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 3600 \
+        else f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def meeting_offset_ms(meeting, since: datetime) -> int:
+    """Milliseconds into the meeting at `since` (segment times are relative to its start)."""
+    start = meeting.started_at or meeting.created_at
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)   # stored timestamps are naive UTC
+    if start is None:
+        return 0
+    return max(0, int((since - start).total_seconds() * 1000))
+
+
+def _windows(segments) -> dict:
+    """window number -> its segments, in time order."""
+    windows = {}
+    for segment in segments:
+        windows.setdefault((segment.t_start_ms or 0) // SUMMARY_WINDOW_MS, []).append(segment)
+    return windows
+
+
+def _window_key(window: int) -> str:
+    return f"window:{window:06d}"
+
+
+def _window_number(key: str) -> int:
+    return int(key.split(":", 1)[1])
+
+
+def _fingerprint(segments) -> dict:
+    return {"segments": len(segments), "last_segment_id": max(s.id for s in segments)}
+
+
+def _window_segments(meeting_id: int, from_ms: int = 0):
+    """Segments from the start of the window containing from_ms on (index range scan)."""
+    from models import MeetingSegment
+    window_start = from_ms // SUMMARY_WINDOW_MS * SUMMARY_WINDOW_MS
+    return MeetingSegment.query.filter(
+        MeetingSegment.meeting_id == meeting_id, MeetingSegment.t_start_ms >= window_start
+    ).order_by(MeetingSegment.t_start_ms, MeetingSegment.id).all()
+
+
+def _window_artifacts(meeting_id: int):
+    from models import MeetingArtifact
+    return MeetingArtifact.query.filter(MeetingArtifact.type == WINDOW_SUMMARY_ARTIFACT,
+                                        MeetingArtifact.meeting_id == meeting_id)
+
+
+def _last_window(meeting_id: int):
+    """Number of the meeting's latest summarized window, None if none is (one index seek)."""
+    from models import MeetingArtifact
+    row = _window_artifacts(meeting_id).with_entities(MeetingArtifact.title) \
+        .order_by(MeetingArtifact.title.desc()).first()
+    return _window_number(row.title) if row is not None else None
+
+
+def _cached_windows(meeting_id: int, first_window: int = 0) -> dict:
+    """window number -> (artifact, info) of its cached summary, for windows from first_window on."""
+    from models import MeetingArtifact
+    artifacts = _window_artifacts(meeting_id).filter(MeetingArtifact.title >= _window_key(first_window)) \
+        .order_by(MeetingArtifact.title)
+    return {_window_number(a.title): (a, json.loads(a.model_information or "{}")) for a in artifacts}
+
+
+def _summarize_window(meeting_id: int, window: int, segments: list) -> str:
+    """
+    Summarize one window and store it, replacing the window's earlier summary.
+    Fallback text (no provider answered) is returned but not stored, so the
+    window is summarized again on the next update.
+    """
+    from models import db, MeetingArtifact
+    lines = "\n".join(f"[{_clock(s.t_start_ms)}] {s.speaker_label or 'Speaker'}: {s.text or ''}" for s in segments)
+    start_ms, end_ms = window * SUMMARY_WINDOW_MS, (window + 1) * SUMMARY_WINDOW_MS
+    prompt = (f"Summarize this part of a meeting ({_clock(start_ms)}-{_clock(end_ms)}) in 2-4 sentences, "
+              f"keeping names, decisions and action items:\n\n{lines}")
+    summary = generate(prompt, system_prompt=SUMMARY_SYSTEM_PROMPT, max_tokens=WINDOW_SUMMARY_MAX_TOKENS,
+                       temperature=0.2, tier=SUMMARY_TIER)
+    if is_fallback_answer(summary):
+        return summary
+
+    _window_artifacts(meeting_id).filter(MeetingArtifact.title == _window_key(window)) \
+        .delete(synchronize_session=False)
+    db.session.add(MeetingArtifact(
+        meeting_id=meeting_id, type=WINDOW_SUMMARY_ARTIFACT, title=_window_key(window),
+        content=summary,
+        model_information=json.dumps({"window": window, "t_start_ms": start_ms, "t_end_ms": end_ms,
+                                      **_fingerprint(segments)}),
+    ))
+    db.session.commit()
+    return summary
+
+
+def update_window_summaries(meeting_id: int, from_ms: int = None, closed_only: bool = False) -> dict:
+    """
+    Bring the window summaries from from_ms on up to date (needs an app context).
+    from_ms=None starts at the latest summarized window (it may have been
+    summarized while still open), so only segments from there on are read.
+    closed_only skips the latest window while the meeting is still running.
+    Returns {"windows": [(window, summary)], "cached": n, "summarized": n}.
+    """
+    from models import db, Meeting
+    if from_ms is None:
+        from_ms = (_last_window(meeting_id) or 0) * SUMMARY_WINDOW_MS
+    windows = _windows(_window_segments(meeting_id, from_ms))
+    if not windows:
+        return {"windows": [], "cached": 0, "summarized": 0}
+    if closed_only:
+        meeting = db.session.get(Meeting, meeting_id)
+        if meeting is None or meeting.ended_at is None:
+            windows.pop(max(windows))
+
+    cached = _cached_windows(meeting_id, min(windows, default=0))
+    results, hits, misses = [], 0, 0
+    for window in sorted(windows):
+        segments = windows[window]
+        fingerprint = _fingerprint(segments)
+        hit = cached.get(window)
+        if hit and all(hit[1].get(k) == v for k, v in fingerprint.items()):
+            results.append((window, hit[0].content))
+            hits += 1
+            continue
+        # the background updater and a late joiner may reach the same stale window together
+        summary = get_flight("window_summary").do(
+            flight_key(meeting_id, window, *fingerprint.values()), _summarize_window, meeting_id, window, segments)
+        results.append((window, summary))
+        misses += 1
+    return {"windows": results, "cached": hits, "summarized": misses}
+
+
+def late_join_summary(meeting_id: int, since: datetime):
+    """
+    Catch-up summary of the meeting from `since` on, merged from the cached
+    window summaries (only stale or missing windows are summarized). None
+    when the meeting has no segments. The window containing `since` is
+    included whole.
+    """
+    from models import db, Meeting
+    with app_context():
+        meeting = db.session.get(Meeting, int(meeting_id))
+        if meeting is None:
+            return None
+        from_ms = meeting_offset_ms(meeting, since)
+        update = update_window_summaries(meeting.id, from_ms)
+    windows = update["windows"]
+    if not windows:
+        return None
+
+    if len(windows) == 1:
+        summary = windows[0][1]
+    else:
+        parts = "\n\n".join(f"[{_clock(w * SUMMARY_WINDOW_MS)}-{_clock((w + 1) * SUMMARY_WINDOW_MS)}] {s}"
+                            for w, s in windows)
+        prompt = ("Someone just joined this meeting. Merge these time-ordered summaries of what they missed "
+                  f"into one concise catch-up, keeping decisions and action items:\n\n{parts}")
+        summary = generate(prompt, system_prompt=SUMMARY_SYSTEM_PROMPT, max_tokens=LATE_JOIN_MAX_TOKENS,
+                           temperature=0.2)
+    print(f"🕒 Late-join summary for meeting {meeting_id} from {_clock(from_ms)}: "
+          f"{len(windows)} windows ({update['cached']} cached, {update['summarized']} summarized)")
+    return {"summary": summary, "from_ms": from_ms, "windows": len(windows),
+            "cached_windows": update["cached"], "summarized_windows": update["summarized"]}
+
+
+class RollingSummaryQueue:
+    """
+    notify(meeting_id) when segments arrive; a worker thread then summarizes
+    the meeting's closed windows that are new or changed. Repeated notices
+    for a meeting still waiting in the queue collapse into one update.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"notified": 0, "updates": 0, "windows_summarized": 0, "errors": 0}
+
+    def notify(self, meeting_id: int):
+        meeting_id = int(meeting_id)
+        with self._lock:
+            self.stats["notified"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="rag-summary", daemon=True)
+                self._thread.start()
+            if meeting_id in self._pending:
+                return
+            self._pending.add(meeting_id)
+        self._queue.put(meeting_id)
+
+    def _worker(self):
+        while True:
+            meeting_id = self._queue.get()
+            with self._lock:
+                self._pending.discard(meeting_id)
+            try:
+                with app_context():
+                    update = update_window_summaries(meeting_id, closed_only=True)
+                with self._lock:
+                    self.stats["updates"] += 1
+                    self.stats["windows_summarized"] += update["summarized"]
+            except Exception as e:
+                print(f"❌ Rolling summary failed for meeting {meeting_id}: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, "backlog": self._queue.qsize()}
+
+
+ROLLING_SUMMARIES = RollingSummaryQueue()
@@ -0,0 +1,170 @@
+# backend/services/semantic_cache.py
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+import faiss
+import numpy as np
+from services.llm_client import is_fallback_answer
+
+SEMANTIC_CACHE_ENABLED = os.environ.get("SEMANTIC_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+# cosine similarity between query embeddings to count as the same question
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", 0.92))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.environ.get("SEMANTIC_CACHE_MAX_ENTRIES", 2000))
+SEMANTIC_CACHE_TTL_S = float(os.environ.get("SEMANTIC_CACHE_TTL_S", 3600))
+# neighbours checked per lookup (entries with other top_k are skipped)
+_CANDIDATES = 4
+# numbers (meeting ids, dates, amounts) in a query; embeddings barely tell
+# "meeting 12" from "meeting 13", so cached and new query must agree on them
+_NUMBER = re.compile(r"\d+(?:[.,:/-]\d+)*")
+
+
+def _literals(query: str) -> tuple:
+    return tuple(_NUMBER.findall(query or ""))
+
+
+def _normalized(vector: np.ndarray) -> np.ndarray:
+    v = np.asarray(vector, dtype="float32").reshape(1, -1).copy()
+    faiss.normalize_L2(v)
+    return v
+
+
+class SemanticAnswerCache:
+    """
+    Answers keyed by query meaning instead of exact text: query embeddings
+    live in a FAISS inner-product index over unit vectors, so a lookup is one
+    cosine-similarity search and a hit needs similarity >= threshold and the
+    same numbers (meeting ids, dates, amounts) in both queries. Past
+    max_entries the least recently used entry is evicted.
+
+    An entry is dropped when it expires, when a meeting it cited gets new
+    chunks, or when any newly ingested chunk is closer to the cached query
+    than the weakest chunk the answer was built from (i.e. retrieval would
+    now return different context).
+    """
+
+    def __init__(self, dim: int, threshold: float = None, max_entries: int = None, ttl: float = None):
+        self.dim = dim
+        self.threshold = SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = SEMANTIC_CACHE_TTL_S if ttl is None else ttl
+        self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+        self.entries = OrderedDict()   # id -> entry dict, least recently used first
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "invalidated": 0}
+
+    def lookup(self, query: str, query_embedding: np.ndarray, top_k: int, scope: tuple = None):
+        """Cached response for a near-identical earlier query with the same top_k and project scope, else None."""
+        q = _normalized(query_embedding)
+        literals = _literals(query)
+        now = time.time()
+        with self._lock:
+            if self.index.ntotal == 0:
+                self.stats["misses"] += 1
+                return None
+            sims, ids = self.index.search(q, min(_CANDIDATES, self.index.ntotal))
+            expired = []
+            for sim, entry_id in zip(sims[0], ids[0]):
+                entry = self.entries.get(int(entry_id))
+                if entry is None or sim < self.threshold:
+                    continue
+                if entry["expires_at"] <= now:
+                    expired.append(int(entry_id))
+                    continue
+                if entry["top_k"] != top_k or entry["scope"] != scope or entry["literals"] != literals:
+                    continue
+                self._drop(expired)
+                self.entries.move_to_end(int(entry_id))
+                self.stats["hits"] += 1
+                return {**entry["response"], "cache": {"type": "semantic", "similarity": round(float(sim), 4),
+                                                        "cached_query": entry["query"]}}
+            self._drop(expired)
+            self.stats["misses"] += 1
+            return None
+
+    def store(self, query: str, query_embedding: np.ndarray, top_k: int, response: dict, scope: tuple = None):
+        # an outage answer ("Sorry, I couldn't generate...") must not outlive the outage
+        if is_fallback_answer(response.get("answer")) or is_fallback_answer(response.get("accuracy_verification")):
+            return
+        sources = response.get("sources") or []
+        meeting_ids = {s.get("metadata", {}).get("meeting_id") for s in sources}
+        # L2 distance of the weakest retrieved chunk (vector store metric); with
+        # fewer than top_k results any new chunk would have been retrieved
+        worst = max((s.get("score", 0.0) for s in sources), default=float("inf")) \
+            if len(sources) >= top_k else float("inf")
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(_normalized(query_embedding), np.array([entry_id], dtype="int64"))
+            self.entries[entry_id] = {
+                "query": query,
+                "literals": _literals(query),
+                "embedding": np.asarray(query_embedding, dtype="float32").reshape(-1),
+                "top_k": top_k,
+                "scope": scope,   # project ids the answer was retrieved from, None = all
+                "meeting_ids": {int(m) for m in meeting_ids if m is not None},
+                "worst_score": worst,
+                "expires_at": time.time() + self.ttl,
+                "response": response,
+            }
+            self.stats["stores"] += 1
+            if len(self.entries) > self.max_entries:
+                self._drop(list(self.entries)[:len(self.entries) - self.max_entries])
+
+    def invalidate_for_chunks(self, meeting_id: int, vectors: np.ndarray) -> int:
+        """Drop entries made stale by new chunks of `meeting_id` (vectors: (n, dim), as stored)."""
+        with self._lock:
+            if not self.entries:
+                return 0
+            stale = [eid for eid, e in self.entries.items() if int(meeting_id) in e["meeting_ids"]]
+            stale_set = set(stale)
+            rest = [eid for eid in self.entries if eid not in stale_set]
+            if rest and len(vectors):
+                new_chunks = faiss.IndexFlatL2(self.dim)
+                new_chunks.add(np.asarray(vectors, dtype="float32"))
+                queries = np.stack([self.entries[eid]["embedding"] for eid in rest])
+                nearest, _ = new_chunks.search(queries, 1)
+                stale.extend(eid for eid, d in zip(rest, nearest[:, 0]) if d < self.entries[eid]["worst_score"])
+            self._drop(stale)
+            self.stats["invalidated"] += len(stale)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.index.reset()
+            self.entries.clear()
+
+    def _drop(self, entry_ids):
+        if not entry_ids:
+            return
+        self.index.remove_ids(np.array(entry_ids, dtype="int64"))
+        for entry_id in entry_ids:
+            self.entries.pop(entry_id, None)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                "entries": len(self.entries),
+                "threshold": self.threshold,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache(dim: int):
+    """Process-wide cache shared by the agents and ingest; None when disabled."""
+    global _cache
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticAnswerCache(dim)
+    return _cache
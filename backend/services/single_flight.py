@@ -0,0 +1,146 @@
+# backend/services/single_flight.py
+import json
+import time
+import asyncio
+import hashlib
+import threading
+
+
+def flight_key(*parts) -> str:
+    """Stable key for a unit of work from its JSON-serialisable inputs."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight work: the first caller for a key (the
+    leader) runs it, callers arriving while it runs (followers) wait for and
+    share the leader's result or exception. Nothing is kept once the leader
+    finishes - this removes duplicate concurrent work, it is not a cache.
+    A result that fails the caller's `shareable` check (e.g. a fallback the
+    leader settled for under its own deadline) is not handed to followers;
+    they run the work themselves instead.
+
+    do() is for threads, ado() for coroutines on one event loop; the two do
+    not coalesce with each other.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0, "follower_timeouts": 0,
+                      "unshared": 0, "max_followers": 0}
+
+    def do(self, key: str, func, *args, wait_timeout: float = None, shareable=None, **kwargs):
+        """
+        Run func(*args, **kwargs) once per key at a time. A follower that has
+        waited wait_timeout seconds, or whose leader's result fails
+        shareable(result), runs the work itself.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.stats["coalesced"] += 1
+                self.stats["max_followers"] = max(self.stats["max_followers"], call.followers)
+                leader = False
+
+        if not leader:
+            if not call.done.wait(wait_timeout):
+                with self._lock:
+                    self.stats["follower_timeouts"] += 1
+                return func(*args, **kwargs)
+            if call.error is not None:
+                raise call.error
+            if shareable is not None and not shareable(call.result):
+                with self._lock:
+                    self.stats["unshared"] += 1
+                return func(*args, **kwargs)
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, coro_func, *args, wait_timeout: float = None, shareable=None, **kwargs):
+        """Coroutine version of do(): followers await the leader's task."""
+        task = self._async_calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_func(*args, **kwargs))
+            self._async_calls[key] = task
+            task.add_done_callback(lambda _: self._async_calls.pop(key, None))
+            with self._lock:
+                self.stats["leaders"] += 1
+            try:
+                # shield: a leader whose client disconnects must not cancel the followers' work
+                return await asyncio.shield(task)
+            except Exception:
+                with self._lock:
+                    self.stats["errors"] += 1
+                raise
+
+        with self._lock:
+            self.stats["coalesced"] += 1
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), wait_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.stats["follower_timeouts"] += 1
+            return await coro_func(*args, **kwargs)
+        if shareable is not None and not shareable(result):
+            with self._lock:
+                self.stats["unshared"] += 1
+            return await coro_func(*args, **kwargs)
+        return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.stats["leaders"] + self.stats["coalesced"]
+            return {
+                **self.stats,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "coalesced_ratio": round(self.stats["coalesced"] / total, 3) if total else None,
+            }
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Named, process-wide SingleFlight group (e.g. "rag_query", "llm_generate")."""
+    flight = _flights.get(name)
+    if flight is None:
+        with _flights_lock:
+            flight = _flights.setdefault(name, SingleFlight(name))
+    return flight
+
+
+def flight_metrics() -> dict:
+    return {name: flight.snapshot() for name, flight in list(_flights.items())}
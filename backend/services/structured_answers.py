@@ -0,0 +1,102 @@
+# backend/services/structured_answers.py
+import os
+import re
+from services.extraction import EXTRACTION_ARTIFACT, app_context
+
+STRUCTURED_FAST_PATH = os.environ.get("RAG_STRUCTURED_FAST_PATH", "1").lower() in ("1", "true", "yes")
+
+_KINDS = {
+    "tasks": re.compile(r"\b(action items?|tasks?|to-?dos?|follow[- ]ups?|next steps|assignments?)\b", re.IGNORECASE),
+    "decisions": re.compile(r"\b(decisions?|decided?|agreed|agreements?)\b", re.IGNORECASE),
+}
+_MEETING_ID = re.compile(r"\bmeeting\s*(?:#|id\s*|number\s*)?(\d+)\b", re.IGNORECASE)
+_LOOKUP = re.compile(r"^\s*(what|which|list|show|give|get|any|who|tell me)\b", re.IGNORECASE)
+# questions that want reasoning over the items, not the items themselves
+_ANALYSIS = re.compile(r"\b(why|should|recommend|compare|what if|suppose|impact|analy[sz]e|explain)\b", re.IGNORECASE)
+
+
+def match_structured_query(query: str, meeting_id: int = None):
+    """
+    {"kinds": [...], "meeting_id": int} for a plain list-the-items question
+    about one meeting, else None. The meeting is the "meeting N" named in the
+    query, else the caller's meeting_id; with neither, words like "tasks" or
+    "decision" say nothing about meetings ("show me tasks in celery"), so the
+    question is left to RAG.
+    """
+    if not _LOOKUP.search(query) or _ANALYSIS.search(query):
+        return None
+    kinds = [kind for kind, pattern in _KINDS.items() if pattern.search(query)]
+    if not kinds:
+        return None
+    meeting = _MEETING_ID.search(query)
+    if meeting is not None:
+        meeting_id = int(meeting.group(1))
+    if meeting_id is None:
+        return None
+    return {"kinds": kinds, "meeting_id": int(meeting_id)}
+
+
+def _format(kinds: list, meeting_id: int, tasks: list, decisions: list) -> str:
+    sections = []
+    if "tasks" in kinds:
+        lines = []
+        for task in tasks:
+            extras = [task.description, f"due {task.due_at:%Y-%m-%d}" if task.due_at else None,
+                      f"{task.priority} priority" if task.priority else None]
+            extras = [e for e in extras if e]
+            lines.append(f"- {task.title}" + (f" ({'; '.join(extras)})" if extras else ""))
+        sections.append(f"**Action items from meeting {meeting_id}:**\n" + ("\n".join(lines) or "- None recorded"))
+    if "decisions" in kinds:
+        lines = [f"- {d.statement}" for d in decisions]
+        sections.append(f"**Decisions from meeting {meeting_id}:**\n" + ("\n".join(lines) or "- None recorded"))
+    return "\n\n".join(sections)
+
+
+def answer_structured(query: str, project_ids=None, meeting_id: int = None):
+    """
+    Answer "what are the action items / decisions from meeting N?" from the
+    Task/Decision rows extracted at ingest - one indexed query per kind, no
+    embedding, search or LLM call. meeting_id scopes a question that names no
+    meeting (e.g. asked from a meeting page). None when the question is not
+    such a lookup or the meeting has not been extracted (the caller falls back
+    to RAG). project_ids restricts the lookup to those projects' meetings.
+    """
+    if not STRUCTURED_FAST_PATH:
+        return None
+    match = match_structured_query(query, meeting_id)
+    if match is None:
+        return None
+
+    from models import Meeting, MeetingArtifact, Task, Decision
+    with app_context():
+        artifacts = MeetingArtifact.query.filter_by(type=EXTRACTION_ARTIFACT, meeting_id=match["meeting_id"])
+        if project_ids is not None:
+            artifacts = artifacts.join(Meeting, Meeting.id == MeetingArtifact.meeting_id) \
+                .filter(Meeting.project_id.in_(list(project_ids)))
+        artifact = artifacts.order_by(MeetingArtifact.created_at.desc()).first()
+        if artifact is None:
+            return None
+        meeting_id = artifact.meeting_id
+        tasks = Task.query.filter_by(source_artifact=artifact.id).order_by(Task.id).all() \
+            if "tasks" in match["kinds"] else []
+        decisions = Decision.query.filter_by(source_artifact=artifact.id).order_by(Decision.id).all() \
+            if "decisions" in match["kinds"] else []
+        answer = _format(match["kinds"], meeting_id, tasks, decisions)
+        items = {
+            "tasks": [{"id": t.id, "title": t.title, "owner": t.description, "status": t.status,
+                       "priority": t.priority, "due_at": t.due_at.isoformat() if t.due_at else None} for t in tasks],
+            "decisions": [{"id": d.id, "statement": d.statement} for d in decisions],
+        }
+
+    print(f"🗂️ Structured answer from SQL (meeting {meeting_id}: {len(tasks)} tasks, {len(decisions)} decisions)")
+    return {
+        "answer": answer,
+        "sources": [],
+        "context_used": True,
+        "assistance_type": "structured_lookup",
+        "intent_analysis": {"primary_intent": "meeting_specific", "confidence": 1.0, "method": "structured"},
+        "accuracy_verification": "Served from action items and decisions extracted at ingest",
+        "verification": {"mode": "off", "status": "waived"},
+        "skipped_stages": [],
+        "structured": {"meeting_id": meeting_id, "kinds": match["kinds"], **items},
+    }
@@ -0,0 +1,148 @@
+# backend/services/summarizer.py
+"""
+Map-reduce summarization for transcripts of any length.
+
+The text is split into groups of about RAG_SUMMARY_MAP_TOKENS (map), each
+group is summarized on a bounded thread pool, and the partial summaries are
+merged RAG_SUMMARY_FANIN at a time, level by level, until one is left
+(reduce). Every map and reduce result is cached by a hash of its input, and
+groups are cut greedily from the start, so re-summarizing a transcript that
+grew only recomputes the tail group and the reduce path above it.
+"""
+import os
+import re
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from services.llm_client import generate, is_fallback_answer
+from services.llm_cache import LLMResponseCache
+from services.context_packer import estimate_tokens
+
+SUMMARY_MAP_TOKENS = int(os.environ.get("RAG_SUMMARY_MAP_TOKENS", 2000))      # transcript tokens per map call
+SUMMARY_FANIN = max(2, int(os.environ.get("RAG_SUMMARY_FANIN", 4)))           # partial summaries per reduce call
+# concurrent map/reduce calls across all requests
+SUMMARY_CONCURRENCY = int(os.environ.get("RAG_SUMMARY_CONCURRENCY", 4))
+SUMMARY_PARTIAL_MAX_TOKENS = int(os.environ.get("RAG_SUMMARY_PARTIAL_MAX_TOKENS", 300))
+SUMMARY_FINAL_MAX_TOKENS = int(os.environ.get("RAG_SUMMARY_FINAL_MAX_TOKENS", 500))
+SUMMARY_TIER = os.environ.get("RAG_SUMMARY_MAP_TIER", "fast")
+# optional SQLite file so intermediate summaries survive restarts; empty = memory only
+SUMMARY_CACHE_DB_PATH = os.environ.get("RAG_SUMMARY_CACHE_DB_PATH", "")
+
+SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=SUMMARY_CONCURRENCY, thread_name_prefix="rag-summarize")
+SUMMARY_CACHE = LLMResponseCache(max_entries=4096, ttl=30 * 24 * 3600, db_path=SUMMARY_CACHE_DB_PATH,
+                                 max_temperature=1.0)
+
+SUMMARY_SYSTEM_PROMPT = "You summarize meeting transcripts concisely and factually. Never add anything that was not said."
+MAP_INSTRUCTIONS = ("Summarize this part of a meeting transcript in a few sentences. Keep names, numbers, "
+                    "decisions and action items (with owners).")
+REDUCE_INSTRUCTIONS = ("These are summaries of consecutive parts of one meeting, in order. Merge them into one "
+                       "summary without repeating yourself. Keep decisions and action items (with owners).")
+
+_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def split_text(text: str, max_tokens: int = None) -> list:
+    """Consecutive groups of about max_tokens, cut at line or sentence ends."""
+    max_chars = (max_tokens or SUMMARY_MAP_TOKENS) * 4
+    groups, current = [], ""
+    for piece in _BREAK.split(text or ""):
+        piece = piece.strip()
+        if not piece:
+            continue
+        while len(piece) > max_chars:   # a single runaway "sentence" (no punctuation)
+            if current:
+                groups.append(current)
+                current = ""
+            groups.append(piece[:max_chars])
+            piece = piece[max_chars:]
+        if current and len(current) + 1 + len(piece) > max_chars:
+            groups.append(current)
+            current = ""
+        current = f"{current} {piece}" if current else piece
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _summary_key(kind: str, text: str, max_tokens: int) -> str:
+    raw = json.dumps([kind, SUMMARY_TIER, max_tokens, text], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _summarize(kind: str, text: str, max_tokens: int):
+    """
+    One map or reduce step -> (summary, from_cache), answered from
+    SUMMARY_CACHE when this exact input was summarized before.
+    """
+    key = _summary_key(kind, text, max_tokens)
+    cached = SUMMARY_CACHE.get(key)
+    if cached is not None:
+        return cached, True
+    instructions = MAP_INSTRUCTIONS if kind == "map" else REDUCE_INSTRUCTIONS
+    summary = generate(f"{instructions}\n\n{text}", system_prompt=SUMMARY_SYSTEM_PROMPT,
+                       max_tokens=max_tokens, temperature=0.2, tier=SUMMARY_TIER).strip()
+    if summary and not is_fallback_answer(summary):
+        SUMMARY_CACHE.put(key, summary)
+    return summary, False
+
+
+def _run_level(kind: str, inputs: list, max_tokens: int, stats: dict) -> list:
+    """Summarize one level's inputs in parallel on SUMMARY_EXECUTOR, keeping their order."""
+    if len(inputs) == 1:
+        results = [_summarize(kind, inputs[0], max_tokens)]
+    else:
+        results = list(SUMMARY_EXECUTOR.map(lambda text: _summarize(kind, text, max_tokens), inputs))
+    for _, from_cache in results:
+        stats["cached" if from_cache else "llm_calls"] += 1
+    return [summary for summary, _ in results]
+
+
+def summarize_text(text: str) -> dict:
+    """
+    Map-reduce summary of `text` -> {"summary", "groups", "levels",
+    "llm_calls", "cached"}. Text that fits one group is summarized directly.
+    """
+    stats = {"llm_calls": 0, "cached": 0}
+    groups = split_text(text)
+    if not groups:
+        return {"summary": "", "groups": 0, "levels": 0, **stats}
+    if len(groups) == 1:
+        summary = _run_level("map", groups, SUMMARY_FINAL_MAX_TOKENS, stats)[0]
+        return {"summary": summary, "groups": 1, "levels": 1, **stats}
+
+    partials = _run_level("map", groups, SUMMARY_PARTIAL_MAX_TOKENS, stats)
+    levels = 1
+    while len(partials) > 1:
+        merges = ["\n\n".join(partials[i:i + SUMMARY_FANIN]) for i in range(0, len(partials), SUMMARY_FANIN)]
+        last = len(merges) == 1
+        partials = _run_level("reduce", merges, SUMMARY_FINAL_MAX_TOKENS if last else SUMMARY_PARTIAL_MAX_TOKENS,
+                              stats)
+        levels += 1
+    print(f"📝 Summarized {len(groups)} groups in {levels} levels "
+          f"({stats['llm_calls']} LLM calls, {stats['cached']} cached)")
+    return {"summary": partials[0], "groups": len(groups), "levels": levels, **stats}
+
+
+def meeting_text(meeting_id: int) -> str:
+    """
+    A meeting's full transcript: its latest MeetingTranscript row, else its
+    ingested chunks with the chunk overlaps merged away.
+    """
+    from services.extraction import app_context
+    from models import MeetingTranscript
+    with app_context():
+        transcript = MeetingTranscript.query.filter_by(meeting_id=meeting_id) \
+            .order_by(MeetingTranscript.created_at.desc(), MeetingTranscript.id.desc()).first()
+        if transcript is not None and transcript.full_text:
+            return transcript.full_text
+    from services.ingest import VECTOR_STORE
+    from services.context_packer import pack_context, chunk_body
+    chunks = VECTOR_STORE.meeting_chunks(meeting_id)
+    spans = pack_context(chunks, token_budget=sum(estimate_tokens(chunk_body(c)) for c in chunks) + 1)
+    spans.sort(key=lambda s: s["metadata"]["chunk_index"])
+    return "\n\n".join(s["metadata"]["text"] for s in spans)
+
+
+def summarize_meeting(meeting_id: int) -> dict:
+    """summarize_text() over the meeting's whole transcript."""
+    return summarize_text(meeting_text(meeting_id))
@@ -1,26 +1,64 @@
 # backend/services/vector_store.py
 import os
 import json
+import heapq
+import shutil
+import threading
 import faiss
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 VECTOR_DIR = Path(os.environ.get("VECTOR_STORE_PATH", "./faiss_index"))
 VECTOR_DIR.mkdir(parents=True, exist_ok=True)
 INDEX_FILE = VECTOR_DIR / "index.faiss"
 META_FILE = VECTOR_DIR / "metadata.json"
 
+# Two-level retrieval: rank meetings by their routing vectors (mean chunk
+# embedding per ROUTE_CHUNKS_PER_VECTOR consecutive chunks), then score only
+# the chunks of the best ROUTE_TOP_MEETINGS. Small stores stay flat.
+TWO_LEVEL_RETRIEVAL = os.environ.get("RAG_TWO_LEVEL_RETRIEVAL", "1").lower() in ("1", "true", "yes")
+ROUTE_MIN_MEETINGS = int(os.environ.get("RAG_ROUTE_MIN_MEETINGS", 50))
+ROUTE_TOP_MEETINGS = int(os.environ.get("RAG_ROUTE_TOP_MEETINGS", 8))
+ROUTE_CHUNKS_PER_VECTOR = int(os.environ.get("RAG_ROUTE_CHUNKS_PER_VECTOR", 16))
+
+# Project shards: one index + metadata per project under VECTOR_DIR/projects/<id>;
+# chunks without a project stay in VECTOR_DIR itself. Open shards are evicted
+# (least recently used first) once their estimated size exceeds the budget.
+SHARD_DIR = VECTOR_DIR / "projects"
+SHARD_MANIFEST = VECTOR_DIR / "shards.json"
+SHARD_MEMORY_BUDGET_MB = float(os.environ.get("RAG_SHARD_MEMORY_MB", 1024))
+SHARD_SEARCH_WORKERS = int(os.environ.get("RAG_SHARD_SEARCH_WORKERS", 4))
+# rough per-chunk metadata cost on top of the vector itself
+_METADATA_BYTES_PER_CHUNK = 1500
+
 class FaissVectorStore:
-    def __init__(self, dim: int):
+    """
+    Flat FAISS index plus aligned chunk metadata, persisted in one directory.
+    add(), search() and meeting_chunks() hold the store's lock: search reads
+    the index's vector buffer in place, which add() may reallocate.
+    """
+
+    def __init__(self, dim: int, directory: Path = None):
         self.dim = dim
         self.index = None
+        self._lock = threading.RLock()
+        directory = Path(directory) if directory is not None else VECTOR_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        self.index_file = directory / INDEX_FILE.name
+        self.meta_file = directory / META_FILE.name
         self._load_or_init()
         # metadata: list of dicts aligned with index order
         self.metadata = self._load_metadata()
+        self._routing_lock = threading.Lock()
+        self._reset_routing()
+        if self.index.ntotal and self.index.ntotal == len(self.metadata):
+            self._route(self._vectors(), self.metadata, 0)
 
     def _load_or_init(self):
-        if INDEX_FILE.exists():
-            self.index = faiss.read_index(str(INDEX_FILE))
+        if self.index_file.exists():
+            self.index = faiss.read_index(str(self.index_file))
             # attempt to get dim from index
             self.dim = self.index.d
         else:
@@ -28,33 +66,129 @@ class FaissVectorStore:
             self.index = faiss.IndexFlatL2(self.dim)
 
     def _load_metadata(self):
-        if META_FILE.exists():
-            with open(META_FILE, "r", encoding="utf-8") as f:
+        if self.meta_file.exists():
+            with open(self.meta_file, "r", encoding="utf-8") as f:
                 return json.load(f)
         return []
 
     def _persist(self):
-        faiss.write_index(self.index, str(INDEX_FILE))
-        with open(META_FILE, "w", encoding="utf-8") as f:
+        faiss.write_index(self.index, str(self.index_file))
+        with open(self.meta_file, "w", encoding="utf-8") as f:
             json.dump(self.metadata, f, ensure_ascii=False, indent=2)
 
+    def _reset_routing(self):
+        with self._routing_lock:
+            self._route_sums = {}      # (meeting_id, chunk group) -> [sum of chunk vectors, count]
+            self._meeting_rows = {}    # meeting_id -> index rows of its chunks
+            self._route_table = None   # (routing vectors, their squared norms, meeting id per vector), rebuilt after adds
+
+    def _vectors(self):
+        """The stored vectors as an (ntotal, dim) array; a zero-copy view for flat indexes."""
+        if hasattr(self.index, "get_xb"):
+            return faiss.rev_swig_ptr(self.index.get_xb(), self.index.ntotal * self.dim).reshape(-1, self.dim)
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+    def _route(self, vectors: np.ndarray, metadatas: list, first_row: int):
+        """Fold new chunks into their meetings' routing vectors and row lists."""
+        with self._routing_lock:
+            for offset, (vector, meta) in enumerate(zip(vectors, metadatas)):
+                meeting_id = meta.get("meeting_id")
+                self._meeting_rows.setdefault(meeting_id, []).append(first_row + offset)
+                key = (meeting_id, int(meta.get("chunk_index", 0)) // ROUTE_CHUNKS_PER_VECTOR)
+                entry = self._route_sums.get(key)
+                if entry is None:
+                    self._route_sums[key] = [vector.astype("float64"), 1]
+                else:
+                    entry[0] += vector
+                    entry[1] += 1
+            self._route_table = None
+
+    def _routing_table(self):
+        with self._routing_lock:
+            if self._route_table is None:
+                keys = list(self._route_sums)
+                centroids = np.stack([total / count for total, count in self._route_sums.values()]).astype("float32")
+                self._route_table = (centroids, (centroids ** 2).sum(axis=1), [meeting_id for meeting_id, _ in keys])
+            return self._route_table
+
     def add(self, vectors: np.ndarray, metadatas: list):
         """
         vectors: np.ndarray shape (n, dim)
         metadatas: list of dicts length n
         """
         assert vectors.shape[1] == self.dim
-        self.index.add(vectors)
-        self.metadata.extend(metadatas)
-        self._persist()
+        with self._lock:
+            first_row = self.index.ntotal
+            self.index.add(vectors)
+            self.metadata.extend(metadatas)
+            self._route(vectors, metadatas, first_row)
+            self._persist()
 
-    def search(self, query_vector: np.ndarray, top_k: int = 5):
+    def meeting_count(self) -> int:
+        return len(self._meeting_rows)
+
+    def meeting_ids(self) -> list:
+        return [m for m in self._meeting_rows if m is not None]
+
+    def memory_bytes(self) -> int:
+        """Estimated resident size: the vectors plus their metadata."""
+        return int(self.index.ntotal) * (self.dim * 4 + _METADATA_BYTES_PER_CHUNK)
+
+    def meeting_chunks(self, meeting_id) -> list:
+        """All chunks of one meeting, in search-result shape, without scanning the metadata."""
+        with self._lock:
+            rows = self._meeting_rows.get(int(meeting_id), [])
+            return [{"score": 0.0, "metadata": self.metadata[row], "id": row} for row in rows]
+
+    def candidate_meetings(self, query_vector: np.ndarray, top_m: int = None) -> list:
+        """The top_m meetings whose routing vectors are nearest the query (L2)."""
+        top_m = top_m or ROUTE_TOP_MEETINGS
+        centroids, norms, owners = self._routing_table()
+        # ||c - q||^2 without the ||q||^2 term, which does not change the order
+        dists = norms - 2 * (centroids @ query_vector.reshape(-1))
+        # a meeting can own several routing vectors: take a few per wanted meeting
+        shortlist = min(len(dists), top_m * 4)
+        nearest = np.argpartition(dists, shortlist - 1)[:shortlist] if shortlist < len(dists) else np.arange(len(dists))
+        meetings = []
+        for rows in (nearest[np.argsort(dists[nearest])], np.argsort(dists)):
+            for row in rows:
+                if owners[row] not in meetings:
+                    meetings.append(owners[row])
+                    if len(meetings) == top_m:
+                        return meetings
+        return meetings
+
+    def search(self, query_vector: np.ndarray, top_k: int = 5, two_level: bool = None):
         """
         query_vector: np.ndarray shape (1, dim)
         returns list of (score, metadata) pairs
+        two_level: None = TWO_LEVEL_RETRIEVAL once the store holds ROUTE_MIN_MEETINGS meetings
         """
-        if self.index.ntotal == 0:
-            return []
+        with self._lock:
+            if self.index.ntotal == 0:
+                return []
+            if two_level is None:
+                two_level = TWO_LEVEL_RETRIEVAL and self.meeting_count() >= ROUTE_MIN_MEETINGS
+            if two_level:
+                results = self._search_routed(query_vector, top_k)
+                if results is not None:
+                    return results
+            return self._search_flat(query_vector, top_k)
+
+    def _search_routed(self, query_vector: np.ndarray, top_k: int):
+        """Exact L2 over the candidate meetings' chunks; None when they hold fewer than top_k."""
+        meetings = self.candidate_meetings(query_vector)
+        rows = np.fromiter((row for m in meetings for row in self._meeting_rows[m]), dtype="int64")
+        if len(rows) < top_k:
+            return None
+        vectors = self._vectors()[rows] if hasattr(self.index, "get_xb") \
+            else np.stack([self.index.reconstruct(int(row)) for row in rows])
+        dists = ((vectors - query_vector.reshape(1, -1)) ** 2).sum(axis=1)
+        best = np.argpartition(dists, top_k - 1)[:top_k] if len(rows) > top_k else np.arange(len(rows))
+        best = best[np.argsort(dists[best])]
+        return [{"score": float(dists[i]), "metadata": self.metadata[rows[i]], "id": int(rows[i])} for i in best]
+
+    def _search_flat(self, query_vector: np.ndarray, top_k: int):
         dists, ids = self.index.search(query_vector, top_k)
         results = []
         for dist, idx in zip(dists[0], ids[0]):
@@ -67,6 +201,206 @@ class FaissVectorStore:
         return int(self.index.ntotal)
 
     def reset(self):
-        self.index = faiss.IndexFlatL2(self.dim)
-        self.metadata = []
-        self._persist()
+        with self._lock:
+            self.index = faiss.IndexFlatL2(self.dim)
+            self.metadata = []
+            self._reset_routing()
+            self._persist()
+
+
+def _shard_name(project_id) -> str:
+    return "unassigned" if project_id is None else str(int(project_id))
+
+
+class ShardedVectorStore:
+    """
+    FaissVectorStore per project (metadata["project_id"]), with the same
+    add/search interface. search() covers the given projects' shards - all
+    shards when project_ids is None - fanning out over a thread pool and
+    merging the per-shard top-k by distance. Shards are opened on first use
+    and closed least-recently-used first beyond RAG_SHARD_MEMORY_MB; a
+    manifest (shards.json) knows each shard's size and meetings without
+    opening it.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._open = OrderedDict()   # shard name -> FaissVectorStore, least recently used first
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=SHARD_SEARCH_WORKERS, thread_name_prefix="rag-shard")
+        self.memory_budget = int(SHARD_MEMORY_BUDGET_MB * 1024 * 1024)
+        self.stats = {"opens": 0, "evictions": 0, "searches": 0, "fanouts": 0}
+        self._manifest = self._load_manifest()
+
+    def _directory(self, name: str) -> Path:
+        return VECTOR_DIR if name == "unassigned" else SHARD_DIR / name
+
+    def _load_manifest(self) -> dict:
+        if SHARD_MANIFEST.exists():
+            with open(SHARD_MANIFEST, "r", encoding="utf-8") as f:
+                return json.load(f)
+        # first start (or an unsharded store from before): take stock of what is on disk
+        manifest = {}
+        names = ["unassigned"] + sorted(p.name for p in SHARD_DIR.glob("*") if p.is_dir()) if SHARD_DIR.exists() \
+            else ["unassigned"]
+        for name in names:
+            if not (self._directory(name) / INDEX_FILE.name).exists():
+                continue
+            shard = FaissVectorStore(self.dim, self._directory(name))
+            self.dim = shard.dim
+            manifest[name] = {"vectors": shard.get_total_count(), "meetings": shard.meeting_ids()}
+        self._write_manifest(manifest)
+        return manifest
+
+    def _write_manifest(self, manifest: dict = None):
+        with open(SHARD_MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest if manifest is not None else self._manifest, f)
+
+    def shard(self, project_id=None) -> FaissVectorStore:
+        """The project's shard, opened (and others closed, if over budget) as needed."""
+        return self._shard(_shard_name(project_id))
+
+    def _shard(self, name: str) -> FaissVectorStore:
+        with self._lock:
+            store = self._open.get(name)
+            if store is not None:
+                self._open.move_to_end(name)
+                return store
+            store = FaissVectorStore(self.dim, self._directory(name))
+            self._open[name] = store
+            self.stats["opens"] += 1
+            self._evict(keep=name)
+            return store
+
+    def _evict(self, keep: str):
+        # searches still holding an evicted shard finish on it; it is freed afterwards
+        used = sum(s.memory_bytes() for s in self._open.values())
+        for name in list(self._open):
+            if used <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            used -= self._open.pop(name).memory_bytes()
+            self.stats["evictions"] += 1
+
+    def add(self, vectors: np.ndarray, metadatas: list):
+        """Add each chunk to its project's shard (metadata["project_id"], None = unassigned)."""
+        assert vectors.shape[1] == self.dim
+        rows_by_shard = {}
+        for row, meta in enumerate(metadatas):
+            rows_by_shard.setdefault(_shard_name(meta.get("project_id")), []).append(row)
+        with self._lock:
+            for name, rows in rows_by_shard.items():
+                store = self._shard(name)
+                store.add(vectors[rows], [metadatas[r] for r in rows])
+                self._manifest[name] = {"vectors": store.get_total_count(), "meetings": store.meeting_ids()}
+                self._evict(keep=name)   # the shard just grew
+            self._write_manifest()
+
+    def shard_names(self, project_ids=None) -> list:
+        """Shards a search covers: the given projects' (those that exist), or all."""
+        with self._lock:
+            if project_ids is None:
+                return list(self._manifest)
+            return [n for n in dict.fromkeys(_shard_name(p) for p in project_ids) if n in self._manifest]
+
+    def search(self, query_vector: np.ndarray, top_k: int = 5, project_ids=None, two_level: bool = None):
+        """
+        Top-k over the shards of project_ids (None = every shard). Each hit
+        also carries "shard"; "id" is the row within that shard.
+        """
+        names = self.shard_names(project_ids)
+        if not names:
+            return []
+        with self._lock:
+            self.stats["searches"] += 1
+            if len(names) > 1:
+                self.stats["fanouts"] += 1
+
+        def search_shard(name):
+            return [{**hit, "shard": name} for hit in self._shard(name).search(query_vector, top_k, two_level)]
+
+        if len(names) == 1:
+            return search_shard(names[0])
+        hits = [hit for shard_hits in self._executor.map(search_shard, names) for hit in shard_hits]
+        return heapq.nsmallest(top_k, hits, key=lambda hit: hit["score"])
+
+    def meeting_chunks(self, meeting_id) -> list:
+        with self._lock:
+            name = next((n for n, info in self._manifest.items() if int(meeting_id) in info["meetings"]), None)
+        if name is None:
+            return []
+        return [{**c, "shard": name} for c in self._shard(name).meeting_chunks(meeting_id)]
+
+    def get_total_count(self, project_ids=None):
+        return sum(self._manifest[n]["vectors"] for n in self.shard_names(project_ids))
+
+    def assign_projects(self, project_of: dict) -> dict:
+        """
+        Move unassigned chunks whose meeting has a project (project_of:
+        meeting_id -> project_id) into that project's shard.
+        Returns the number of chunks moved per shard.
+        """
+        with self._lock:
+            if "unassigned" not in self._manifest:
+                return {}
+            source = self._shard("unassigned")
+            with source._lock:
+                vectors = np.array(source._vectors())   # a copy: the index is rebuilt below
+                metadata = list(source.metadata)
+            keep, moves = [], {}
+            for row, meta in enumerate(metadata):
+                project_id = project_of.get(meta.get("meeting_id"))
+                if project_id is None:
+                    keep.append(row)
+                else:
+                    moves.setdefault(project_id, []).append(row)
+            if not moves:
+                return {}
+            for project_id, rows in moves.items():
+                self.add(vectors[rows], [{**metadata[r], "project_id": project_id} for r in rows])
+
+            remaining = [metadata[r] for r in keep]
+            with source._lock:
+                source.index = faiss.IndexFlatL2(self.dim)
+                source.metadata = []
+                source._reset_routing()
+                if keep:
+                    source.add(vectors[keep], remaining)
+                else:
+                    source._persist()
+            self._manifest["unassigned"] = {"vectors": source.get_total_count(), "meetings": source.meeting_ids()}
+            self._write_manifest()
+            return {_shard_name(p): len(rows) for p, rows in moves.items()}
+
+    def reset(self):
+        with self._lock:
+            self._shard("unassigned").reset()
+            self._open = OrderedDict((n, s) for n, s in self._open.items() if n == "unassigned")
+            shutil.rmtree(SHARD_DIR, ignore_errors=True)
+            self._manifest = {}
+            self._write_manifest()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "shards": len(self._manifest),
+                "open_shards": list(self._open),
+                "open_bytes": sum(s.memory_bytes() for s in self._open.values()),
+                "memory_budget_bytes": self.memory_budget,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store(dim: int) -> ShardedVectorStore:
+    """Process-wide sharded store shared by ingest, the agents and the search routes."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ShardedVectorStore(dim)
+    return _store
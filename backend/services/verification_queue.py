@@ -0,0 +1,99 @@
+# backend/services/verification_queue.py
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+VERIFY_WORKERS = int(os.environ.get("RAG_VERIFY_WORKERS", 4))
+VERIFY_TICKET_TTL_S = float(os.environ.get("RAG_VERIFY_TICKET_TTL_S", 900))
+VERIFY_MAX_TICKETS = int(os.environ.get("RAG_VERIFY_MAX_TICKETS", 5000))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+
+class VerificationQueue:
+    """
+    Runs answer verification (and correction) off the request path. submit()
+    returns a ticket immediately; the job runs on a small worker pool and its
+    result is kept for VERIFY_TICKET_TTL_S so clients can poll for it, or
+    long-poll with wait().
+    """
+
+    def __init__(self, workers: int = None, ttl: float = None, max_tickets: int = None):
+        self.ttl = VERIFY_TICKET_TTL_S if ttl is None else ttl
+        self.max_tickets = max_tickets or VERIFY_MAX_TICKETS
+        self._executor = ThreadPoolExecutor(max_workers=workers or VERIFY_WORKERS, thread_name_prefix="rag-verify")
+        self._tickets = OrderedDict()   # ticket -> state dict, oldest first
+        self._events = {}
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "done": 0, "errors": 0}
+
+    def submit(self, func, *args, **kwargs) -> str:
+        ticket = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            self._tickets[ticket] = {"ticket": ticket, "status": PENDING, "result": None,
+                                     "error": None, "created_at": now, "updated_at": now}
+            self._events[ticket] = threading.Event()
+            self.stats["submitted"] += 1
+        self._executor.submit(self._run, ticket, func, args, kwargs)
+        return ticket
+
+    def _run(self, ticket, func, args, kwargs):
+        self._update(ticket, status=RUNNING)
+        try:
+            result = func(*args, **kwargs)
+            self._update(ticket, status=DONE, result=result)
+            with self._lock:
+                self.stats["done"] += 1
+        except Exception as e:
+            print(f"❌ Background verification {ticket[:8]} failed: {e}")
+            self._update(ticket, status=ERROR, error=str(e))
+            with self._lock:
+                self.stats["errors"] += 1
+        finally:
+            event = self._events.get(ticket)
+            if event is not None:
+                event.set()
+
+    def _update(self, ticket, **fields):
+        with self._lock:
+            state = self._tickets.get(ticket)
+            if state is not None:
+                state.update(fields, updated_at=time.time())
+
+    def _expire(self, now):
+        """Drop finished tickets past their TTL and the oldest beyond max_tickets."""
+        while self._tickets:
+            ticket, state = next(iter(self._tickets.items()))
+            too_many = len(self._tickets) > self.max_tickets
+            if not too_many and now - state["created_at"] < self.ttl:
+                break
+            self._tickets.popitem(last=False)
+            self._events.pop(ticket, None)
+
+    def get(self, ticket: str):
+        with self._lock:
+            state = self._tickets.get(ticket)
+            return dict(state) if state is not None else None
+
+    def wait(self, ticket: str, timeout: float):
+        """get(), after waiting up to timeout seconds for the job to finish."""
+        event = self._events.get(ticket)
+        if event is not None and timeout:
+            event.wait(timeout)
+        return self.get(ticket)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pending = sum(1 for s in self._tickets.values() if s["status"] in (PENDING, RUNNING))
+            return {**self.stats, "tickets": len(self._tickets), "pending": pending}
+
+
+VERIFICATION_QUEUE = VerificationQueue()
@@ -0,0 +1,30 @@
+# backend/shard_vector_store.py
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from models import Meeting
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Move vector store chunks of meetings that belong to a project into that project's shard")
+    parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        project_of = dict(Meeting.query.with_entities(Meeting.id, Meeting.project_id)
+                          .filter(Meeting.project_id.isnot(None)).all())
+
+    from services.ingest import VECTOR_STORE
+    moved = VECTOR_STORE.assign_projects(project_of)
+    for shard, count in sorted(moved.items()):
+        print(f"project {shard}: {count} chunks")
+    print(f"moved {sum(moved.values())} chunks; shards: {VECTOR_STORE.snapshot()['shards']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# backend/tests/conftest.py
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, "..", "database", "migrations")
+
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope="module")
+def migrated_app(tmp_path_factory):
+    """
+    Bare Flask app (no blueprints, so no embedding model) bound to a fresh
+    SQLite file that has been brought to head by the Alembic migrations.
+    """
+    from flask_migrate import upgrade
+    from config import Config, _engine_options
+    from utils.db import init_db
+
+    uri = "sqlite:///" + str(tmp_path_factory.mktemp("db") / "automeet.db")
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options(uri)
+    init_db(app)
+    with app.app_context():
+        import models  # noqa: F401  (registers the tables on db.metadata)
+        upgrade(directory=MIGRATIONS_DIR)
+        yield app
+
+
+class StubProvider:
+    """
+    Local stand-in for an LLM provider: answers OpenAI-style
+    /chat/completions and Ollama /api/generate after `delay` seconds, over
+    HTTP/1.1 keep-alive, and counts the TCP connections it accepted. Set
+    `status` (and `retry_after`) to make it fail instead.
+    """
+
+    def __init__(self, name: str, delay: float = 0.0, status: int = 200, retry_after: str = None):
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.retry_after = retry_after
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.delay)
+                text = f"answer from {stub.name}"
+                body = {"response": text} if self.path.endswith("/api/generate") \
+                    else {"choices": [{"message": {"content": text}}]}
+                if stub.status != 200:
+                    body = {"error": {"message": f"stub status {stub.status}"}}
+                raw = json.dumps(body).encode("utf-8")
+                self.send_response(stub.status)
+                if stub.retry_after is not None:
+                    self.send_header("Retry-After", stub.retry_after)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_provider(monkeypatch):
+    """
+    Factory for StubProviders. Real provider settings (e.g. from .env) are
+    cleared first, so only the stand-ins a test configures are routed to.
+    """
+    for name in ("GEMINI_API_KEY", "OPENAI_API_KEY", "OPENAI_BASE_URL", "OLLAMA_BASE_URL",
+                 "GROQ_API_KEY", "GROQ_BASE_URL"):
+        monkeypatch.delenv(name, raising=False)
+    started = []
+
+    def start(name: str, delay: float = 0.0, **failure) -> StubProvider:
+        stub = StubProvider(name, delay, **failure)
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.close()
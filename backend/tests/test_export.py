@@ -0,0 +1,30 @@
+# backend/tests/test_export.py
+import pytest
+
+from models import db, Meeting, MeetingTranscript
+from services.export import iter_export_records
+
+
+@pytest.fixture(scope="module")
+def transcripts(migrated_app):
+    ours, other = Meeting(title="ours", project_id=1), Meeting(title="other", project_id=2)
+    db.session.add_all([ours, other])
+    db.session.flush()
+    rows = [MeetingTranscript(meeting_id=ours.id, full_text="ours"),
+            MeetingTranscript(meeting_id=other.id, full_text="other"),
+            MeetingTranscript(meeting_id=None, full_text="no meeting")]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def _texts(**filters):
+    return [r["full_text"] for r in iter_export_records(kinds=("transcripts",), **filters)]
+
+
+def test_unfiltered_export_keeps_transcripts_without_a_meeting(transcripts):
+    assert _texts() == ["ours", "other", "no meeting"]
+
+
+def test_project_filter_exports_only_that_projects_transcripts(transcripts):
+    assert _texts(project_id=1) == ["ours"]
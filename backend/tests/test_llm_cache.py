@@ -0,0 +1,31 @@
+# backend/tests/test_llm_cache.py
+from services.llm_cache import LLMResponseCache
+from services.llm_client import LLMClient
+
+
+def test_generate_counts_one_lookup_across_providers(stub_provider, monkeypatch):
+    groq, ollama = stub_provider("groq"), stub_provider("ollama")
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", groq.url)
+    monkeypatch.setenv("OLLAMA_BASE_URL", ollama.url)
+    client = LLMClient()
+    client.cache = LLMResponseCache(db_path="")
+    try:
+        # two providers configured: the first call tries both keys but is one miss
+        assert client.generate("status?") == "answer from ollama"
+        assert client.generate("status?") == "answer from ollama"
+        assert client.generate("status?", temperature=0.9) == "answer from ollama"
+    finally:
+        client.close()
+    stats = client.cache_status()
+    assert (stats["misses"], stats["hits"], stats["bypassed"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert ollama.requests == 2
+
+
+def test_get_any_returns_first_live_entry():
+    cache = LLMResponseCache(db_path="")
+    cache.put("b", "from b")
+    assert cache.get_any(["a", "b", "c"]) == "from b"
+    assert cache.get_any(["x", "y"]) is None
+    assert (cache.stats["hits"], cache.stats["misses"]) == (1, 1)
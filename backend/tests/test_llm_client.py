@@ -0,0 +1,101 @@
+# backend/tests/test_llm_client.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import services.llm_client as llm_client_module
+from services.llm_client import LLMClient
+
+
+def test_provider_calls_reuse_one_pooled_connection(stub_provider, monkeypatch):
+    stub = stub_provider("groq")
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", stub.url)
+    client = LLMClient()
+    try:
+        for _ in range(5):
+            assert client.call_groq("hi")["text"] == "answer from groq"
+    finally:
+        client.close()
+    assert stub.requests == 5
+    assert stub.connections == 1
+
+
+def test_bare_requests_open_a_connection_per_call(stub_provider):
+    # control for the test above: the stand-in does count separate connections
+    stub = stub_provider("groq")
+    for _ in range(3):
+        requests.post(f"{stub.url}/chat/completions", json={}, timeout=5).raise_for_status()
+    assert stub.connections == 3
+
+
+def test_generate_keeps_one_session_per_provider(stub_provider, monkeypatch):
+    groq, ollama = stub_provider("groq"), stub_provider("ollama")
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", groq.url)
+    monkeypatch.setenv("OLLAMA_BASE_URL", ollama.url)
+    client = LLMClient()
+    try:
+        for i in range(4):
+            # ollama is configured first, so generate() goes there; groq is called directly
+            assert client.generate(f"question {i}", cache=False) == "answer from ollama"
+            assert client.call_groq(f"question {i}")["text"] == "answer from groq"
+    finally:
+        client.close()
+    assert (ollama.requests, ollama.connections) == (4, 1)
+    assert (groq.requests, groq.connections) == (4, 1)
+
+
+def _hedging_client(monkeypatch, primary, secondary) -> LLMClient:
+    # openai is configured before groq, so with no latency samples yet it is tried first
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", primary.url)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", secondary.url)
+    monkeypatch.setattr(llm_client_module, "LLM_HEDGE_DELAY_MS", 100)
+    return LLMClient()
+
+
+def test_slow_provider_is_hedged_and_fast_one_wins(stub_provider, monkeypatch):
+    slow, fast = stub_provider("openai", delay=2.0), stub_provider("groq", delay=0.05)
+    client = _hedging_client(monkeypatch, slow, fast)
+    try:
+        started = time.monotonic()
+        answer = client.generate("status?", hedge=True, cache=False)
+        elapsed = time.monotonic() - started
+    finally:
+        client.close()
+    assert answer == "answer from groq"
+    assert elapsed < 1.0
+    assert (slow.requests, fast.requests) == (1, 1)
+    assert client.hedging_status() == {"calls": 1, "hedged": 1, "hedge_wins": 1}
+
+
+def test_fast_primary_is_not_hedged(stub_provider, monkeypatch):
+    primary, secondary = stub_provider("openai", delay=0.0), stub_provider("groq", delay=0.0)
+    client = _hedging_client(monkeypatch, primary, secondary)
+    try:
+        assert client.generate("status?", hedge=True, cache=False) == "answer from openai"
+    finally:
+        client.close()
+    assert secondary.requests == 0
+    assert client.hedging_status() == {"calls": 1, "hedged": 0, "hedge_wins": 0}
+
+
+def test_hedge_stats_count_every_concurrent_call(stub_provider, monkeypatch):
+    slow, fast = stub_provider("openai", delay=2.0), stub_provider("groq", delay=0.0)
+    client = _hedging_client(monkeypatch, slow, fast)
+    # room for every request, so no hedge waits in the pool and gets cancelled unsent
+    monkeypatch.setattr(llm_client_module, "LLM_HEDGE_WORKERS", 64)
+    try:
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            answers = list(pool.map(lambda i: client.generate(f"q{i}", hedge=True, cache=False), range(24)))
+    finally:
+        client.close()
+    assert answers == ["answer from groq"] * 24
+    # every hedge sends exactly one request to the slow provider, whichever one went first
+    stats = client.hedging_status()
+    assert stats["calls"] == 24
+    assert stats["hedged"] == slow.requests > 0
+    assert stats["hedge_wins"] <= stats["hedged"]
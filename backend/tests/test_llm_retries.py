@@ -0,0 +1,127 @@
+# backend/tests/test_llm_retries.py
+"""Provider retries and slot waits stay inside the caller's deadline."""
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import services.llm_client as llm_client_module
+from services.llm_client import LLMClient, is_fallback_answer
+from services.async_llm_client import AsyncLLMClient
+from services.deadline import Deadline
+
+
+def _groq(stub_provider, monkeypatch, **failure):
+    stub = stub_provider("groq", **failure)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("GROQ_BASE_URL", stub.url)
+    return stub
+
+
+def _timed(call):
+    started = time.monotonic()
+    result = call()
+    return result, time.monotonic() - started
+
+
+def test_retry_after_longer_than_the_deadline_is_not_waited_for(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch, status=503, retry_after="5")
+    client = LLMClient()
+    try:
+        result, elapsed = _timed(lambda: client.call_groq("hi", deadline=Deadline(1.0)))
+    finally:
+        client.close()
+    assert result["error"] and stub.requests == 1
+    assert elapsed < 0.5
+
+
+def test_retry_after_beyond_the_cap_is_given_up_on(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch, status=429, retry_after="3600")
+    client = LLMClient()
+    try:
+        result, elapsed = _timed(lambda: client.call_groq("hi"))
+    finally:
+        client.close()
+    assert result["error"] and stub.requests == 1
+    assert elapsed < 0.5
+
+
+def test_backoff_retries_stop_when_the_budget_runs_out(stub_provider, monkeypatch):
+    monkeypatch.setattr(llm_client_module, "LLM_RETRY_BACKOFF", 0.2)
+    stub = _groq(stub_provider, monkeypatch, status=503)
+    client = LLMClient(max_retries=2)
+    try:
+        # waits 0.2s before the 2nd attempt; the 0.4s wait before a 3rd no longer fits
+        result, elapsed = _timed(lambda: client.call_groq("hi", deadline=Deadline(0.5)))
+        assert result["error"] and stub.requests == 2
+        assert elapsed < 0.5
+        # without a deadline all retries run
+        client.call_groq("hi")
+        assert stub.requests == 5
+    finally:
+        client.close()
+
+
+def test_async_retries_respect_the_deadline(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch, status=503, retry_after="5")
+
+    async def call():
+        client = AsyncLLMClient()
+        try:
+            return await client.call_groq("hi", deadline=Deadline(1.0))
+        finally:
+            await client.aclose()
+
+    result, elapsed = _timed(lambda: asyncio.run(call()))
+    assert result["error"] and stub.requests == 1
+    assert elapsed < 0.5
+
+
+def test_async_slot_wait_is_bounded_by_the_deadline(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch)
+
+    async def call():
+        client = AsyncLLMClient(max_concurrency=1)
+        await client._limit.acquire()   # every slot busy with someone else's call
+        try:
+            return await client._call_tracked("groq", client.call_groq, "hi", "", deadline=Deadline(0.2))
+        finally:
+            client._limit.release()
+            await client.aclose()
+
+    result, elapsed = _timed(lambda: asyncio.run(call()))
+    assert result.get("skipped") and stub.requests == 0
+    assert elapsed < 0.5
+
+
+def test_coalesced_caller_does_not_inherit_a_short_deadline_fallback(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch, delay=0.5)
+    client = LLMClient()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(client.generate, "status?", cache=False, deadline=Deadline(0.2))
+            time.sleep(0.05)
+            follower = pool.submit(client.generate, "status?", cache=False, deadline=Deadline(5.0))
+            assert is_fallback_answer(leader.result())
+            assert follower.result() == "answer from groq"
+    finally:
+        client.close()
+    assert stub.requests == 2
+
+
+def test_async_coalesced_caller_does_not_inherit_a_short_deadline_fallback(stub_provider, monkeypatch):
+    stub = _groq(stub_provider, monkeypatch, delay=0.5)
+
+    async def call():
+        client = AsyncLLMClient()
+        try:
+            leader = asyncio.ensure_future(client.generate("status?", cache=False, deadline=Deadline(0.2)))
+            await asyncio.sleep(0.05)
+            follower = await client.generate("status?", cache=False, deadline=Deadline(5.0))
+            return await leader, follower
+        finally:
+            await client.aclose()
+
+    leader, follower = asyncio.run(call())
+    assert is_fallback_answer(leader)
+    assert follower == "answer from groq"
+    assert stub.requests == 2
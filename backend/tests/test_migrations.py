@@ -0,0 +1,52 @@
+# backend/tests/test_migrations.py
+import sqlalchemy as sa
+
+from models import db
+
+
+def _model_indexes() -> dict:
+    return {
+        index.name: (table.name, [c.name for c in index.columns])
+        for table in db.metadata.tables.values()
+        for index in table.indexes
+    }
+
+
+def test_migrations_create_every_model_index(migrated_app):
+    inspector = sa.inspect(db.engine)
+    migrated = {
+        index["name"]: (table, index["column_names"])
+        for table in inspector.get_table_names()
+        for index in inspector.get_indexes(table)
+    }
+    missing = {name: spec for name, spec in _model_indexes().items() if migrated.get(name) != spec}
+    assert not missing, f"indexes declared in models.py but not created by the migrations: {missing}"
+
+
+def test_migrations_keep_legacy_tables_that_hold_rows(tmp_path):
+    from flask import Flask
+    from flask_migrate import upgrade
+    from config import Config, _engine_options
+    from utils.db import init_db
+    from conftest import MIGRATIONS_DIR
+
+    uri = "sqlite:///" + str(tmp_path / "legacy.db")
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options(uri)
+    init_db(app)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR, revision="3f9c2a7d41be")
+        with db.engine.begin() as conn:
+            conn.execute(sa.text(
+                "INSERT INTO meeting (id, title, start_time) VALUES (1, 'kickoff', '2026-01-01 09:00:00')"
+            ))
+        upgrade(directory=MIGRATIONS_DIR)
+
+        tables = set(sa.inspect(db.engine).get_table_names())
+        assert "meeting" in tables
+        assert "user" not in tables
+        assert "meetings" in tables
+        with db.engine.connect() as conn:
+            assert conn.execute(sa.text("SELECT title FROM meeting")).scalar() == "kickoff"
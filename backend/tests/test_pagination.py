@@ -0,0 +1,54 @@
+# backend/tests/test_pagination.py
+from datetime import datetime
+
+import pytest
+
+from models import db, Meeting, MeetingSegment
+from utils.pagination import keyset_paginate
+
+
+def _all_pages(query, columns, limit, descending=False):
+    ids, cursor = [], None
+    while True:
+        rows, cursor = keyset_paginate(query, columns, limit, cursor, descending=descending)
+        ids += [row.id for row in rows]
+        if cursor is None:
+            return ids
+
+
+@pytest.fixture(scope="module")
+def meetings(migrated_app):
+    # three meetings share a created_at, so the id tie-break decides their order
+    stamps = [datetime(2026, 3, 1), datetime(2026, 3, 2), datetime(2026, 3, 2), datetime(2026, 3, 2),
+              datetime(2026, 3, 3)]
+    rows = [Meeting(title=f"m{i}", project_id=1 + i % 2, created_at=stamp) for i, stamp in enumerate(stamps)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def test_meeting_pages_are_newest_first_without_gaps_or_repeats(meetings):
+    expected = [m.id for m in sorted(meetings, key=lambda m: (m.created_at, m.id), reverse=True)]
+    for limit in (1, 2, 3, 10):
+        assert _all_pages(Meeting.query, [Meeting.created_at, Meeting.id], limit, descending=True) == expected
+
+
+def test_project_filter_pages_within_the_project(meetings):
+    expected = [m.id for m in sorted(meetings, key=lambda m: (m.created_at, m.id), reverse=True) if m.project_id == 1]
+    query = Meeting.query.filter(Meeting.project_id == 1)
+    assert _all_pages(query, [Meeting.created_at, Meeting.id], 2, descending=True) == expected
+
+
+def test_segment_pages_in_time_order(meetings):
+    meeting_id = meetings[0].id
+    segments = [MeetingSegment(meeting_id=meeting_id, t_start_ms=t, text=str(t)) for t in (5000, 0, 5000, 1200)]
+    db.session.add_all(segments)
+    db.session.commit()
+    expected = [s.id for s in sorted(segments, key=lambda s: (s.t_start_ms, s.id))]
+    query = MeetingSegment.query.filter(MeetingSegment.meeting_id == meeting_id)
+    assert _all_pages(query, [MeetingSegment.t_start_ms, MeetingSegment.id], 3) == expected
+
+
+def test_nullable_sort_keys_are_rejected(migrated_app):
+    with pytest.raises(TypeError):
+        keyset_paginate(Meeting.query, [Meeting.started_at, Meeting.id], 10)
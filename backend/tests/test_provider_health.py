@@ -0,0 +1,122 @@
+# backend/tests/test_provider_health.py
+"""Circuit breaker transitions of ProviderHealth, driven by a fake clock."""
+import pytest
+
+import services.provider_health as provider_health
+from services.provider_health import ProviderHealth, CLOSED, OPEN, HALF_OPEN
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(provider_health.time, "monotonic", clock)
+    monkeypatch.setattr(provider_health, "BREAKER_FAILURES", 3)
+    monkeypatch.setattr(provider_health, "BREAKER_COOLDOWN_S", 30.0)
+    # keep the error-rate trigger out of the way; consecutive failures drive these tests
+    monkeypatch.setattr(provider_health, "BREAKER_MIN_CALLS", 1000)
+    return clock
+
+
+def _opened(clock) -> ProviderHealth:
+    health = ProviderHealth("groq")
+    for _ in range(provider_health.BREAKER_FAILURES):
+        health.record_failure()
+    assert health.state == OPEN
+    return health
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    health = ProviderHealth("groq")
+    for _ in range(provider_health.BREAKER_FAILURES - 1):
+        health.record_failure()
+        assert health.state == CLOSED
+        assert health.allow_request()
+
+    health.record_failure()
+    assert health.state == OPEN
+    assert health.opened_at == clock.now
+    assert not health.allow_request()
+
+
+def test_success_resets_the_consecutive_failure_count(clock):
+    health = ProviderHealth("groq")
+    for _ in range(provider_health.BREAKER_FAILURES - 1):
+        health.record_failure()
+    health.record_success(0.1)
+    health.record_failure()
+    assert health.state == CLOSED
+
+
+def test_failures_while_open_do_not_extend_the_cooldown(clock):
+    health = _opened(clock)
+    opened_at = health.opened_at
+
+    clock.now += 20
+    health.record_failure()  # a call that started before the breaker opened
+    assert health.state == OPEN
+    assert health.opened_at == opened_at
+
+    clock.now += 10
+    assert health.allow_request()
+    assert health.state == HALF_OPEN
+
+
+def test_cooldown_lets_exactly_one_probe_through(clock):
+    health = _opened(clock)
+
+    clock.now += 29.9
+    assert not health.allow_request()
+    assert health.state == OPEN
+
+    clock.now += 0.1
+    assert health.routing_key() == (0, 0.0)
+    assert health.allow_request()
+    assert health.state == HALF_OPEN
+    assert not health.allow_request()
+
+
+def test_probe_success_closes_the_breaker(clock):
+    health = _opened(clock)
+    clock.now += 30
+    assert health.allow_request()
+
+    health.record_success(0.2)
+    assert health.state == CLOSED
+    assert health.consecutive_failures == 0
+    assert health.allow_request()
+    assert health.allow_request()
+
+
+def test_probe_failure_reopens_for_another_cooldown(clock):
+    health = _opened(clock)
+    clock.now += 30
+    assert health.allow_request()
+
+    health.record_failure()
+    assert health.state == OPEN
+    assert health.opened_at == clock.now
+    assert not health.allow_request()
+
+    clock.now += 30
+    assert health.allow_request()
+    assert health.state == HALF_OPEN
+
+
+def test_release_probe_lets_the_next_caller_probe(clock):
+    health = _opened(clock)
+    clock.now += 30
+    assert health.allow_request()
+    assert not health.allow_request()
+
+    health.release_probe()
+    assert health.state == HALF_OPEN
+    assert health.allow_request()
+    assert not health.allow_request()
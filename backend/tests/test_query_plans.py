@@ -0,0 +1,110 @@
+# backend/tests/test_query_plans.py
+"""
+EXPLAIN QUERY PLAN checks for the hot lookups on a database built by the
+migrations (not db.create_all()), so an index that only exists in models.py
+fails here.
+"""
+from datetime import datetime
+
+from utils.pagination import keyset_query, encode_cursor
+from models import (
+    db, Meeting, MeetingSegment, MeetingTranscript, MeetingArtifact,
+    ConversationMessage, Task, Decision,
+)
+
+
+def query_plan(query) -> str:
+    """SQLite's plan for an ORM query, one step per line."""
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    params = tuple(
+        value.isoformat(" ") if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    rows = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(query, index: str):
+    plan = query_plan(query)
+    assert f"INDEX {index}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_meeting_listing_uses_created_at_index(migrated_app):
+    assert_uses_index(Meeting.query.order_by(Meeting.created_at.desc()).limit(10), "ix_meetings_created_at_id")
+
+
+def test_project_meetings_use_project_index(migrated_app):
+    plan = query_plan(Meeting.query.filter(Meeting.project_id == 1))
+    assert "SEARCH meetings USING INDEX ix_meetings_project_id_created_at_id (project_id=?)" in plan, plan
+
+
+def test_segments_in_time_order_use_composite_index(migrated_app):
+    query = MeetingSegment.query.filter(MeetingSegment.meeting_id == 1, MeetingSegment.t_start_ms >= 60000) \
+        .order_by(MeetingSegment.t_start_ms)
+    assert_uses_index(query, "ix_meeting_segments_meeting_id_t_start_ms_id (meeting_id=? AND t_start_ms>?)")
+
+
+def test_meeting_transcripts_use_meeting_index(migrated_app):
+    plan = query_plan(MeetingTranscript.query.filter_by(meeting_id=1))
+    assert "SEARCH meeting_transcripts USING INDEX ix_meeting_transcripts_meeting_id" in plan, plan
+
+
+def test_child_rows_by_foreign_key_use_indexes(migrated_app):
+    for query, index in [
+        (MeetingArtifact.query.filter_by(meeting_id=1), "ix_meeting_artifacts_meeting_id"),
+        (ConversationMessage.query.filter_by(conversation_id=1), "ix_conversation_messages_conversation_id"),
+        (Task.query.filter_by(meeting_id=1), "ix_tasks_meeting_id"),
+        (Decision.query.filter_by(project_id=1), "ix_decisions_project_id"),
+    ]:
+        plan = query_plan(query)
+        assert f"INDEX {index}" in plan, plan
+
+
+def test_extraction_lookups_use_indexes(migrated_app):
+    latest = MeetingArtifact.query.filter_by(type="extraction").order_by(MeetingArtifact.created_at.desc()).limit(1)
+    assert_uses_index(latest, "ix_meeting_artifacts_type_created_at")
+    of_meeting = MeetingArtifact.query.filter_by(type="extraction", meeting_id=1) \
+        .order_by(MeetingArtifact.created_at.desc()).limit(1)
+    assert_uses_index(of_meeting, "ix_meeting_artifacts_type_meeting_id_created_at")
+    for query, index in [
+        (Task.query.filter_by(source_artifact=1).order_by(Task.id), "ix_tasks_source_artifact"),
+        (Decision.query.filter_by(source_artifact=1).order_by(Decision.id), "ix_decisions_source_artifact"),
+    ]:
+        assert_uses_index(query, index)
+
+
+def test_window_summary_lookups_use_title_index(migrated_app):
+    windows = MeetingArtifact.query.filter(MeetingArtifact.type == "window_summary", MeetingArtifact.meeting_id == 1,
+                                           MeetingArtifact.title >= "window:000003").order_by(MeetingArtifact.title)
+    assert_uses_index(windows, "ix_meeting_artifacts_type_meeting_id_title (type=? AND meeting_id=? AND title>?)")
+    last = MeetingArtifact.query.with_entities(MeetingArtifact.title) \
+        .filter_by(type="window_summary", meeting_id=1).order_by(MeetingArtifact.title.desc()).limit(1)
+    assert_uses_index(last, "ix_meeting_artifacts_type_meeting_id_title")
+
+
+# keyset pages: every page after the first must seek straight to the cursor
+
+MEETING_CURSOR = encode_cursor([datetime(2026, 1, 1), 500])
+
+
+def test_meeting_pages_seek_created_at_index(migrated_app):
+    for cursor in (None, MEETING_CURSOR):
+        query = keyset_query(Meeting.query, [Meeting.created_at, Meeting.id], 20, cursor, descending=True)
+        assert_uses_index(query, "ix_meetings_created_at_id")
+    plan = query_plan(keyset_query(Meeting.query, [Meeting.created_at, Meeting.id], 20, MEETING_CURSOR,
+                                   descending=True))
+    assert plan.startswith("SEARCH meetings USING INDEX ix_meetings_created_at_id (created_at<?)"), plan
+
+
+def test_project_meeting_pages_seek_project_index(migrated_app):
+    for cursor in (None, MEETING_CURSOR):
+        query = keyset_query(Meeting.query.filter(Meeting.project_id == 7), [Meeting.created_at, Meeting.id],
+                             20, cursor, descending=True)
+        assert_uses_index(query, "ix_meetings_project_id_created_at_id (project_id=?")
+
+
+def test_segment_pages_seek_time_index(migrated_app):
+    query = keyset_query(MeetingSegment.query.filter(MeetingSegment.meeting_id == 1),
+                         [MeetingSegment.t_start_ms, MeetingSegment.id], 20, encode_cursor([60000, 42]))
+    assert_uses_index(query, "ix_meeting_segments_meeting_id_t_start_ms_id (meeting_id=? AND t_start_ms>?)")
@@ -0,0 +1,96 @@
+# backend/tests/test_rolling_summary.py
+import pytest
+
+import services.rolling_summary as rolling_summary
+from models import db, Meeting, MeetingSegment, MeetingArtifact
+from services.llm_client import FALLBACK_ANSWER
+from services.rolling_summary import update_window_summaries, WINDOW_SUMMARY_ARTIFACT
+
+W = rolling_summary.SUMMARY_WINDOW_MS
+
+
+@pytest.fixture
+def summarizer(migrated_app, monkeypatch):
+    """Counts window summaries (no LLM) and records where each update starts reading segments."""
+    calls, reads = [], []
+    window_segments = rolling_summary._window_segments
+
+    def fake_generate(prompt, **kwargs):
+        calls.append(prompt)
+        return f"summary {len(calls)}"
+
+    def recording_window_segments(meeting_id, from_ms=0):
+        reads.append(from_ms)
+        return window_segments(meeting_id, from_ms)
+
+    monkeypatch.setattr(rolling_summary, "generate", fake_generate)
+    monkeypatch.setattr(rolling_summary, "_window_segments", recording_window_segments)
+    return calls, reads
+
+
+def _add_segments(meeting_id, *starts):
+    db.session.add_all([MeetingSegment(meeting_id=meeting_id, t_start_ms=t, text=f"at {t}") for t in starts])
+    db.session.commit()
+
+
+def _window_titles(meeting_id):
+    return [a.title for a in MeetingArtifact.query.filter_by(meeting_id=meeting_id, type=WINDOW_SUMMARY_ARTIFACT)
+            .order_by(MeetingArtifact.title)]
+
+
+def test_background_updates_read_only_from_the_last_window(summarizer):
+    calls, reads = summarizer
+    meeting = Meeting(title="live")
+    db.session.add(meeting)
+    db.session.commit()
+
+    _add_segments(meeting.id, 0, W + 10, 2 * W + 10)
+    update = update_window_summaries(meeting.id, closed_only=True)
+    # window 2 is still open
+    assert [w for w, _ in update["windows"]] == [0, 1]
+    assert (len(calls), reads[-1]) == (2, 0)
+    assert _window_titles(meeting.id) == ["window:000000", "window:000001"]
+
+    _add_segments(meeting.id, 3 * W + 10)
+    update = update_window_summaries(meeting.id, closed_only=True)
+    # starts at window 1 (the last summarized one), not at the top of the meeting
+    assert reads[-1] == W
+    assert [w for w, _ in update["windows"]] == [1, 2]
+    assert (update["cached"], update["summarized"], len(calls)) == (1, 1, 3)
+
+    # a late segment in the last summarized window re-summarizes it, in place
+    _add_segments(meeting.id, 2 * W + 500)
+    update = update_window_summaries(meeting.id, closed_only=True)
+    assert reads[-1] == 2 * W
+    assert (update["summarized"], len(calls)) == (1, 4)
+    assert _window_titles(meeting.id) == ["window:000000", "window:000001", "window:000002"]
+
+
+def test_explicit_start_reuses_cached_windows(summarizer):
+    calls, _ = summarizer
+    meeting = Meeting(title="replay")
+    db.session.add(meeting)
+    db.session.commit()
+    _add_segments(meeting.id, 10, W + 10)
+    update_window_summaries(meeting.id)
+    update = update_window_summaries(meeting.id, from_ms=W + 5)
+    assert [w for w, _ in update["windows"]] == [1]
+    assert (update["cached"], update["summarized"], len(calls)) == (1, 0, 2)
+
+
+def test_fallback_text_is_not_stored(summarizer, monkeypatch):
+    calls, _ = summarizer
+    meeting = Meeting(title="outage")
+    db.session.add(meeting)
+    db.session.commit()
+    _add_segments(meeting.id, 10)
+    monkeypatch.setattr(rolling_summary, "generate", lambda prompt, **kwargs: FALLBACK_ANSWER)
+    update = update_window_summaries(meeting.id)
+    assert update["windows"] == [(0, FALLBACK_ANSWER)]
+    assert _window_titles(meeting.id) == []
+
+    # providers are back: the window is summarized now instead of keeping the placeholder
+    monkeypatch.setattr(rolling_summary, "generate", lambda prompt, **kwargs: "real summary")
+    update = update_window_summaries(meeting.id)
+    assert update["windows"] == [(0, "real summary")] and update["summarized"] == 1
+    assert _window_titles(meeting.id) == ["window:000000"]
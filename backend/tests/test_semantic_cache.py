@@ -0,0 +1,60 @@
+# backend/tests/test_semantic_cache.py
+import numpy as np
+
+from services.semantic_cache import SemanticAnswerCache
+
+DIM = 8
+
+
+def _vector(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(DIM).astype("float32")
+
+
+def _answer(text: str) -> dict:
+    return {"answer": text, "sources": []}
+
+
+def test_near_identical_query_hits():
+    cache = SemanticAnswerCache(DIM, threshold=0.9)
+    v = _vector(1)
+    cache.store("what did we decide in meeting 12?", v, 5, _answer("a"))
+    hit = cache.lookup("What did we decide in meeting 12", v + 0.01, 5)
+    assert hit["answer"] == "a"
+    assert hit["cache"]["type"] == "semantic"
+
+
+def test_different_meeting_or_number_misses():
+    cache = SemanticAnswerCache(DIM, threshold=0.9)
+    v = _vector(1)
+    cache.store("summarize meeting 12", v, 5, _answer("twelve"))
+    cache.store("budget over 5000", _vector(2), 5, _answer("5000"))
+    # same embedding, but the numbers differ: not the same question
+    assert cache.lookup("summarize meeting 13", v, 5) is None
+    assert cache.lookup("summarize meeting", v, 5) is None
+    assert cache.lookup("budget over 500", _vector(2), 5) is None
+    assert cache.lookup("summarize meeting 12", v, 5)["answer"] == "twelve"
+    assert cache.snapshot()["hits"] == 1
+
+
+def test_eviction_is_least_recently_used():
+    cache = SemanticAnswerCache(DIM, threshold=0.99, max_entries=2)
+    first, second, third = _vector(1), _vector(2), _vector(3)
+    cache.store("first", first, 5, _answer("first"))
+    cache.store("second", second, 5, _answer("second"))
+    # reading "first" makes "second" the least recently used entry
+    assert cache.lookup("first", first, 5)["answer"] == "first"
+    cache.store("third", third, 5, _answer("third"))
+    assert cache.lookup("first", first, 5)["answer"] == "first"
+    assert cache.lookup("second", second, 5) is None
+    assert cache.lookup("third", third, 5)["answer"] == "third"
+
+
+def test_fallback_answers_are_not_stored():
+    from services.llm_client import FALLBACK_ANSWER, dummy_response
+    cache = SemanticAnswerCache(DIM, threshold=0.9)
+    cache.store("status of meeting 4?", _vector(1), 5, _answer(FALLBACK_ANSWER))
+    cache.store("status of meeting 4?", _vector(1), 5, _answer(dummy_response("status of meeting 4?")["text"]))
+    cache.store("status of meeting 4?", _vector(1), 5,
+                {**_answer("a real answer"), "accuracy_verification": FALLBACK_ANSWER})
+    assert cache.lookup("status of meeting 4?", _vector(1), 5) is None
+    assert cache.snapshot()["stores"] == 0
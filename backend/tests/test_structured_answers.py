@@ -0,0 +1,70 @@
+# backend/tests/test_structured_answers.py
+import pytest
+
+from models import db, Meeting, MeetingArtifact, Task, Decision
+from services.extraction import EXTRACTION_ARTIFACT
+from services.structured_answers import match_structured_query, answer_structured
+
+# general questions that merely contain "decision", "next steps", "tasks" or "todo"
+MISROUTES = [
+    "What is a decision tree?",
+    "What are the next steps for deploying kubernetes?",
+    "Show me tasks in celery",
+    "Give me todo app ideas",
+]
+
+
+@pytest.mark.parametrize("query", MISROUTES)
+def test_general_questions_go_to_rag(query):
+    assert match_structured_query(query) is None
+
+
+@pytest.mark.parametrize("query", ["What is a decision tree?", "Show me tasks in celery"])
+def test_general_questions_go_to_rag_with_extractions_stored(extracted_meeting, query):
+    assert answer_structured(query) is None
+
+
+def test_meeting_named_in_query():
+    assert match_structured_query("What are the action items from meeting 12?") == \
+        {"kinds": ["tasks"], "meeting_id": 12}
+    assert match_structured_query("List decisions in meeting #7") == {"kinds": ["decisions"], "meeting_id": 7}
+
+
+def test_meeting_scope_from_caller():
+    assert match_structured_query("What are the action items?") is None
+    assert match_structured_query("What are the action items?", meeting_id=3) == {"kinds": ["tasks"], "meeting_id": 3}
+    # a meeting named in the query wins over the caller's scope
+    assert match_structured_query("What did we decide in meeting 9?", meeting_id=3)["meeting_id"] == 9
+
+
+def test_analysis_questions_go_to_rag():
+    assert match_structured_query("Why did we make those decisions in meeting 4?") is None
+
+
+@pytest.fixture(scope="module")
+def extracted_meeting(migrated_app):
+    meeting = Meeting(title="planning")
+    db.session.add(meeting)
+    db.session.flush()
+    artifact = MeetingArtifact(meeting_id=meeting.id, type=EXTRACTION_ARTIFACT, content="{}")
+    db.session.add(artifact)
+    db.session.flush()
+    db.session.add_all([
+        Task(meeting_id=meeting.id, title="Ship the release", source_artifact=artifact.id),
+        Decision(meeting_id=meeting.id, statement="Use Postgres", source_artifact=artifact.id),
+    ])
+    db.session.commit()
+    return meeting
+
+
+def test_answers_from_extracted_rows(extracted_meeting):
+    result = answer_structured(f"What are the action items from meeting {extracted_meeting.id}?")
+    assert result["assistance_type"] == "structured_lookup"
+    assert [t["title"] for t in result["structured"]["tasks"]] == ["Ship the release"]
+    scoped = answer_structured("What did we decide?", meeting_id=extracted_meeting.id)
+    assert [d["statement"] for d in scoped["structured"]["decisions"]] == ["Use Postgres"]
+
+
+def test_unextracted_or_unscoped_meeting_falls_back(extracted_meeting):
+    assert answer_structured("What are the action items?") is None
+    assert answer_structured(f"What are the action items from meeting {extracted_meeting.id + 100}?") is None
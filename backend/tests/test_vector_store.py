@@ -0,0 +1,103 @@
+# backend/tests/test_vector_store.py
+import numpy as np
+import pytest
+
+import services.vector_store as vector_store
+from services.vector_store import ShardedVectorStore
+
+DIM = 8
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A ShardedVectorStore in a temp directory (not the checked-in faiss_index)."""
+    monkeypatch.setattr(vector_store, "VECTOR_DIR", tmp_path)
+    monkeypatch.setattr(vector_store, "SHARD_DIR", tmp_path / "projects")
+    monkeypatch.setattr(vector_store, "SHARD_MANIFEST", tmp_path / "shards.json")
+    store = ShardedVectorStore(DIM)
+    rng = np.random.default_rng(0)
+    metadatas = [{"meeting_id": 10 + p, "chunk_index": i, "project_id": p, "text": f"p{p} c{i}"}
+                 for p in (1, 2, 3) for i in range(4)]
+    store.add(rng.standard_normal((len(metadatas), DIM)).astype("float32"), metadatas)
+    return store
+
+
+def _query():
+    return np.random.default_rng(1).standard_normal((1, DIM)).astype("float32")
+
+
+def test_unscoped_search_covers_every_shard(store):
+    # extension-ingested meetings have no project: they must stay searchable without a scope
+    store.add(np.zeros((1, DIM), dtype="float32"), [{"meeting_id": 99, "chunk_index": 0, "text": "no project"}])
+    hits = store.search(_query(), 20)
+    assert {h["shard"] for h in hits} == {"1", "2", "3", "unassigned"}
+    assert [h["score"] for h in hits] == sorted(h["score"] for h in hits)
+    assert store.snapshot()["fanouts"] == 1
+    assert store.get_total_count() == 13
+
+
+def test_scoped_search_stays_in_its_shards(store):
+    hits = store.search(_query(), 5, project_ids=[2])
+    assert {h["shard"] for h in hits} == {"2"}
+    hits = store.search(_query(), 20, project_ids=[1, 3])
+    assert {h["shard"] for h in hits} == {"1", "3"} and len(hits) == 8
+    assert store.search(_query(), 5, project_ids=[42]) == []
+
+
+def test_concurrent_adds_and_searches_see_consistent_rows(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from services.vector_store import FaissVectorStore
+
+    shard = FaissVectorStore(DIM, tmp_path / "shard")
+    query = _query()
+
+    def add(batch):
+        # every vector of a batch is filled with its batch number, so a hit's score tells its batch
+        shard.add(np.full((8, DIM), batch / 10, dtype="float32"),
+                  [{"meeting_id": batch % 5, "chunk_index": batch * 8 + i, "batch": batch} for i in range(8)])
+
+    def search(_):
+        # two-level search reads the vector buffer that add() grows
+        hits = shard.search(query, 6, two_level=True)
+        return all(np.isclose(hit["score"], ((hit["metadata"]["batch"] / 10 - query) ** 2).sum(), rtol=1e-4)
+                   for hit in hits) and len(hits) == 6
+
+    add(0)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        adds = [pool.submit(add, batch) for batch in range(1, 40)]
+        searches = list(pool.map(search, range(400)))
+        for future in adds:
+            future.result()
+    assert all(searches)
+    assert shard.get_total_count() == len(shard.metadata) == 40 * 8
+    assert len(shard.meeting_chunks(1)) == 8 * 8
+
+
+def test_search_waits_for_an_add_in_progress(tmp_path, monkeypatch):
+    import threading
+    from services.vector_store import FaissVectorStore
+
+    shard = FaissVectorStore(DIM, tmp_path / "shard")
+    shard.add(np.zeros((4, DIM), dtype="float32"), [{"meeting_id": 1, "chunk_index": i} for i in range(4)])
+    in_add, release = threading.Event(), threading.Event()
+    persist = shard._persist
+
+    def slow_persist():
+        in_add.set()
+        release.wait(5)
+        persist()
+
+    monkeypatch.setattr(shard, "_persist", slow_persist)
+    adder = threading.Thread(target=shard.add, args=(
+        np.ones((4, DIM), dtype="float32"), [{"meeting_id": 2, "chunk_index": i} for i in range(4)]))
+    adder.start()
+    assert in_add.wait(5)
+    results = []
+    searcher = threading.Thread(target=lambda: results.append(shard.search(_query(), 8, two_level=True)))
+    searcher.start()
+    searcher.join(0.2)
+    assert searcher.is_alive(), "search ran while add() was changing the index"
+    release.set()
+    adder.join(5)
+    searcher.join(5)
+    assert len(results[0]) == 8
@@ -0,0 +1,105 @@
+# backend/utils/compression.py
+import os
+import zlib
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+COMPRESSION_LEVEL = int(os.environ.get("DB_COMPRESSION_LEVEL", 6))
+# values shorter than this are stored as-is; zlib framing would only grow them
+MIN_COMPRESS_BYTES = int(os.environ.get("DB_COMPRESSION_MIN_BYTES", 64))
+
+# Every stored value starts with MAGIC + one codec byte, so the codec (and the
+# preset dictionary it used) can be changed later without breaking old rows.
+MAGIC = b"ZC"
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZLIB_CAPTIONS = 2
+
+# Preset dictionary for the caption JSON the extension uploads
+# (json.dumps of [{"text", "timestamp", "speaker", "meetingType"}, ...]).
+# zlib favours matches near the end of the dictionary, so the most frequent
+# fragments come last. NEVER edit this in place - add a new codec instead.
+CAPTION_DICTIONARY = (
+    '"meetingType": "teams"}, '
+    '"meetingType": "zoom"}, '
+    '"meetingType": "google_meet"}, '
+    '"speaker": "Speaker", "speaker": "Unknown", "speaker": "You", '
+    '{"speaker": "", "text": "", "timestamp": "", '
+    ' the  and  to  of  that  is  we  you  it  this  so  yeah  okay  I think  '
+    '.000Z", "speaker": "'
+    '[{"text": "'
+    '", "timestamp": "2025-'
+    '", "timestamp": "2026-'
+    '}, {"text": "'
+).encode("utf-8")
+
+_DICTIONARIES = {
+    CODEC_ZLIB: None,
+    CODEC_ZLIB_CAPTIONS: CAPTION_DICTIONARY,
+}
+
+
+def compress_text(text, codec: int = CODEC_ZLIB) -> bytes:
+    """
+    str -> MAGIC + codec byte + payload. Falls back to CODEC_RAW when
+    compression does not pay off.
+    """
+    if text is None:
+        return None
+    raw = text.encode("utf-8")
+    if len(raw) >= MIN_COMPRESS_BYTES and codec != CODEC_RAW:
+        zdict = _DICTIONARIES[codec]
+        if zdict:
+            compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=zdict)
+        else:
+            compressor = zlib.compressobj(COMPRESSION_LEVEL)
+        packed = compressor.compress(raw) + compressor.flush()
+        if len(packed) < len(raw):
+            return MAGIC + bytes([codec]) + packed
+    return MAGIC + bytes([CODEC_RAW]) + raw
+
+
+def decompress_text(value):
+    """
+    Inverse of compress_text. Rows written before compression was introduced
+    (plain str, or bytes without the header) are returned unchanged.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not value.startswith(MAGIC) or len(value) < 3:
+        return value.decode("utf-8")
+    codec = value[2]
+    payload = value[3:]
+    if codec == CODEC_RAW:
+        return payload.decode("utf-8")
+    if codec not in _DICTIONARIES:
+        raise ValueError(f"Unknown compression codec: {codec}")
+    zdict = _DICTIONARIES[codec]
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(payload) + decompressor.flush()).decode("utf-8")
+
+
+def is_compressed(value) -> bool:
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:2]) == MAGIC
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column stored as a compressed blob. Python code keeps reading and
+    writing plain str; combine with db.deferred() so the blob is only fetched
+    and decompressed when the attribute is actually accessed.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, codec: int = CODEC_ZLIB, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.codec = codec
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value, self.codec)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
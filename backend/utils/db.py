@@ -1,9 +1,44 @@
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
 
 db = SQLAlchemy()
-<<<<<<< Updated upstream
 migrate = Migrate()
-=======
-migrate = Migrate()
->>>>>>> Stashed changes
+
+
+def sqlite_pragma_listener(journal_mode="WAL", synchronous="NORMAL", busy_timeout_ms=5000, mmap_size=0):
+    """
+    Build a "connect" event listener that tunes each new SQLite connection.
+    WAL lets readers run alongside a writer and makes commits append-only;
+    synchronous=NORMAL is durable across app crashes in WAL mode (only an OS
+    crash can lose the last commits); busy_timeout makes writers wait for the
+    lock instead of failing with "database is locked".
+    """
+    def _on_connect(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        if mmap_size:
+            cursor.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        cursor.close()
+    return _on_connect
+
+
+def init_db(app):
+    """Bind db/migrate to the app and apply backend-specific connection tuning."""
+    db.init_app(app)
+    migrate.init_app(app, db)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", sqlite_pragma_listener(
+                journal_mode=app.config.get("SQLITE_JOURNAL_MODE", "WAL"),
+                synchronous=app.config.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+                busy_timeout_ms=app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000),
+                mmap_size=app.config.get("SQLITE_MMAP_SIZE", 0),
+            ))
@@ -0,0 +1,24 @@
+# backend/utils/sse.py
+import json
+
+# headers that keep proxies (nginx) and browsers from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data) -> str:
+    """One server-sent event; data is JSON-encoded onto a single data: line."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def sse_stream(events):
+    """(event, data) pairs -> SSE text chunks."""
+    for event, data in events:
+        yield format_sse(event, data)
+
+
+async def sse_stream_async(events):
+    async for event, data in events:
+        yield format_sse(event, data)
@@ -0,0 +1,99 @@
+"""Compress raw_meeting_transcripts.raw_data and meeting_transcripts.full_text
+
+Revision ID: 3f9c2a7d41be
+Revises: ae04bfb68e9b
+Create Date: 2026-10-19 09:12:40.118342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.compression import (
+    compress_text, decompress_text, is_compressed, CODEC_ZLIB, CODEC_ZLIB_CAPTIONS
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41be'
+down_revision = 'ae04bfb68e9b'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# (table, column, codec, nullable)
+COMPRESSED_COLUMNS = [
+    ('raw_meeting_transcripts', 'raw_data', CODEC_ZLIB_CAPTIONS, False),
+    ('meeting_transcripts', 'full_text', CODEC_ZLIB, True),
+]
+
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _rewrite_rows(table_name, column_name, convert):
+    """Rewrite a column in id-ordered batches so large tables never sit in memory."""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer), sa.column(column_name, sa.LargeBinary))
+    col = table.c[column_name]
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, col)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row_id, value in rows:
+            new_value = convert(value)
+            if new_value is not None:
+                bind.execute(table.update().where(table.c.id == row_id).values({column_name: new_value}))
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    tables = _existing_tables()
+    for table_name, column_name, codec, nullable in COMPRESSED_COLUMNS:
+        if table_name not in tables:
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                existing_type=sa.Text(),
+                type_=sa.LargeBinary(),
+                existing_nullable=nullable,
+                postgresql_using=f"convert_to({column_name}, 'UTF8')",
+            )
+
+        def convert(value, codec=codec):
+            if value is None or is_compressed(value):
+                return None
+            return compress_text(decompress_text(value), codec)
+
+        _rewrite_rows(table_name, column_name, convert)
+
+
+def downgrade():
+    tables = _existing_tables()
+    for table_name, column_name, codec, nullable in COMPRESSED_COLUMNS:
+        if table_name not in tables:
+            continue
+
+        def convert(value):
+            if value is None or not is_compressed(value):
+                return None
+            # store the plain UTF-8 bytes; the type change below turns them back into text
+            return decompress_text(value).encode('utf-8')
+
+        _rewrite_rows(table_name, column_name, convert)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                existing_type=sa.LargeBinary(),
+                type_=sa.Text(),
+                existing_nullable=nullable,
+                postgresql_using=f"convert_from({column_name}, 'UTF8')",
+            )
@@ -0,0 +1,72 @@
+"""Make the keyset pagination sort keys NOT NULL and index them with the id
+
+Meeting listings page on (created_at, id) and segment listings on
+(t_start_ms, id). With nullable sort keys the "after the cursor" predicate
+needed an `OR col IS NULL` branch that no index can seek, so pages were
+full scans or sorted the whole project. NULLs are backfilled (created_at
+from started_at/updated_at, t_start_ms as 0, which is how the rolling
+summaries already treat it), the columns become NOT NULL, and the indexes
+now end with the id so the whole sort key is one index range.
+
+Revision ID: 5e2b9c7f1a04
+Revises: c41f7a2e9d58
+Create Date: 2026-10-19 19:05:26.881430
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b9c7f1a04'
+down_revision = 'c41f7a2e9d58'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns): replaced on upgrade, restored on downgrade
+OLD_INDEXES = [
+    ('ix_meetings_created_at', 'meetings', ['created_at']),
+    ('ix_meetings_project_id', 'meetings', ['project_id']),
+    ('ix_meeting_segments_meeting_id_t_start_ms', 'meeting_segments', ['meeting_id', 't_start_ms']),
+]
+NEW_INDEXES = [
+    ('ix_meetings_created_at_id', 'meetings', ['created_at', 'id']),
+    ('ix_meetings_project_id_created_at_id', 'meetings', ['project_id', 'created_at', 'id']),
+    ('ix_meeting_segments_meeting_id_t_start_ms_id', 'meeting_segments', ['meeting_id', 't_start_ms', 'id']),
+]
+
+
+def _swap_indexes(drop, create):
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in drop:
+        if name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+    for name, table, columns in create:
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False)
+
+
+def upgrade():
+    # SQLite stores DateTime as text, so "now" must match SQLAlchemy's format to sort right
+    now = "strftime('%Y-%m-%d %H:%M:%f000', 'now')" if op.get_bind().dialect.name == 'sqlite' \
+        else "CURRENT_TIMESTAMP"
+    op.execute(f"UPDATE meetings SET created_at = COALESCE(started_at, updated_at, {now}) "
+               "WHERE created_at IS NULL")
+    op.execute("UPDATE meeting_segments SET t_start_ms = 0 WHERE t_start_ms IS NULL")
+
+    _swap_indexes(OLD_INDEXES, [])
+    # SQLite cannot ALTER a column's nullability; batch mode rebuilds the table
+    with op.batch_alter_table('meetings') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+    with op.batch_alter_table('meeting_segments') as batch_op:
+        batch_op.alter_column('t_start_ms', existing_type=sa.Integer(), nullable=False)
+    _swap_indexes([], NEW_INDEXES)
+
+
+def downgrade():
+    _swap_indexes(NEW_INDEXES, [])
+    with op.batch_alter_table('meeting_segments') as batch_op:
+        batch_op.alter_column('t_start_ms', existing_type=sa.Integer(), nullable=True)
+    with op.batch_alter_table('meetings') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
+    _swap_indexes([], OLD_INDEXES)
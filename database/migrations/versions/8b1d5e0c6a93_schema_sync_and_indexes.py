@@ -0,0 +1,324 @@
+"""Bring schema in line with models.py and index hot foreign-key/time columns
+
+Creates any model table that is missing (databases created through this
+migration chain only ever got the prototype `meeting`/`user` tables, while
+databases created with db.create_all() have the real tables but no indexes),
+drops the unused prototype tables (left in place if they still hold rows)
+and adds the indexes the listing, ingest and retrieval queries rely on.
+
+Revision ID: 8b1d5e0c6a93
+Revises: 3f9c2a7d41be
+Create Date: 2026-10-19 10:02:57.604219
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1d5e0c6a93'
+down_revision = '3f9c2a7d41be'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.env')
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_meetings_created_at', 'meetings', ['created_at']),
+    ('ix_meetings_project_id', 'meetings', ['project_id']),
+    ('ix_conversations_meeting_id', 'conversations', ['meeting_id']),
+    ('ix_conversations_project_id', 'conversations', ['project_id']),
+    ('ix_meeting_artifacts_meeting_id', 'meeting_artifacts', ['meeting_id']),
+    ('ix_meeting_attendees_meeting_id', 'meeting_attendees', ['meeting_id']),
+    ('ix_meeting_segments_meeting_id_t_start_ms', 'meeting_segments', ['meeting_id', 't_start_ms']),
+    ('ix_meeting_transcripts_meeting_id', 'meeting_transcripts', ['meeting_id']),
+    ('ix_raw_meeting_transcripts_meeting_id', 'raw_meeting_transcripts', ['meeting_id']),
+    ('ix_conversation_messages_conversation_id', 'conversation_messages', ['conversation_id']),
+    ('ix_decisions_meeting_id', 'decisions', ['meeting_id']),
+    ('ix_decisions_project_id', 'decisions', ['project_id']),
+    ('ix_tasks_meeting_id', 'tasks', ['meeting_id']),
+    ('ix_tasks_project_id', 'tasks', ['project_id']),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+
+    # prototype tables from ae04bfb68e9b; superseded by users/meetings.
+    # Only drop them when empty: rows in them were never migrated anywhere.
+    for legacy in ('meeting', 'user'):
+        if legacy not in tables:
+            continue
+        rows = bind.execute(sa.select(sa.func.count()).select_from(sa.table(legacy))).scalar()
+        if rows:
+            logger.warning(
+                "keeping legacy table %r: it still holds %d row(s); copy them into "
+                "the new tables and drop it by hand", legacy, rows)
+            continue
+        op.drop_table(legacy)
+
+    # ### tables mirrored from models.py (raw_data/full_text are compressed blobs, see 3f9c2a7d41be) ###
+    if 'users' not in tables:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('email', sa.Text(), nullable=False),
+        sa.Column('password_hash', sa.Text(), nullable=False),
+        sa.Column('provider', sa.Text(), nullable=True),
+        sa.Column('company', sa.Text(), nullable=True),
+        sa.Column('job_title', sa.Text(), nullable=True),
+        sa.Column('profile_photo', sa.Text(), nullable=True),
+        sa.Column('account_status', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        )
+    if 'integrations' not in tables:
+        op.create_table('integrations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Text(), nullable=False),
+        sa.Column('external_account', sa.Text(), nullable=True),
+        sa.Column('status', sa.Text(), nullable=True),
+        sa.Column('last_sync', sa.DateTime(), nullable=True),
+        sa.Column('metadata', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'projects' not in tables:
+        op.create_table('projects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'user_settings' not in tables:
+        op.create_table('user_settings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('response_style', sa.Text(), nullable=True),
+        sa.Column('theme_mode', sa.Text(), nullable=True),
+        sa.Column('accent_color', sa.Text(), nullable=True),
+        sa.Column('font_size', sa.Text(), nullable=True),
+        sa.Column('language', sa.Text(), nullable=True),
+        sa.Column('time_zone', sa.Text(), nullable=True),
+        sa.Column('reminder_minutes', sa.Integer(), nullable=True),
+        sa.Column('summaries_on', sa.Boolean(), nullable=True),
+        sa.Column('actions_on', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'meetings' not in tables:
+        op.create_table('meetings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('platform', sa.Text(), nullable=True),
+        sa.Column('meeting_link', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('raw_metadata', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'project_members' not in tables:
+        op.create_table('project_members',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'user_id', name='unique_project_member'),
+        )
+    if 'conversations' not in tables:
+        op.create_table('conversations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'meeting_artifacts' not in tables:
+        op.create_table('meeting_artifacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Text(), nullable=True),
+        sa.Column('title', sa.Text(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('relevance_score', sa.Float(), nullable=True),
+        sa.Column('model_information', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'meeting_attendees' not in tables:
+        op.create_table('meeting_attendees',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('display_name', sa.Text(), nullable=True),
+        sa.Column('email', sa.Text(), nullable=True),
+        sa.Column('join_time', sa.DateTime(), nullable=True),
+        sa.Column('leave_time', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'meeting_segments' not in tables:
+        op.create_table('meeting_segments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('t_start_ms', sa.Integer(), nullable=True),
+        sa.Column('t_end_ms', sa.Integer(), nullable=True),
+        sa.Column('speaker_label', sa.Text(), nullable=True),
+        sa.Column('speaker_user_id', sa.Integer(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.ForeignKeyConstraint(['speaker_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'meeting_transcripts' not in tables:
+        op.create_table('meeting_transcripts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('full_text', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'raw_meeting_transcripts' not in tables:
+        op.create_table('raw_meeting_transcripts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('raw_data', sa.LargeBinary(), nullable=False),
+        sa.Column('transcript_format', sa.Text(), nullable=True),
+        sa.Column('source_platform', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'conversation_messages' not in tables:
+        op.create_table('conversation_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.Integer(), nullable=False),
+        sa.Column('sender', sa.Text(), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'decisions' not in tables:
+        op.create_table('decisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('statement', sa.Text(), nullable=False),
+        sa.Column('decided_by', sa.Integer(), nullable=True),
+        sa.Column('effective_date', sa.DateTime(), nullable=True),
+        sa.Column('source_artifact', sa.Integer(), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['decided_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['source_artifact'], ['meeting_artifacts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    if 'tasks' not in tables:
+        op.create_table('tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('meeting_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.Text(), nullable=True),
+        sa.Column('priority', sa.Text(), nullable=True),
+        sa.Column('assignee_user_id', sa.Integer(), nullable=True),
+        sa.Column('assignee_email', sa.Text(), nullable=True),
+        sa.Column('due_at', sa.DateTime(), nullable=True),
+        sa.Column('source_artifact', sa.Integer(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['assignee_user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['source_artifact'], ['meeting_artifacts.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        )
+    # ### end tables ###
+
+    inspector = sa.inspect(bind)
+    for name, table, columns in INDEXES:
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    # Tables are left in place: on databases created with db.create_all()
+    # they predate this revision and hold real data.
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for name, table, columns in reversed(INDEXES):
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name in existing:
+            op.drop_index(name, table_name=table)
+
+    tables = set(inspector.get_table_names())
+    if 'meeting' not in tables:
+        op.create_table('meeting',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'user' not in tables:
+        op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+        )
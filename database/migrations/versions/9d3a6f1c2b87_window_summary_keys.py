@@ -0,0 +1,62 @@
+"""Key rolling window summaries by title and index them per meeting
+
+services/rolling_summary.py now finds a meeting's window summaries by a
+"window:<n>" title through ix_meeting_artifacts_type_meeting_id_title
+instead of loading every artifact and parsing its model_information.
+Existing window_summary artifacts get their key from that JSON here.
+
+Revision ID: 9d3a6f1c2b87
+Revises: 5e2b9c7f1a04
+Create Date: 2026-10-19 21:05:37.118402
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3a6f1c2b87'
+down_revision = '5e2b9c7f1a04'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_meeting_artifacts_type_meeting_id_title'
+WINDOW_SUMMARY_ARTIFACT = 'window_summary'
+
+
+def _clock(ms):
+    seconds = int(ms or 0) // 1000
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 3600 \
+        else f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def _retitle(title_for):
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, model_information FROM meeting_artifacts WHERE type = :type"),
+        {"type": WINDOW_SUMMARY_ARTIFACT},
+    ).fetchall()
+    for artifact_id, model_information in rows:
+        try:
+            info = json.loads(model_information or "{}")
+        except ValueError:
+            continue
+        if "window" in info:
+            bind.execute(sa.text("UPDATE meeting_artifacts SET title = :title WHERE id = :id"),
+                         {"title": title_for(info), "id": artifact_id})
+
+
+def upgrade():
+    _retitle(lambda info: f"window:{int(info['window']):06d}")
+    inspector = sa.inspect(op.get_bind())
+    if INDEX not in {ix['name'] for ix in inspector.get_indexes('meeting_artifacts')}:
+        op.create_index(INDEX, 'meeting_artifacts', ['type', 'meeting_id', 'title'], unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if INDEX in {ix['name'] for ix in inspector.get_indexes('meeting_artifacts')}:
+        op.drop_index(INDEX, table_name='meeting_artifacts')
+    _retitle(lambda info: f"Summary {_clock(info.get('t_start_ms'))}-{_clock(info.get('t_end_ms'))}")
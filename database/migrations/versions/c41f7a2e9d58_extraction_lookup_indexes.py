@@ -0,0 +1,45 @@
+"""Index the extraction artifact and Task/Decision source_artifact lookups
+
+The ingest-time extraction (services/extraction.py) and the SQL fast path
+(services/structured_answers.py) look up "latest artifact of type T (for
+meeting M)" and the Task/Decision rows of one artifact; these are the
+indexes models.py declares for them.
+
+Revision ID: c41f7a2e9d58
+Revises: 8b1d5e0c6a93
+Create Date: 2026-10-19 18:40:11.502367
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f7a2e9d58'
+down_revision = '8b1d5e0c6a93'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_meeting_artifacts_type_meeting_id_created_at', 'meeting_artifacts', ['type', 'meeting_id', 'created_at']),
+    ('ix_meeting_artifacts_type_created_at', 'meeting_artifacts', ['type', 'created_at']),
+    ('ix_tasks_source_artifact', 'tasks', ['source_artifact']),
+    ('ix_decisions_source_artifact', 'decisions', ['source_artifact']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name in existing:
+            op.drop_index(name, table_name=table)